@@ -1,29 +1,46 @@
 from fastapi import APIRouter
 import sys
 import os
-import random
+import threading
 
 router = APIRouter()
 
+# Mock listings generated once and reused until /test-data asks for new ones
+_mock_data = None
+_mock_data_lock = threading.Lock()
+
+def get_mock_data(refresh: bool = False):
+    """Return the current mock listings, generating them on first use or refresh"""
+    global _mock_data
+    with _mock_data_lock:
+        if _mock_data is None or refresh:
+            _mock_data = get_dynamic_mock_data()
+        return _mock_data
+
 def get_dynamic_mock_data():
     """Get fresh mock data from the scraper"""
     try:
         # Add the data-ingestion directory to path
-        ingestion_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data-ingestion')
+        repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        ingestion_path = os.path.join(repo_root, 'data-ingestion')
         if ingestion_path not in sys.path:
             sys.path.append(ingestion_path)
         
         from scrapers.mock_scraper import MockScraper
         from processors.data_cleaner import DataCleaner
+        from processors.geocoder import Geocoder, StubProvider
         
         # Generate fresh mock data
         scraper = MockScraper()
-        raw_data = scraper.scrape()
+        raw_data = scraper.scrape_listings()
         
         # Clean the data
         cleaner = DataCleaner()
         cleaned_data = cleaner.clean_listings(raw_data)
         
+        # Fill in coordinates for listings the scraper couldn't place
+        Geocoder(StubProvider()).enrich(cleaned_data)
+        
         # Convert to API format
         formatted_data = []
         for i, listing in enumerate(cleaned_data[:10]):  # Limit to 10 for performance
@@ -33,8 +50,8 @@ def get_dynamic_mock_data():
                 "price": listing.get('price', 0),
                 "beds": listing.get('beds', 1),
                 "baths": listing.get('baths', 1),
-                "latitude": listing.get('latitude', 37.7749 + random.uniform(-0.1, 0.1)),
-                "longitude": listing.get('longitude', -122.4194 + random.uniform(-0.1, 0.1)),
+                "latitude": listing.get('latitude'),
+                "longitude": listing.get('longitude'),
                 "open_house_time": listing.get('open_house_time', 'TBD'),
                 "description": listing.get('description', 'Beautiful property')
             })
@@ -68,14 +85,14 @@ def health_check():
 
 @router.get("/open-houses")
 def get_open_houses():
-    """Get current open house listings with fresh mock data"""
-    houses = get_dynamic_mock_data()
+    """Get current open house listings (mock data, generated once)"""
+    houses = get_mock_data()
     return {"open_houses": houses}
 
 @router.post("/test-data")
 def create_test_data():
     """Endpoint to refresh mock data"""
-    houses = get_dynamic_mock_data()
+    houses = get_mock_data(refresh=True)
     return {
         "message": "Dynamic test data generated successfully!",
         "count": len(houses)
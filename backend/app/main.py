@@ -1,6 +1,19 @@
-from fastapi import FastAPI
+"""
+Serverless (Vercel) entry point
+
+Kept light for cold starts: no NumPy, SQLAlchemy or ingestion packages are
+imported here. With SNAPSHOT_PATH set, /api/v1/open-houses serves the
+prebuilt snapshot's pre-encoded rows (see app.services.snapshot); otherwise
+it returns the built-in sample listings.
+"""
+import os
+
+from fastapi import FastAPI, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.services.encoding import Fragments, render
+from app.services.snapshot import iter_fragments, snapshot_path
+
 app = FastAPI(
     title="Open House Finder API",
     description="API for finding and managing open house listings",
@@ -23,8 +36,20 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+def _load_snapshot_rows():
+    path = snapshot_path()
+    if path and os.path.exists(path):
+        return list(iter_fragments(path))
+    return None
+
+# Read once per container, so only the cold start pays for it
+_snapshot_rows = _load_snapshot_rows()
+
 @app.get("/api/v1/open-houses")
-def get_open_houses():
+def get_open_houses(limit: int = Query(500, ge=1, le=5000)):
+    if _snapshot_rows is not None:
+        body = render({"open_houses": Fragments(_snapshot_rows[:limit]), "total": len(_snapshot_rows)})
+        return Response(content=body, media_type="application/json")
     return {
         "open_houses": [
             {
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -18,6 +18,8 @@ class Source(Base):
 class Listing(Base):
     """Property information - the main listing data"""
     __tablename__ = "listings"
+    # One row per home per source; bulk loads upsert on this key
+    __table_args__ = (UniqueConstraint("source_id", "address", name="uq_listings_source_address"),)
     
     id = Column(Integer, primary_key=True, index=True)
     address = Column(String, index=True)
@@ -42,6 +44,7 @@ class Listing(Base):
 class OpenHouse(Base):
     """Open house events - when you can visit the property"""
     __tablename__ = "open_houses"
+    __table_args__ = (UniqueConstraint("listing_id", "start_time", name="uq_open_houses_listing_start"),)
     
     id = Column(Integer, primary_key=True, index=True)
     listing_id = Column(Integer, ForeignKey("listings.id"))
@@ -0,0 +1,74 @@
+"""
+Upgrade steps for databases created before a model change
+
+create_all only creates missing tables; it never alters existing ones.
+Each step here checks whether it is needed, so running them is safe on a
+new database and on one that is already up to date.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+# (table, constraint name, columns) for the keys bulk loads upsert on
+UPSERT_KEYS = (
+    ("listings", "uq_listings_source_address", ("source_id", "address")),
+    ("open_houses", "uq_open_houses_listing_start", ("listing_id", "start_time")),
+)
+
+
+def _has_unique_key(conn: Connection, table: str, columns) -> bool:
+    inspector = inspect(conn)
+    keys = [constraint["column_names"] for constraint in inspector.get_unique_constraints(table)]
+    keys += [index["column_names"] for index in inspector.get_indexes(table) if index["unique"]]
+    return any(set(key) == set(columns) for key in keys)
+
+
+def _dedupe_listings(conn: Connection):
+    """Keep the oldest row per (source_id, address), moving its duplicates' open houses onto it"""
+    duplicates = (
+        "SELECT dup.id FROM listings dup JOIN listings keep "
+        "ON keep.source_id = dup.source_id AND keep.address = dup.address AND keep.id < dup.id"
+    )
+    conn.execute(text(
+        "UPDATE open_houses SET listing_id = ("
+        "SELECT MIN(keep.id) FROM listings keep JOIN listings dup "
+        "ON keep.source_id = dup.source_id AND keep.address = dup.address "
+        "WHERE dup.id = open_houses.listing_id"
+        f") WHERE listing_id IN ({duplicates})"
+    ))
+    conn.execute(text(f"DELETE FROM listings WHERE id IN ({duplicates})"))
+
+
+def _dedupe_open_houses(conn: Connection):
+    """Keep the oldest row per (listing_id, start_time)"""
+    conn.execute(text(
+        "DELETE FROM open_houses WHERE id IN ("
+        "SELECT dup.id FROM open_houses dup JOIN open_houses keep "
+        "ON keep.listing_id = dup.listing_id AND keep.start_time = dup.start_time AND keep.id < dup.id)"
+    ))
+
+
+def add_upsert_keys(engine: Engine) -> list:
+    """Add the unique keys bulk loads upsert on, removing duplicate rows first.
+
+    Listings go first: merging duplicate listings can leave two open houses
+    of the kept listing with the same start_time. Returns the names of the
+    constraints added.
+    """
+    added = []
+    with engine.begin() as conn:
+        existing = set(inspect(conn).get_table_names())
+        for table, name, columns in UPSERT_KEYS:
+            if table not in existing or _has_unique_key(conn, table, columns):
+                continue
+            if table == "listings":
+                _dedupe_listings(conn)
+            else:
+                _dedupe_open_houses(conn)
+            column_list = ", ".join(columns)
+            if conn.dialect.name == "sqlite":
+                # SQLite can't add a constraint to a table; a unique index is an equivalent conflict target
+                conn.execute(text(f"CREATE UNIQUE INDEX {name} ON {table} ({column_list})"))
+            else:
+                conn.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({column_list})"))
+            added.append(name)
+    return added
@@ -0,0 +1,194 @@
+import logging
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MIN_ZOOM = 2
+MAX_ZOOM = 16
+
+# Grid cells per 256px map tile edge, i.e. one cluster per ~64px square
+CELLS_PER_TILE = 4
+
+# Most cells one query may cover (a 4K viewport spans ~2k); wider bbox/zoom
+# combinations are answered from a coarser tier
+MAX_VIEWPORT_CELLS = 4096
+
+
+class ClusterTiers:
+    """Marker clusters precomputed for every zoom tier.
+
+    The finest tier is built from the listings, then each coarser tier is
+    produced by merging 2x2 blocks of the tier below. A request only looks up
+    the cells of one tier that overlap the viewport, so the response size is
+    bounded by the viewport rather than by the dataset.
+
+    Each cell aggregate is ``[count, sum_lat, sum_lng, min_price, max_price, listing_id]``
+    where ``listing_id`` is only meaningful when ``count == 1``.
+    """
+
+    def __init__(self, listings: Sequence[Dict] = ()):
+        self.tiers: Dict[int, Dict[Tuple[int, int], List]] = {}
+        self.build(listings)
+
+    @staticmethod
+    def cell_size(zoom: int) -> float:
+        """Cell edge in degrees at a zoom level"""
+        return 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+    @classmethod
+    def _cell(cls, lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+        size = cls.cell_size(zoom)
+        return math.floor((lat + 90.0) / size), math.floor((lng + 180.0) / size)
+
+    @classmethod
+    def viewport_zoom(cls, min_lat: float, min_lng: float, max_lat: float, max_lng: float, zoom: int) -> int:
+        """The tier a query at zoom is served from: the finest one, no finer than
+        zoom, at which the bbox spans at most MAX_VIEWPORT_CELLS cells"""
+        zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+        while zoom > MIN_ZOOM:
+            lat0, lng0 = cls._cell(min_lat, min_lng, zoom)
+            lat1, lng1 = cls._cell(max_lat, max_lng, zoom)
+            if (lat1 - lat0 + 1) * (lng1 - lng0 + 1) <= MAX_VIEWPORT_CELLS:
+                break
+            zoom -= 1
+        return zoom
+
+    @classmethod
+    def from_columns(cls, ids: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+                     price: np.ndarray) -> "ClusterTiers":
+        """Build from parallel arrays (e.g. ListingStore.columns()); NaN coordinates are skipped"""
+        tiers = cls()
+        located = ~(np.isnan(latitude) | np.isnan(longitude))
+        tiers._build_points(zip(
+            ids[located].tolist(), latitude[located].tolist(),
+            longitude[located].tolist(), price[located].tolist(),
+        ))
+        return tiers
+
+    def build(self, listings: Sequence[Dict]):
+        self._build_points(
+            (listing["id"], listing.get("latitude"), listing.get("longitude"), listing.get("price") or 0)
+            for listing in listings
+            if listing.get("latitude") is not None and listing.get("longitude") is not None
+        )
+
+    def _build_points(self, points: Iterable[Tuple[int, float, float, int]]):
+        """Build every tier from (id, lat, lng, price) points"""
+        finest: Dict[Tuple[int, int], List] = {}
+        for listing_id, lat, lng, price in points:
+            key = self._cell(lat, lng, MAX_ZOOM)
+            agg = finest.get(key)
+            if agg is None:
+                finest[key] = [1, lat, lng, price, price, listing_id]
+            else:
+                agg[0] += 1
+                agg[1] += lat
+                agg[2] += lng
+                agg[3] = min(agg[3], price)
+                agg[4] = max(agg[4], price)
+
+        tiers = {MAX_ZOOM: finest}
+        child = finest
+        for zoom in range(MAX_ZOOM - 1, MIN_ZOOM - 1, -1):
+            parent: Dict[Tuple[int, int], List] = {}
+            for (cy, cx), c in child.items():
+                key = (cy >> 1, cx >> 1)
+                agg = parent.get(key)
+                if agg is None:
+                    parent[key] = list(c)
+                else:
+                    agg[0] += c[0]
+                    agg[1] += c[1]
+                    agg[2] += c[2]
+                    agg[3] = min(agg[3], c[3])
+                    agg[4] = max(agg[4], c[4])
+            tiers[zoom] = parent
+            child = parent
+
+        self.tiers = tiers
+
+    def query(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, zoom: int) -> List[Dict]:
+        """Return the clusters of one zoom tier overlapping the bbox (see ``viewport_zoom``)"""
+        zoom = self.viewport_zoom(min_lat, min_lng, max_lat, max_lng, zoom)
+        tier = self.tiers.get(zoom, {})
+        lat0, lng0 = self._cell(min_lat, min_lng, zoom)
+        lat1, lng1 = self._cell(max_lat, max_lng, zoom)
+
+        if (lat1 - lat0 + 1) * (lng1 - lng0 + 1) > len(tier):
+            cells = [
+                agg for (cy, cx), agg in tier.items()
+                if lat0 <= cy <= lat1 and lng0 <= cx <= lng1
+            ]
+        else:
+            cells = [
+                tier[(cy, cx)]
+                for cy in range(lat0, lat1 + 1)
+                for cx in range(lng0, lng1 + 1)
+                if (cy, cx) in tier
+            ]
+
+        clusters = []
+        for count, sum_lat, sum_lng, min_price, max_price, listing_id in cells:
+            cluster = {
+                "count": count,
+                "latitude": round(sum_lat / count, 6),
+                "longitude": round(sum_lng / count, 6),
+                "min_price": min_price,
+                "max_price": max_price,
+            }
+            if count == 1:
+                cluster["listing_id"] = listing_id
+            clusters.append(cluster)
+        return clusters
+
+
+class ClusterTiersBuilder:
+    """The latest ClusterTiers, rebuilt on a background thread.
+
+    Building every tier takes seconds at a million listings, so neither
+    ingests nor requests wait for it: ``invalidate`` marks the tiers stale
+    and returns, and the thread swaps in a fresh build. Invalidations that
+    arrive during a build are folded into one more build. ``current`` is
+    ``(version, tiers)``, replaced in one assignment, where version is
+    whatever ``build`` reported for the data it read.
+    """
+
+    def __init__(self, build: Callable[[], Tuple[int, ClusterTiers]], version: int = 0):
+        self.build = build
+        self.current: Tuple[int, ClusterTiers] = (version, ClusterTiers())
+        self._condition = threading.Condition()
+        self._stale = False
+        self._building = False
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def invalidate(self):
+        with self._condition:
+            self._stale = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="cluster-tiers", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every invalidation so far has been built; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not (self._stale or self._building), timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stale)
+                self._stale = False
+                self._building = True
+            try:
+                self.current = self.build()
+            except Exception:
+                # Keep serving the previous tiers; the next invalidation retries
+                self.logger.exception("Rebuilding cluster tiers failed")
+            finally:
+                with self._condition:
+                    self._building = False
+                    self._condition.notify_all()
@@ -0,0 +1,46 @@
+from typing import Dict, List
+
+import orjson
+
+
+class Fragments(list):
+    """A list of already-encoded JSON values, spliced into a response as an array"""
+
+
+def dumps(value) -> bytes:
+    return orjson.dumps(value)
+
+
+def loads(data: bytes):
+    return orjson.loads(data)
+
+
+def with_fields(fragment: bytes, fields: Dict) -> bytes:
+    """Add fields to an encoded JSON object without decoding it"""
+    if not fields:
+        return fragment
+    return fragment[:-1] + b"," + orjson.dumps(fields)[1:]
+
+
+def render(payload: Dict) -> bytes:
+    """Encode a response object whose values may be Fragments.
+
+    Only the top level is walked: Fragments values are spliced in as-is and
+    everything else goes through orjson. All pieces are joined once, so the
+    body is the only full-size copy made.
+    """
+    pieces: List[bytes] = []
+    for key, value in payload.items():
+        pieces.append(b"," if pieces else b"{")
+        pieces.append(orjson.dumps(key) + b":")
+        if isinstance(value, Fragments):
+            pieces.append(b"[")
+            for i, fragment in enumerate(value):
+                if i:
+                    pieces.append(b",")
+                pieces.append(fragment)
+            pieces.append(b"]")
+        else:
+            pieces.append(orjson.dumps(value))
+    pieces.append(b"}" if pieces else b"{}")
+    return b"".join(pieces)
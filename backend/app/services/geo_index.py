@@ -0,0 +1,117 @@
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """Uniform lat/lng grid over listing ids for bounding-box and radius queries.
+
+    Each cell holds ``(id, lat, lng)`` entries, so a query only touches the
+    cells overlapping the search area. Cells fully inside a bbox are taken
+    without per-point checks; only the edge cells are filtered.
+
+    Ingests update the grid while requests query it from other threads, so
+    every method holds the index's lock.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.01):
+        self.cell_size = cell_size_deg
+        self.cells: Dict[Tuple[int, int], List[Tuple[int, float, float]]] = defaultdict(list)
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lng / self.cell_size)
+
+    def add(self, listing_id: int, lat: float, lng: float):
+        with self._lock:
+            self.cells[self._cell(lat, lng)].append((listing_id, lat, lng))
+            self.size += 1
+
+    def remove(self, listing_id: int, lat: float, lng: float):
+        key = self._cell(lat, lng)
+        with self._lock:
+            bucket = self.cells.get(key)
+            if not bucket:
+                return
+            for i, entry in enumerate(bucket):
+                if entry[0] == listing_id:
+                    bucket[i] = bucket[-1]
+                    bucket.pop()
+                    self.size -= 1
+                    break
+            if not bucket:
+                del self.cells[key]
+
+    def clear(self):
+        with self._lock:
+            self.cells.clear()
+            self.size = 0
+
+    def _cells_in(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> Iterator[Tuple[Tuple[int, int], List]]:
+        lat0, lng0 = self._cell(min_lat, min_lng)
+        lat1, lng1 = self._cell(max_lat, max_lng)
+        span = (lat1 - lat0 + 1) * (lng1 - lng0 + 1)
+
+        # A huge viewport over a sparse grid: walk occupied cells instead
+        if span > len(self.cells):
+            for key, bucket in self.cells.items():
+                if lat0 <= key[0] <= lat1 and lng0 <= key[1] <= lng1:
+                    yield key, bucket
+            return
+
+        for cy in range(lat0, lat1 + 1):
+            for cx in range(lng0, lng1 + 1):
+                bucket = self.cells.get((cy, cx))
+                if bucket:
+                    yield (cy, cx), bucket
+
+    def bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = None) -> List[int]:
+        """Return ids of listings inside the bounding box"""
+        lat0, lng0 = self._cell(min_lat, min_lng)
+        lat1, lng1 = self._cell(max_lat, max_lng)
+        hits = []
+        with self._lock:
+            for (cy, cx), bucket in self._cells_in(min_lat, min_lng, max_lat, max_lng):
+                if lat0 < cy < lat1 and lng0 < cx < lng1:
+                    hits.extend(entry[0] for entry in bucket)
+                else:
+                    hits.extend(
+                        entry[0] for entry in bucket
+                        if min_lat <= entry[1] <= max_lat and min_lng <= entry[2] <= max_lng
+                    )
+                if limit is not None and len(hits) >= limit:
+                    return hits[:limit]
+        return hits
+
+    def near(self, lat: float, lng: float, radius_km: float, limit: int = None) -> List[Tuple[int, float]]:
+        """Return ``(id, distance_km)`` pairs within radius_km, nearest first"""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlng = min(180.0, dlat / cos_lat)
+
+        hits = []
+        with self._lock:
+            for _, bucket in self._cells_in(lat - dlat, lng - dlng, lat + dlat, lng + dlng):
+                for listing_id, p_lat, p_lng in bucket:
+                    distance = haversine_km(lat, lng, p_lat, p_lng)
+                    if distance <= radius_km:
+                        hits.append((listing_id, distance))
+
+        hits.sort(key=lambda hit: hit[1])
+        return hits[:limit] if limit is not None else hits
@@ -0,0 +1,117 @@
+import bisect
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+Bbox = Tuple[float, float, float, float]  # min_lat, min_lng, max_lat, max_lng
+
+
+def to_seconds(value: Union[str, datetime]) -> float:
+    """Seconds since the epoch for a wall-clock datetime or ISO string.
+
+    Open house times are local to the listing, so naive values are used as
+    they are and aware ones keep their wall-clock reading (tzinfo dropped).
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class IntervalIndex:
+    """Open house time windows bucketed by start time, for overlap queries.
+
+    Each bucket covers ``bucket_seconds`` of start times and holds
+    ``(start, id, end, lat, lng)`` entries sorted by start, so adds and
+    removes stay incremental. An event overlapping ``[start, end)`` must
+    start before ``end`` and no earlier than ``start - max_duration``, which
+    bounds the buckets a query touches; buckets lying entirely inside the
+    window are taken without per-event time checks. Every method holds the
+    index's lock, since ingests update it while requests query it.
+    """
+
+    def __init__(self, bucket_seconds: float = 3600.0):
+        self.bucket_seconds = bucket_seconds
+        self.buckets: Dict[int, List[Tuple[float, int, float, Optional[float], Optional[float]]]] = defaultdict(list)
+        self.max_duration = 0.0  # Longest event ever added; only reset by clear()
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _bucket(self, seconds: float) -> int:
+        return math.floor(seconds / self.bucket_seconds)
+
+    def add(self, event_id: int, start: float, end: float, lat: Optional[float] = None, lng: Optional[float] = None):
+        if end <= start:
+            return
+        with self._lock:
+            bisect.insort(self.buckets[self._bucket(start)], (start, event_id, end, lat, lng))
+            self.max_duration = max(self.max_duration, end - start)
+            self.size += 1
+
+    def remove(self, event_id: int, start: float):
+        key = self._bucket(start)
+        with self._lock:
+            bucket = self.buckets.get(key)
+            if not bucket:
+                return
+            i = bisect.bisect_left(bucket, (start, event_id))
+            if i < len(bucket) and bucket[i][0] == start and bucket[i][1] == event_id:
+                del bucket[i]
+                self.size -= 1
+            if not bucket:
+                del self.buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self.buckets.clear()
+            self.max_duration = 0.0
+            self.size = 0
+
+    def _buckets_in(self, first: int, last: int) -> Iterator[Tuple[int, List]]:
+        # A very wide window over few occupied buckets: walk those instead
+        if last - first + 1 > len(self.buckets):
+            for key in sorted(k for k in self.buckets if first <= k <= last):
+                yield key, self.buckets[key]
+            return
+        for key in range(first, last + 1):
+            bucket = self.buckets.get(key)
+            if bucket:
+                yield key, bucket
+
+    def overlapping(self, start: float, end: float, bbox: Optional[Bbox] = None,
+                    limit: Optional[int] = None) -> List[int]:
+        """Ids of events overlapping [start, end), earliest start first.
+
+        With a bbox only events whose location falls inside it are returned.
+        Buckets are visited in start order, so the scan stops once limit
+        events have been found.
+        """
+        hits: List[int] = []
+        if end <= start:
+            return hits
+        with self._lock:
+            earliest = start - self.max_duration
+            first, last = self._bucket(earliest), self._bucket(end)
+
+            for key, bucket in self._buckets_in(first, last):
+                bucket_start = key * self.bucket_seconds
+                lo = bisect.bisect_left(bucket, (earliest,)) if key == first else 0
+                hi = bisect.bisect_left(bucket, (end,)) if key == last else len(bucket)
+                # Events starting inside the window always overlap it
+                check_end = bucket_start < start
+
+                for entry in bucket[lo:hi] if (lo or hi != len(bucket)) else bucket:
+                    if check_end and entry[2] <= start:
+                        continue
+                    if bbox is not None:
+                        lat, lng = entry[3], entry[4]
+                        if lat is None or lng is None or not (bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3]):
+                            continue
+                    hits.append(entry[1])
+                if limit is not None and len(hits) >= limit:
+                    return hits[:limit]
+        return hits
@@ -0,0 +1,186 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Day-of-week codes; the open-house day column is a bitmask of them (0 = unknown/TBD)
+DAY_CODES = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+WEEKEND_DAYS = (5, 6)
+
+_DAY_RE = re.compile(r"\b(mon|tue|wed|thu|fri|sat|sun)", re.IGNORECASE)
+
+
+def parse_days(open_house_time: str) -> int:
+    """Bitmask (1 << code) of every weekday named in strings like 'Sat & Sun 1-4pm'"""
+    mask = 0
+    for name in _DAY_RE.findall(open_house_time or ""):
+        mask |= 1 << DAY_CODES[name.lower()]
+    return mask
+
+
+def day_mask(days: Sequence[int]) -> int:
+    mask = 0
+    for day in days:
+        mask |= 1 << day
+    return mask
+
+
+class ListingIndex:
+    """Columnar, read-only index over the in-memory listings.
+
+    Numeric fields are held in NumPy arrays (copied out of row dicts, or
+    taken from the store's columns by ``from_store``), and price and beds
+    keep an argsort order so range filters become binary searches. Query
+    results are returned in listing id order and ``cursor`` is the last id
+    returned. Ids are never reused and new listings get higher ones, so a
+    cursor stays valid when ingests rebuild the index between pages.
+    """
+
+    def __init__(self, listings: Sequence[Dict]):
+        self.listings = listings
+        n = len(listings)
+        self._set_columns(
+            ids=np.fromiter((l.get("id") or 0 for l in listings), dtype=np.int64, count=n),
+            price=np.fromiter((l.get("price") or 0 for l in listings), dtype=np.int64, count=n),
+            beds=np.fromiter((l.get("beds") or 0 for l in listings), dtype=np.int16, count=n),
+            baths=np.fromiter((l.get("baths") or 0 for l in listings), dtype=np.float32, count=n),
+            days=np.fromiter(
+                (parse_days(l.get("open_house_time", "")) for l in listings), dtype=np.uint8, count=n
+            ),
+        )
+
+    @classmethod
+    def from_store(cls, store, columns: Optional[Dict[str, np.ndarray]] = None) -> "ListingIndex":
+        """Index a ListingStore straight from its typed columns, without decoding rows.
+
+        columns is a ``store.columns()`` result to reuse. Day masks are parsed
+        once per distinct open house string. ``query`` needs row dicts, so use
+        ``query_ids`` on an index built this way.
+        """
+        if columns is None:
+            columns = store.columns()
+        days_by_code = np.array([parse_days(text) for text in columns["open_house_times"]], dtype=np.uint8)
+        index = cls.__new__(cls)
+        index.listings = None
+        index._set_columns(
+            ids=columns["id"],
+            price=columns["price"],
+            beds=columns["beds"],
+            baths=columns["baths"],
+            days=days_by_code[columns["open_house_time"]],
+        )
+        return index
+
+    def _set_columns(self, ids: np.ndarray, price: np.ndarray, beds: np.ndarray,
+                     baths: np.ndarray, days: np.ndarray):
+        self.ids = ids
+        self.price = price
+        self.beds = beds
+        self.baths = baths
+        self.days = days  # Weekday bitmask per row
+        self.ids_sorted = bool(np.all(ids[1:] > ids[:-1]))
+
+        # Sorted copies for binary-search range filters
+        self.price_order = np.argsort(self.price, kind="stable")
+        self.price_sorted = self.price[self.price_order]
+        self.beds_order = np.argsort(self.beds, kind="stable")
+        self.beds_sorted = self.beds[self.beds_order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _range(sorted_values: np.ndarray, low, high) -> Tuple[int, int]:
+        start = 0 if low is None else int(np.searchsorted(sorted_values, low, side="left"))
+        stop = len(sorted_values) if high is None else int(np.searchsorted(sorted_values, high, side="right"))
+        return start, max(start, stop)
+
+    def matching_rows(
+        self,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        beds: Optional[int] = None,
+        min_beds: Optional[int] = None,
+        min_baths: Optional[float] = None,
+        days: Optional[List[int]] = None,
+    ) -> np.ndarray:
+        """Return the sorted row positions matching every filter"""
+        if beds is not None:
+            beds_low, beds_high = beds, beds
+        else:
+            beds_low, beds_high = min_beds, None
+
+        price_start, price_stop = self._range(self.price_sorted, min_price, max_price)
+        beds_start, beds_stop = self._range(self.beds_sorted, beds_low, beds_high)
+
+        # Drive the scan from whichever sorted range is narrower
+        if price_stop - price_start <= beds_stop - beds_start:
+            rows = self.price_order[price_start:price_stop]
+            if beds_low is not None or beds_high is not None:
+                candidate_beds = self.beds[rows]
+                mask = candidate_beds >= (beds_low if beds_low is not None else 0)
+                if beds_high is not None:
+                    mask &= candidate_beds <= beds_high
+                rows = rows[mask]
+        else:
+            rows = self.beds_order[beds_start:beds_stop]
+            if min_price is not None or max_price is not None:
+                candidate_price = self.price[rows]
+                mask = np.ones(len(rows), dtype=bool)
+                if min_price is not None:
+                    mask &= candidate_price >= min_price
+                if max_price is not None:
+                    mask &= candidate_price <= max_price
+                rows = rows[mask]
+
+        if min_baths is not None:
+            rows = rows[self.baths[rows] >= min_baths]
+        if days:
+            # Any of the requested days: "Sat & Sun 1-4pm" matches day=sun and the weekend
+            rows = rows[(self.days[rows] & day_mask(days)) != 0]
+
+        return np.sort(rows)
+
+    def matching_ids(self, **filters) -> np.ndarray:
+        """Return the sorted listing ids matching every filter"""
+        return np.sort(self.ids[self.matching_rows(**filters)])
+
+    def _page(self, limit: Optional[int], cursor: Optional[int],
+              filters: Dict) -> Tuple[np.ndarray, Optional[int], int]:
+        rows = self.matching_rows(**filters)
+        total = len(rows)
+        ids = self.ids[rows]
+        if not self.ids_sorted:
+            order = np.argsort(ids, kind="stable")
+            rows, ids = rows[order], ids[order]
+
+        if cursor is not None:
+            start = int(np.searchsorted(ids, cursor, side="right"))
+            rows, ids = rows[start:], ids[start:]
+
+        if limit is None or len(rows) <= limit:
+            return rows, None, total
+        return rows[:limit], int(ids[limit - 1]), total
+
+    def query(
+        self,
+        limit: Optional[int] = 100,
+        cursor: Optional[int] = None,
+        **filters,
+    ) -> Tuple[List[Dict], Optional[int], int]:
+        """Return one page of matching listings, the next cursor and the total match count.
+
+        limit=None returns every match after cursor.
+        """
+        page, next_cursor, total = self._page(limit, cursor, filters)
+        return [self.listings[i] for i in page.tolist()], next_cursor, total
+
+    def query_ids(
+        self,
+        limit: Optional[int] = 100,
+        cursor: Optional[int] = None,
+        **filters,
+    ) -> Tuple[List[int], Optional[int], int]:
+        """Like ``query``, but returns the page's listing ids"""
+        page, next_cursor, total = self._page(limit, cursor, filters)
+        return self.ids[page].tolist(), next_cursor, total
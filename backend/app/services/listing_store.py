@@ -0,0 +1,551 @@
+import hashlib
+import math
+import re
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.encoding import dumps, loads
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+@lru_cache(maxsize=1 << 20)
+def normalize_address(address: str) -> str:
+    """Lowercase an address and collapse punctuation/whitespace to single spaces"""
+    return _NON_ALNUM_RE.sub(" ", address.lower()).strip()
+
+
+def _iso_datetime(listing: Dict, field_name: str) -> Optional[str]:
+    """Validate and normalize an ISO datetime field (raises ValueError naming the field on junk)"""
+    value = listing.get(field_name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"{field_name}: not an ISO datetime: {value!r:.80}") from None
+
+
+def _number(listing: Dict, field_name: str, default, limit: float = sys.float_info.max):
+    """Validate a numeric field: a finite int/float within +-limit, or None (raises ValueError naming the field)"""
+    value = listing.get(field_name, default)
+    if value is None:
+        return None
+    # bool is an int subclass, and a JSON string like "37.71" would pass float() only to
+    # break the indexes once the row is stored
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not abs(value) <= limit:
+        expected = "a finite number" if limit == sys.float_info.max else f"a number within +-{limit:g}"
+        raise ValueError(f"{field_name}: not {expected}: {value!r:.80}")
+    return value
+
+
+def _text(listing: Dict, field_name: str, default: str) -> Optional[str]:
+    """Validate a text field: a str or None (raises ValueError naming the field)"""
+    value = listing.get(field_name, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{field_name}: not a string: {value!r:.80}")
+    return value
+
+
+def _count(listing: Dict, field_name: str):
+    """Validate a whole-number field such as beds (3.0 is accepted as 3)"""
+    value = _number(listing, field_name, 0)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{field_name}: not a whole number: {value!r}")
+        return int(value)
+    return value
+
+
+def listing_key(listing: Dict) -> str:
+    """Stable identity for a listing: normalized address plus source"""
+    source = (_text(listing, "source", "") or "").strip().lower()
+    return f"{source}|{normalize_address(_text(listing, 'address', '') or '')}"
+
+
+def format_listing(listing: Dict, listing_id: int) -> Dict:
+    """Convert an ingestion record to the shape the frontend expects"""
+    return {
+        "id": listing_id,
+        "address": _text(listing, "address", ""),
+        "price": (listing.get("price") or 0) // 100,  # Convert cents to dollars
+        "beds": _count(listing, "beds"),
+        "baths": _number(listing, "baths", 0),
+        "latitude": _number(listing, "latitude", 37.7749, limit=90),
+        "longitude": _number(listing, "longitude", -122.4194, limit=180),
+        "open_house_time": _text(listing, "open_house_time", "TBD"),
+        # ISO datetimes parsed at ingestion; None when the text couldn't be parsed
+        "open_house_start": _iso_datetime(listing, "open_house_start"),
+        "open_house_end": _iso_datetime(listing, "open_house_end"),
+        "description": _text(listing, "description", ""),
+    }
+
+
+def content_hash(fragment: bytes) -> int:
+    """64-bit digest of a listing's JSON encoding.
+
+    A listing keeps its id, so equal digests mean equal content. Unlike the
+    builtin hash it is stable across processes, so digests written to a
+    shared dataset file can be compared by every worker.
+    """
+    return int.from_bytes(hashlib.blake2b(fragment, digest_size=8).digest(), "little", signed=True)
+
+
+@dataclass
+class ChangeSet:
+    """Rows touched by one ingest, so indexes can be updated incrementally"""
+    inserted: List[Dict] = field(default_factory=list)
+    updated: List[Tuple[Dict, Dict]] = field(default_factory=list)  # (old, new)
+    deleted: List[Dict] = field(default_factory=list)
+    unchanged: int = 0
+    errors: List[Dict] = field(default_factory=list)  # {"index", "error"} of rows upsert skipped
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "inserted": len(self.inserted),
+            "updated": len(self.updated),
+            "unchanged": self.unchanged,
+            "deleted": len(self.deleted),
+        }
+
+
+# One fixed-size record per id: where the row's JSON lives in the blob, its
+# content hash, and the columns scans and derived indexes read directly.
+# length == 0 marks an unused or deleted id.
+ROW_DTYPE = np.dtype([
+    ("offset", np.int64),
+    ("length", np.uint32),
+    ("open_house_time", np.int32),  # StringDictionary code
+    ("hash", np.int64),
+    ("price", np.int64),
+    ("baths", np.float64),
+    ("latitude", np.float64),  # NaN when missing
+    ("longitude", np.float64),
+    ("beds", np.int32),
+])
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+_INT32_MIN, _INT32_MAX = -(1 << 31), (1 << 31) - 1
+
+# Below this much dead blob space compaction isn't worth a pass
+MIN_COMPACT_BYTES = 1 << 20
+
+
+class StringDictionary:
+    """Interns repeated strings as small integer codes; code 0 is None"""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[Optional[str]] = [None]
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ListingRow(Mapping):
+    """Read-only view of a stored listing, decoded from its JSON on first access"""
+
+    __slots__ = ("fragment", "_data")
+
+    def __init__(self, fragment: bytes):
+        self.fragment = fragment
+        self._data: Optional[Dict] = None
+
+    def _decoded(self) -> Dict:
+        if self._data is None:
+            self._data = loads(self.fragment)
+        return self._data
+
+    def __getitem__(self, name: str):
+        return self._decoded()[name]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def __repr__(self) -> str:
+        return f"ListingRow({self._decoded()!r})"
+
+
+class EncodedRows(Sequence):
+    """Rows of a blob decoded one at a time as they are read.
+
+    Lets a ChangeSet carry a whole dataset's rows (e.g. the first ``swap``
+    into an empty store) without holding every decoded dict at once.
+    """
+
+    CHUNK = 10_000
+
+    def __init__(self, blob: bytes, starts: np.ndarray, ends: np.ndarray):
+        self.blob = blob
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Dict:
+        return loads(self.blob[int(self.starts[index]):int(self.ends[index])])
+
+    def __iter__(self) -> Iterator[Dict]:
+        blob = self.blob
+        for chunk in range(0, len(self.starts), self.CHUNK):
+            starts = self.starts[chunk:chunk + self.CHUNK].tolist()
+            ends = self.ends[chunk:chunk + self.CHUNK].tolist()
+            for start, end in zip(starts, ends):
+                yield loads(blob[start:end])
+
+
+def _coordinate(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+class ListingStore:
+    """Keyed in-memory listing storage with content-hash change detection.
+
+    Ids are assigned once per listing key and never reused, so they stay
+    stable across pushes. ``version`` is bumped on every effective change
+    and lets derived indexes rebuild lazily.
+
+    Rows are not kept as dicts. Each row's JSON encoding, made once at
+    ingest so responses can splice it in, is appended to one shared blob,
+    and a structured array indexed by id holds its position there next to
+    typed price/beds/baths/coordinate columns and a dictionary code for the
+    open house text. ``get`` returns a lazy view that only decodes when read.
+    Replaced rows leave dead space in the blob, which ``commit`` compacts
+    once it outgrows the live data.
+
+    Readers don't take the ingest lock: the blob, row array and open house
+    dictionary are replaced together as one tuple, which a reader captures
+    once, and a row's record is written in one assignment.
+    Both may also be read-only buffers over a mapped dataset file (see
+    ``swap``); they are copied on the first write.
+    """
+
+    def __init__(self):
+        self.ids_by_key: Dict[str, int] = {}
+        self.keys: List[Optional[str]] = [None]  # Indexed by id; id 0 is never used
+        self._data: Tuple[bytes, np.ndarray, StringDictionary] = (
+            bytearray(), np.zeros(1024, dtype=ROW_DTYPE), StringDictionary()
+        )
+        self._count = 0
+        self._garbage = 0
+        self.next_id = 1
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def open_house_times(self) -> StringDictionary:
+        return self._data[2]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the blob and row array (not counting the key lookups)"""
+        blob, rows, _ = self._data
+        return len(blob) + rows.nbytes
+
+    def live_ids(self) -> np.ndarray:
+        """Sorted ids of the stored listings"""
+        _, rows, _ = self._data
+        return np.flatnonzero(rows["length"])
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Typed columns of every stored listing, in id order.
+
+        Values are copies, so they stay consistent while ingests continue.
+        ``open_house_time`` holds codes into ``open_house_times``, the
+        dictionary's values as of the same moment.
+        """
+        _, rows, open_house_times = self._data
+        ids = np.flatnonzero(rows["length"])
+        live = rows[ids]
+        columns = {name: live[name] for name in ("price", "beds", "baths", "latitude", "longitude", "open_house_time")}
+        columns["id"] = ids
+        # Codes are only ever appended, so every code in the copy is covered
+        columns["open_house_times"] = list(open_house_times.values)
+        return columns
+
+    def fragment(self, listing_id: int) -> Optional[bytes]:
+        """A listing's JSON encoding, or None if there is no such listing"""
+        blob, rows, _ = self._data
+        if not 0 < listing_id < len(rows):
+            return None
+        offset, length = rows[["offset", "length"]][listing_id].item()
+        return blob[offset:offset + length] if length else None
+
+    def get(self, listing_id: int) -> Optional[ListingRow]:
+        fragment = self.fragment(listing_id)
+        return None if fragment is None else ListingRow(fragment)
+
+    def values(self) -> List[ListingRow]:
+        return [ListingRow(fragment) for fragment in self.encoded(self.live_ids().tolist())]
+
+    def encoded(self, listing_ids: Iterable[int]) -> List[bytes]:
+        """JSON fragments for listing_ids, skipping any deleted since the ids were looked up"""
+        blob, rows, _ = self._data
+        ids = np.fromiter(listing_ids, dtype=np.int64)
+        ids = ids[(ids > 0) & (ids < len(rows))]
+        spans = rows[ids]
+        spans = spans[spans["length"] != 0]
+        starts = spans["offset"]
+        return [blob[start:end] for start, end in zip(starts.tolist(), (starts + spans["length"]).tolist())]
+
+    def upsert(self, listings: Iterable[Dict], delete_missing: bool = False) -> ChangeSet:
+        """Insert new listings, update changed ones and skip identical ones.
+
+        With ``delete_missing`` the push is treated as a full snapshot and any
+        stored listing whose key was not seen is deleted. A row that cannot be
+        stored is skipped and reported in ``errors``; the rest still apply.
+        """
+        changes = ChangeSet()
+        seen = set() if delete_missing else None
+
+        for index, listing in enumerate(listings):
+            try:
+                self.apply(listing, changes, seen)
+            except Exception as e:
+                changes.errors.append({"index": index, "error": str(e)})
+
+        if delete_missing:
+            self.delete_unseen(seen, changes)
+
+        self.commit(changes)
+        return changes
+
+    def apply(self, listing: Dict, changes: ChangeSet, seen: Optional[set] = None):
+        """Upsert one listing, recording the outcome in changes.
+
+        Raises if the record cannot be formatted; the store is left untouched
+        in that case, and a stored listing with the same key counts as seen so
+        a sync push keeps its previous version. Call ``commit`` once the batch
+        is done.
+        """
+        if not isinstance(listing, dict):
+            raise ValueError("listing is not a JSON object")
+        key = listing_key(listing)
+        listing_id = self.ids_by_key.get(key)
+        is_new = listing_id is None
+        if is_new:
+            listing_id = self.next_id
+        elif seen is not None:
+            seen.add(listing_id)
+
+        formatted = format_listing(listing, listing_id)
+        fragment = dumps(formatted)
+        digest = content_hash(fragment)
+        if not is_new and self._data[1]["hash"][listing_id] == digest:
+            changes.unchanged += 1
+            return
+        record = self._record(formatted, digest)  # Raises on non-numeric fields
+        if seen is not None:
+            seen.add(listing_id)
+
+        if is_new:
+            self.next_id += 1
+            self.ids_by_key[key] = listing_id
+            self._set_key(listing_id, key)
+            changes.inserted.append(formatted)
+        else:
+            changes.updated.append((loads(self.fragment(listing_id)), formatted))
+        self._write(listing_id, fragment, record)
+
+    def delete_unseen(self, seen: set, changes: ChangeSet):
+        """Delete every stored listing whose id is not in seen"""
+        for listing_id in [i for i in self.live_ids().tolist() if i not in seen]:
+            changes.deleted.append(self._delete(listing_id))
+
+    def commit(self, changes: ChangeSet):
+        """Bump the dataset version if the change set did anything"""
+        if changes:
+            self.version += 1
+            blob = self._data[0]
+            if self._garbage > max(MIN_COMPACT_BYTES, len(blob) - self._garbage):
+                self.compact()
+
+    def compact(self):
+        """Rewrite the blob with only the live rows, in id order"""
+        blob, rows, open_house_times = self._data
+        rows = rows.copy()
+        ids = np.flatnonzero(rows["length"])
+        lengths = rows["length"][ids].astype(np.int64)
+        spans = rows[["offset", "length"]]
+        compacted = bytearray(b"".join([
+            blob[offset:offset + length] for offset, length in spans[ids].tolist()
+        ]))
+        rows["offset"][ids] = np.cumsum(lengths) - lengths
+        self._data = (compacted, rows, open_house_times)
+        self._garbage = 0
+
+    def buffers(self) -> Tuple[bytes, np.ndarray]:
+        """The blob and the row array up to next_id, for writing out as they are"""
+        blob, rows, _ = self._data
+        if len(rows) < self.next_id:  # Emptied by clear(), which keeps next_id
+            rows = np.concatenate([rows, np.zeros(self.next_id - len(rows), dtype=ROW_DTYPE)])
+        return blob, rows[:self.next_id]
+
+    def swap(self, blob: bytes, rows: np.ndarray, key_of: Callable[[int], str],
+             open_house_times: StringDictionary) -> ChangeSet:
+        """Replace the contents with another copy of the dataset, e.g. a newer
+        generation of a shared dataset file, without copying its buffers.
+
+        rows is indexed by id and ends at the new next_id; key_of gives the
+        key of an id in the new copy. Rows are diffed by content hash, so the
+        returned ChangeSet only holds what actually differs and the
+        incremental indexes can be updated from it as after an ingest.
+        """
+        _, old_rows, _ = self._data
+        old_rows = old_rows[:self.next_id]
+        size = max(len(old_rows), len(rows))
+        old_length, new_length = np.zeros(size, dtype=np.uint32), np.zeros(size, dtype=np.uint32)
+        old_hash, new_hash = np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64)
+        old_length[:len(old_rows)] = old_rows["length"]
+        old_hash[:len(old_rows)] = old_rows["hash"]
+        new_length[:len(rows)] = rows["length"]
+        new_hash[:len(rows)] = rows["hash"]
+        old_live, new_live = old_length != 0, new_length != 0
+
+        inserted = np.flatnonzero(new_live & ~old_live)
+        deleted = np.flatnonzero(old_live & ~new_live)
+        updated = np.flatnonzero(old_live & new_live & (old_hash != new_hash))
+        changes = ChangeSet(unchanged=int(np.count_nonzero(old_live & new_live)) - len(updated))
+        changes.deleted = self._encoded_rows(deleted)
+        old_updated = [loads(fragment) for fragment in self.encoded(updated)]
+
+        for listing_id in deleted.tolist():
+            del self.ids_by_key[self.keys[listing_id]]
+            self.keys[listing_id] = None
+        for listing_id in inserted.tolist():
+            key = key_of(listing_id)
+            self.ids_by_key[key] = listing_id
+            self._set_key(listing_id, key)
+        del self.keys[len(rows):]
+
+        self._data = (blob, rows, open_house_times)
+        self.next_id = max(len(rows), 1)
+        self._count = int(np.count_nonzero(new_live))
+        self._garbage = len(blob) - int(rows["length"].sum(dtype=np.int64))
+
+        changes.inserted = self._encoded_rows(inserted)
+        changes.updated = list(zip(old_updated, [loads(fragment) for fragment in self.encoded(updated)]))
+        if changes:
+            self.version += 1
+        return changes
+
+    def _encoded_rows(self, listing_ids: np.ndarray) -> EncodedRows:
+        blob, rows, _ = self._data
+        spans = rows[listing_ids]
+        return EncodedRows(blob, spans["offset"], spans["offset"] + spans["length"])
+
+    def dump(self) -> Iterator[Tuple[str, bytes]]:
+        """(key, encoded row) for every listing, for snapshots"""
+        ids = self.live_ids().tolist()
+        for listing_id, fragment in zip(ids, self.encoded(ids)):
+            yield self.keys[listing_id], fragment
+
+    def restore(self, entries: Iterable[Tuple[str, bytes]], next_id: int = 1) -> ChangeSet:
+        """Replace the contents with dumped entries, keeping their ids.
+
+        Returns a ChangeSet with every restored row as inserted so the
+        incremental indexes can be rebuilt from it.
+        """
+        self.clear()
+        changes = ChangeSet()
+        for key, fragment in entries:
+            row = loads(fragment)
+            listing_id = row["id"]
+            self.ids_by_key[key] = listing_id
+            self._set_key(listing_id, key)
+            self._write(listing_id, fragment, self._record(row, content_hash(fragment)))
+            next_id = max(next_id, listing_id + 1)
+            changes.inserted.append(row)
+        self.next_id = next_id
+        self.commit(changes)
+        return changes
+
+    def _record(self, formatted: Dict, digest: int) -> Tuple:
+        """A row's ROW_DTYPE values, less its blob position"""
+        price = int(formatted["price"] or 0)
+        beds = int(formatted["beds"] or 0)
+        # Checked up front: an out-of-range value would fail halfway through the row write
+        if not (_INT64_MIN <= price <= _INT64_MAX and _INT32_MIN <= beds <= _INT32_MAX):
+            raise ValueError(f"price or beds out of range: {price}, {beds}")
+        return (
+            self.open_house_times.code(formatted["open_house_time"]),
+            digest,
+            price,
+            float(formatted["baths"] or 0),
+            _coordinate(formatted["latitude"]),
+            _coordinate(formatted["longitude"]),
+            beds,
+        )
+
+    def _set_key(self, listing_id: int, key: str):
+        if listing_id >= len(self.keys):
+            self.keys.extend([None] * (listing_id + 1 - len(self.keys)))
+        self.keys[listing_id] = key
+
+    def _writable(self) -> Tuple[bytearray, np.ndarray]:
+        blob, rows, open_house_times = self._data
+        if not isinstance(blob, bytearray) or not rows.flags.writeable:
+            blob, rows = bytearray(blob), rows.copy()
+            self._data = (blob, rows, open_house_times)
+        return blob, rows
+
+    def _write(self, listing_id: int, fragment: bytes, record: Tuple):
+        blob, rows = self._writable()
+        if listing_id >= len(rows):
+            rows = np.concatenate([rows, np.zeros(max(listing_id + 1, 2 * len(rows)) - len(rows), dtype=ROW_DTYPE)])
+            self._data = (blob, rows, self.open_house_times)
+        old_length = int(rows["length"][listing_id])
+        if old_length:
+            self._garbage += old_length
+        else:
+            self._count += 1
+        offset = len(blob)
+        blob += fragment
+        rows[listing_id] = (offset, len(fragment)) + record
+
+    def _delete(self, listing_id: int) -> Dict:
+        key = self.keys[listing_id]
+        self.keys[listing_id] = None
+        del self.ids_by_key[key]
+        row = loads(self.fragment(listing_id))
+        _, rows = self._writable()
+        self._garbage += int(rows["length"][listing_id])
+        rows["length"][listing_id] = 0
+        self._count -= 1
+        return row
+
+    def clear(self) -> int:
+        count = self._count
+        self.ids_by_key.clear()
+        self.keys = [None]
+        self._data = (bytearray(), np.zeros(1024, dtype=ROW_DTYPE), StringDictionary())
+        self._count = 0
+        self._garbage = 0
+        if count:
+            self.version += 1
+        return count
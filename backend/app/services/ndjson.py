@@ -0,0 +1,130 @@
+"""
+Bounded-memory reading of NDJSON request bodies
+
+A gzip body is inflated at most INFLATE_CHUNK_BYTES per step, and no more
+than MAX_LINE_BYTES of one line is ever buffered: a longer line is reported
+(as None) and the rest of it dropped. Memory stays bounded however far a
+small compressed body expands. Concatenated gzip members (as
+`cat a.gz b.gz` produces) are read as one stream. A LineSpool holds a whole body's lines for
+reading back once it has all arrived, spilling to a temporary file past
+SPOOL_MEMORY_BYTES.
+"""
+import tempfile
+import zlib
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+INFLATE_CHUNK_BYTES = 1 << 20
+MAX_LINE_BYTES = 1 << 20
+SPOOL_MEMORY_BYTES = 8 << 20
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+Line = Tuple[int, Optional[bytes]]  # (1-based line number, content or None if too long)
+
+
+class LineSplitter:
+    """Splits a byte stream into lines, holding at most max_line_bytes of one"""
+
+    def __init__(self, max_line_bytes: int = MAX_LINE_BYTES):
+        self.max_line_bytes = max_line_bytes
+        self.count = 0
+        self._buffer = b""
+        self._oversized = False  # Dropping the rest of a line that outgrew the limit
+
+    def feed(self, data: bytes) -> List[Line]:
+        """Lines completed by data; blank ones are counted but not returned"""
+        *complete, rest = data.split(b"\n")
+        lines = []
+        for piece in complete:
+            self._end_line(piece, lines)
+        if not self._oversized:
+            self._buffer += rest
+            if len(self._buffer) > self.max_line_bytes:
+                self._buffer = b""
+                self._oversized = True
+        return lines
+
+    def finish(self) -> List[Line]:
+        """The last line, if the stream didn't end with a newline"""
+        lines = []
+        if self._buffer.strip() or self._oversized:
+            self._end_line(b"", lines)
+        return lines
+
+    def _end_line(self, piece: bytes, lines: List[Line]):
+        self.count += 1
+        line, self._buffer = self._buffer + piece, b""
+        if self._oversized or len(line) > self.max_line_bytes:
+            self._oversized = False
+            lines.append((self.count, None))
+        elif line.strip():
+            lines.append((self.count, line))
+
+
+class NdjsonLines:
+    """``async for number, line in NdjsonLines(request.stream(), gzipped)``
+
+    ``count`` is the number of lines read so far, blank ones included.
+    Raises zlib.error on a corrupt or truncated gzip body.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], gzipped: bool = False,
+                 max_line_bytes: int = MAX_LINE_BYTES):
+        self.chunks = chunks
+        self.decompressor = zlib.decompressobj(_GZIP_WBITS) if gzipped else None
+        self.splitter = LineSplitter(max_line_bytes)
+
+    @property
+    def count(self) -> int:
+        return self.splitter.count
+
+    def __aiter__(self) -> AsyncIterator[Line]:
+        return self._lines()
+
+    async def _lines(self) -> AsyncIterator[Line]:
+        async for chunk in self.chunks:
+            pieces = [chunk] if self.decompressor is None else self._inflate(chunk)
+            for data in pieces:
+                for line in self.splitter.feed(data):
+                    yield line
+        if self.decompressor is not None:
+            if not self.decompressor.eof:
+                raise zlib.error("gzip stream ended early")
+            for line in self.splitter.feed(self.decompressor.flush()):
+                yield line
+        for line in self.splitter.finish():
+            yield line
+
+    def _inflate(self, data: bytes) -> Iterator[bytes]:
+        while data:
+            if self.decompressor.eof:
+                # Data after a member's trailer is the next member
+                self.decompressor = zlib.decompressobj(_GZIP_WBITS)
+            yield self.decompressor.decompress(data, INFLATE_CHUNK_BYTES)
+            data = self.decompressor.unconsumed_tail or self.decompressor.unused_data
+
+
+class LineSpool:
+    """Numbered lines kept in memory up to max_memory_bytes, then in a temporary file"""
+
+    def __init__(self, max_memory_bytes: int = SPOOL_MEMORY_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def write(self, number: int, line: bytes):
+        # Split lines hold no newline, so each entry is one line of the spool
+        self._file.write(b"%d %s\n" % (number, line))
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        """The lines written so far, in order, read back one at a time"""
+        self._file.seek(0)
+        for entry in self._file:
+            number, _, line = entry[:-1].partition(b" ")
+            yield int(number), line
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.services.encoding import render
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def cache_key(path: str, params: Dict) -> CacheKey:
+    """Key for a GET request from its validated parameters.
+
+    Keying on parsed values rather than the raw query string makes
+    "?max_price=900000&min_beds=2" and "?min_beds=02&max_price=900000"
+    share an entry. Unset (None) parameters are left out.
+    """
+    return path, tuple(sorted((name, repr(value)) for name, value in params.items() if value is not None))
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag: a digest of the exact response bytes"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers etag (weak validators compare equal too)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """LRU cache of serialized GET responses for one dataset version.
+
+    Entries are ``(etag, body)`` and are bounded both by count and by total
+    body bytes. Every entry belongs to the version it was computed for: a
+    lookup with a newer version drops the whole cache, so an ingest never
+    serves stale results and needs no per-key invalidation.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[CacheKey, Tuple[str, bytes]]" = OrderedDict()
+        self.version: Optional[int] = None
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: CacheKey, version: int) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            if version != self.version:
+                self._reset(version)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: CacheKey, version: int, etag: str, body: bytes):
+        """Store a response computed at version; ignored if the dataset has moved on"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old[1])
+            self.entries[key] = (etag, body)
+            self.size_bytes += len(body)
+            while len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def get_or_compute(self, key: CacheKey, version: Callable[[], int],
+                       compute: Callable[[], Dict]) -> Tuple[str, bytes]:
+        """Cached (etag, body) for key, computing and storing it on a miss.
+
+        version returns the current dataset version. compute runs outside
+        the lock; if an ingest lands while it runs the result is still
+        returned, just not cached.
+        """
+        started_at = version()
+        entry = self.get(key, started_at)
+        if entry is not None:
+            return entry
+        body = render(compute())
+        etag = make_etag(body)
+        if version() == started_at:
+            self.put(key, started_at, etag, body)
+        return etag, body
+
+    def _reset(self, version: int):
+        self.entries.clear()
+        self.size_bytes = 0
+        self.version = version
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.size_bytes = 0
+            self.version = None
@@ -0,0 +1,232 @@
+import bisect
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Too common in listing copy to help ranking; skipped when indexing and querying
+STOPWORDS = frozenset(
+    "a an and are at by for from in is it of on or the this to with".split()
+)
+
+# Shortest last query word that is expanded as a prefix ("vic" -> victorian)
+MIN_PREFIX_LENGTH = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric words of text, without stopwords"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _intersect(left_ids: np.ndarray, right_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions in each of two sorted, unique id arrays of the ids they share.
+
+    Binary-searches the shorter array into the longer one, which beats
+    np.intersect1d's concatenate-and-sort when one side is large.
+    """
+    swap = len(left_ids) > len(right_ids)
+    small, big = (right_ids, left_ids) if swap else (left_ids, right_ids)
+    positions = np.searchsorted(big, small)
+    positions[positions == len(big)] = 0
+    found = big[positions] == small
+    small_positions, big_positions = np.nonzero(found)[0], positions[found]
+    return (big_positions, small_positions) if swap else (small_positions, big_positions)
+
+
+class SearchIndex:
+    """Incremental inverted index with BM25 ranking.
+
+    ``postings`` maps each term to ``{id: term frequency}`` so documents can
+    be added and removed one at a time. Queries read per-term NumPy arrays
+    (sorted ids and frequencies), built on first use and dropped whenever
+    that term's postings change; scoring, intersection and top-k selection
+    are then vectorized. Terms containing a letter are also kept in a sorted
+    vocabulary for prefix lookups (house numbers only match exactly, which
+    keeps that list small). Every public method holds the index's lock,
+    since ingests update it while requests search it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.vocabulary: List[str] = []
+        self.doc_len = np.zeros(1024, dtype=np.float32)  # Indexed by id
+        self.present = np.zeros(1024, dtype=bool)
+        self.docs = 0
+        self.total_len = 0
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.docs
+
+    def add(self, doc_id: int, text: str):
+        tokens = tokenize(text)
+        with self._lock:
+            self._add(doc_id, tokens)
+
+    def _add(self, doc_id: int, tokens: List[str]):
+        if doc_id >= len(self.doc_len):
+            size = max(doc_id + 1, 2 * len(self.doc_len))
+            self.doc_len = np.concatenate([self.doc_len, np.zeros(size - len(self.doc_len), dtype=np.float32)])
+            self.present = np.concatenate([self.present, np.zeros(size - len(self.present), dtype=bool)])
+        self.doc_len[doc_id] = len(tokens)
+        self.present[doc_id] = True
+        self.docs += 1
+        self.total_len += len(tokens)
+
+        for term, count in Counter(tokens).items():
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = {}
+                if not term.isdigit():
+                    bisect.insort(self.vocabulary, term)
+            docs[doc_id] = count
+            self._arrays.pop(term, None)
+
+    def remove(self, doc_id: int, text: str):
+        """Remove a document, given the text it was added with"""
+        tokens = tokenize(text)
+        with self._lock:
+            self._remove(doc_id, tokens)
+
+    def _remove(self, doc_id: int, tokens: List[str]):
+        if doc_id >= len(self.present) or not self.present[doc_id]:
+            return
+        for term in set(tokens):
+            docs = self.postings.get(term)
+            if docs is None or docs.pop(doc_id, None) is None:
+                continue
+            self._arrays.pop(term, None)
+            if not docs:
+                del self.postings[term]
+                if not term.isdigit():
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+        self.docs -= 1
+        self.total_len -= len(tokens)
+        self.doc_len[doc_id] = 0
+        self.present[doc_id] = False
+
+    def clear(self):
+        with self._lock:
+            self.postings.clear()
+            self.vocabulary.clear()
+            self._arrays.clear()
+            self.doc_len[:] = 0
+            self.present[:] = False
+            self.docs = 0
+            self.total_len = 0
+
+    def expand(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with prefix"""
+        with self._lock:
+            return self._expand(prefix)
+
+    def _expand(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        stop = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        return self.vocabulary[start:stop]
+
+    def _term_arrays(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            docs = self.postings[term]
+            ids = np.fromiter(docs.keys(), dtype=np.int64, count=len(docs))
+            tfs = np.fromiter(docs.values(), dtype=np.float32, count=len(docs))
+            order = np.argsort(ids)
+            arrays = self._arrays[term] = (ids[order], tfs[order])
+        return arrays
+
+    def _bm25(self, tfs: np.ndarray, ids: np.ndarray, df: int, avg_len: float) -> np.ndarray:
+        idf = np.log(1 + (self.docs - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[ids] / avg_len)
+        return idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+    def _word_terms(self, word: str, is_prefix: bool) -> List[str]:
+        if is_prefix and len(word) >= MIN_PREFIX_LENGTH and not word.isdigit():
+            return self._expand(word)
+        return [word] if word in self.postings else []
+
+    def _prefix_scores(self, terms: List[str], avg_len: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, scores) of documents matching any of terms; the best-scoring term counts"""
+        ids_parts, score_parts = [], []
+        for term in terms:
+            term_ids, tfs = self._term_arrays(term)
+            ids_parts.append(term_ids)
+            score_parts.append(self._bm25(tfs, term_ids, len(term_ids), avg_len))
+        ids = np.concatenate(ids_parts)
+        scores = np.concatenate(score_parts)
+        order = np.lexsort((-scores, ids))
+        ids, scores = ids[order], scores[order]
+        first = np.ones(len(ids), dtype=bool)
+        first[1:] = ids[1:] != ids[:-1]
+        return ids[first], scores[first]
+
+    def search(self, query: str, limit: int = 20,
+               allowed_ids: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, float]], int]:
+        """Top ``(id, score)`` pairs for query and the total number of matches.
+
+        Every query word must match (AND); the last word also matches as a
+        prefix. allowed_ids (sorted) restricts results, e.g. to the ids
+        passing price/beds filters. Equal scores are ordered by id.
+        """
+        with self._lock:
+            return self._search(query, limit, allowed_ids)
+
+    def _search(self, query: str, limit: int,
+                allowed_ids: Optional[np.ndarray]) -> Tuple[List[Tuple[int, float]], int]:
+        words = tokenize(query)
+        if not words or not self.docs:
+            return [], 0
+        avg_len = max(self.total_len / self.docs, 1.0)
+
+        # Prefix only while the user is still typing the last word
+        prefix_last = bool(query) and not query[-1].isspace()
+        matches = []
+        for i, word in enumerate(words):
+            terms = self._word_terms(word, prefix_last and i == len(words) - 1)
+            if not terms:
+                return [], 0
+            matches.append(terms)
+        # Rarest word first, so later words are only scored on the surviving ids
+        matches.sort(key=lambda terms: sum(len(self.postings[term]) for term in terms))
+
+        ids = scores = None
+        for terms in matches:
+            if len(terms) == 1:
+                word_ids, tfs = self._term_arrays(terms[0])
+                if ids is None:
+                    ids, scores = word_ids, self._bm25(tfs, word_ids, len(word_ids), avg_len)
+                else:
+                    left, right = _intersect(ids, word_ids)
+                    ids = ids[left]
+                    scores = scores[left] + self._bm25(tfs[right], ids, len(word_ids), avg_len)
+            else:
+                word_ids, word_scores = self._prefix_scores(terms, avg_len)
+                if ids is None:
+                    ids, scores = word_ids, word_scores
+                else:
+                    left, right = _intersect(ids, word_ids)
+                    ids, scores = ids[left], scores[left] + word_scores[right]
+            if not len(ids):
+                return [], 0
+
+        if allowed_ids is not None:
+            keep = np.isin(ids, allowed_ids, assume_unique=True)
+            ids, scores = ids[keep], scores[keep]
+        total = len(ids)
+        if not total:
+            return [], 0
+
+        if total > limit:
+            # Everything tied with the limit-th best score, still in id order
+            threshold = np.partition(scores, total - limit)[total - limit]
+            candidates = np.nonzero(scores >= threshold)[0]
+            ids, scores = ids[candidates], scores[candidates]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return list(zip(ids[order].tolist(), scores[order].tolist())), total
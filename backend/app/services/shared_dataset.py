@@ -0,0 +1,198 @@
+"""
+Memory-mapped dataset file shared by every API worker
+
+With ``uvicorn --workers N`` each worker is its own process. Set
+DATASET_PATH and they all serve one dataset file instead of private copies:
+
+- Ingests publish a new generation. The file is written in full under a
+  temporary name, then renamed over DATASET_PATH, so readers see either the
+  old generation or the new one, never a partial file.
+- Workers map the file read-only and the ListingStore serves from the
+  mapping. The row blob and row array live once in the page cache however
+  many workers there are. Only the key lookup and derived indexes are
+  per process.
+- Before a request, a worker stats the path. A new generation is mapped and
+  diffed by content hash, so its indexes get the same incremental update
+  an ingest would make.
+- Writers hold an exclusive flock on DATASET_PATH + ".lock" from mapping the
+  latest generation until theirs is renamed into place. Ingests that land on
+  different workers queue up instead of overwriting each other.
+
+The file is also the persistent snapshot: a restarted worker maps it and is
+back at the last published state.
+
+Layout (native byte order):
+  blob         the rows' JSON encodings, at offset 0 so row offsets are file offsets
+  rows         ROW_DTYPE records indexed by id, up to next_id
+  key_offsets  int64 x (next_id + 1); the key of id i is keys[key_offsets[i]:key_offsets[i + 1]]
+  keys         UTF-8 listing keys
+  header       JSON: format, generation, section offsets and sizes, open house strings
+  trailer      u64 header length, then MAGIC
+Sections start on 64-byte boundaries.
+"""
+import fcntl
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.services.encoding import dumps, loads
+from app.services.listing_store import ROW_DTYPE, ChangeSet, ListingStore, StringDictionary
+
+MAGIC = b"OHDATA01"
+FORMAT_VERSION = 1
+_TRAILER = struct.Struct("<Q8s")
+_ALIGN = 64
+
+
+def dataset_path() -> Optional[str]:
+    return os.environ.get("DATASET_PATH") or None
+
+
+def _identity(stat: os.stat_result) -> Tuple[int, int, int, int]:
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _pad(f, position: int) -> int:
+    padding = -position % _ALIGN
+    f.write(b"\0" * padding)
+    return position + padding
+
+
+def write_dataset(store: ListingStore, path: str, generation: int) -> int:
+    """Write store as one dataset generation, atomically; returns the file size"""
+    blob, rows = store.buffers()
+    next_id = len(rows)
+    keys = [key.encode() if key is not None else b"" for key in store.keys[:next_id]]
+    keys += [b""] * (next_id - len(keys))
+    key_offsets = np.zeros(next_id + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, keys), dtype=np.int64, count=next_id), out=key_offsets[1:])
+
+    sections = {}
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        position = 0
+        for name, data in (("blob", blob), ("rows", rows), ("key_offsets", key_offsets), ("keys", b"".join(keys))):
+            position = _pad(f, position)
+            size = f.write(data)
+            sections[name] = [position, size]
+            position += size
+        header = dumps({
+            "format": FORMAT_VERSION,
+            "generation": generation,
+            "count": len(store),
+            "next_id": next_id,
+            "row_size": ROW_DTYPE.itemsize,
+            "sections": sections,
+            "open_house_times": store.open_house_times.values[1:],
+        })
+        f.write(header)
+        f.write(_TRAILER.pack(len(header), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class MappedDataset:
+    """One generation of a dataset file, mapped read-only"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.identity = _identity(os.fstat(f.fileno()))
+            self._file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            header_length, magic = _TRAILER.unpack(self._file[-_TRAILER.size:])
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a dataset file")
+            header_end = len(self._file) - _TRAILER.size
+            self.header: Dict = loads(self._file[header_end - header_length:header_end])
+            if self.header["format"] != FORMAT_VERSION or self.header["row_size"] != ROW_DTYPE.itemsize:
+                raise ValueError(f"{path} was written by an incompatible version")
+            sections = self.header["sections"]
+            blob_size = sections["blob"][1]
+            # A second mapping of just the blob: slicing an mmap yields bytes, which responses need
+            self.blob = mmap.mmap(f.fileno(), blob_size, access=mmap.ACCESS_READ) if blob_size else b""
+
+        next_id = self.header["next_id"]
+        self.rows = np.frombuffer(self._file, dtype=ROW_DTYPE, count=next_id, offset=sections["rows"][0])
+        self.key_offsets = np.frombuffer(
+            self._file, dtype=np.int64, count=next_id + 1, offset=sections["key_offsets"][0]
+        )
+        self._keys_start = sections["keys"][0]
+
+    @property
+    def generation(self) -> int:
+        return self.header["generation"]
+
+    def key_of(self, listing_id: int) -> str:
+        start, end = self.key_offsets[listing_id:listing_id + 2].tolist()
+        return self._file[self._keys_start + start:self._keys_start + end].decode()
+
+    def install(self, store: ListingStore) -> ChangeSet:
+        """Point store at this generation; returns what changed"""
+        return store.swap(self.blob, self.rows, self.key_of, StringDictionary(self.header["open_house_times"]))
+
+
+class SharedDataset:
+    """Keeps one process's ListingStore on the latest generation at path"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.identity: Optional[Tuple[int, int, int, int]] = None
+        self.generation = 0
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def changed(self) -> bool:
+        """True if a generation other than the one last installed is at path (a stat call)"""
+        try:
+            return _identity(os.stat(self.path)) != self.identity
+        except FileNotFoundError:
+            return False
+
+    def sync(self, store: ListingStore) -> ChangeSet:
+        """Install the latest published generation into store, if it is new"""
+        if not self.changed():
+            return ChangeSet()
+        mapped = MappedDataset(self.path)
+        changes = mapped.install(store)
+        self.identity = mapped.identity
+        self.generation = mapped.generation
+        return changes
+
+    def publish(self, store: ListingStore) -> int:
+        """Write store as the next generation and serve it from the new mapping.
+
+        Call with the lock held, after ``sync``; returns the generation.
+        """
+        write_dataset(store, self.path, self.generation + 1)
+        self.sync(store)
+        return self.generation
+
+    def acquire(self, blocking: bool = True) -> Optional[int]:
+        """Take the writer lock; returns a token for ``release``, or None if not blocking and busy"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def release(self, token: int):
+        fcntl.flock(token, fcntl.LOCK_UN)
+        os.close(token)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        token = self.acquire()
+        try:
+            yield
+        finally:
+            self.release(token)
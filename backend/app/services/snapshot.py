@@ -0,0 +1,65 @@
+"""
+Prebuilt dataset snapshots for fast cold starts
+
+A snapshot is the ListingStore dumped to one file: a JSON header line, then
+one line per listing holding its JSON-encoded key, a tab, and the row's
+pre-encoded JSON (the same bytes responses are built from), so loading
+needs no re-encoding. JSON strings can't contain a raw tab or newline,
+which keeps the format splittable without escaping.
+
+Set SNAPSHOT_PATH to have the API load it at startup.
+"""
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+from app.services.encoding import dumps, loads
+
+if TYPE_CHECKING:  # app.main reads snapshots without the store (or NumPy)
+    from app.services.listing_store import ListingStore
+
+FORMAT = "open-house-snapshot"
+FORMAT_VERSION = 1
+
+
+def snapshot_path() -> Optional[str]:
+    return os.environ.get("SNAPSHOT_PATH") or None
+
+
+def write_snapshot(store: "ListingStore", path: str) -> int:
+    """Write the store to path atomically (temp file, then rename); returns the row count"""
+    header = {"format": FORMAT, "version": FORMAT_VERSION, "count": len(store), "next_id": store.next_id}
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(header) + b"\n")
+        for key, fragment in store.dump():
+            f.write(dumps(key) + b"\t" + fragment + b"\n")
+    os.replace(tmp_path, path)
+    return header["count"]
+
+
+def read_snapshot(path: str) -> Tuple[Dict, List[Tuple[str, bytes]]]:
+    """(header, [(key, fragment), ...]) from a snapshot file"""
+    with open(path, "rb") as f:
+        lines = f.read().split(b"\n")
+    header = loads(lines[0])
+    if header.get("format") != FORMAT or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT} file")
+    entries = []
+    for line in lines[1:]:
+        if line:
+            key, fragment = line.split(b"\t", 1)
+            entries.append((loads(key), fragment))
+    return header, entries
+
+
+def iter_fragments(path: str) -> Iterator[bytes]:
+    """Just the encoded rows, for read-only serving without building a store"""
+    _, entries = read_snapshot(path)
+    for _, fragment in entries:
+        yield fragment
+
+
+def load_snapshot(store: "ListingStore", path: str):
+    """Replace store's contents with the snapshot; returns the ChangeSet of restored rows"""
+    header, entries = read_snapshot(path)
+    return store.restore(entries, next_id=header.get("next_id", 1))
@@ -1,10 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict
+from fastapi.responses import ORJSONResponse
+from starlette.requests import ClientDisconnect
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Optional
 import json
 import os
+import threading
+import zlib
 
-app = FastAPI(title="Open House Finder API")
+from app.services.clusters import ClusterTiers, ClusterTiersBuilder
+from app.services.encoding import Fragments, with_fields
+from app.services.geo_index import GridIndex
+from app.services.interval_index import IntervalIndex, to_seconds
+from app.services.listing_index import DAY_CODES, WEEKEND_DAYS, ListingIndex
+from app.services.listing_store import ChangeSet, ListingStore
+from app.services.ndjson import MAX_LINE_BYTES, LineSpool, NdjsonLines
+from app.services.response_cache import ResponseCache, cache_key, etag_matches
+from app.services.search_index import SearchIndex
+from app.services.shared_dataset import SharedDataset, dataset_path
+from app.services.snapshot import load_snapshot, snapshot_path, write_snapshot
+
+app = FastAPI(title="Open House Finder API", default_response_class=ORJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -16,7 +36,158 @@ app.add_middleware(
 )
 
 # In-memory storage for now
-listings_storage = []
+store = ListingStore()
+geo_index = GridIndex()
+window_index = IntervalIndex()
+search_index = SearchIndex()
+
+# Serialized GET responses, keyed by the store.version the incremental
+# indexes have caught up with: a response computed between an ingest's
+# commit and its index updates is never cached under the new version
+response_cache = ResponseCache()
+_indexed = {"version": 0}
+
+# Derived read index, rebuilt lazily when store.version moves on
+_derived = {"version": -1, "listings_index": None}
+_derived_lock = threading.Lock()
+
+# Sync endpoints run in a threadpool, so concurrent ingests must not interleave
+_ingest_lock = threading.Lock()
+
+# With DATASET_PATH set, workers serve one memory-mapped dataset file that
+# every ingest publishes a new generation of (see app.services.shared_dataset)
+shared_dataset = SharedDataset(dataset_path()) if dataset_path() else None
+
+def get_listing_index() -> ListingIndex:
+    with _derived_lock:
+        if _derived["version"] != store.version:
+            version = store.version  # Read first: a racing ingest then just forces another rebuild
+            _derived["listings_index"] = ListingIndex.from_store(store)
+            _derived["version"] = version
+        return _derived["listings_index"]
+
+def _build_cluster_tiers():
+    version = store.version
+    columns = store.columns()
+    return version, ClusterTiers.from_columns(
+        columns["id"], columns["latitude"], columns["longitude"], columns["price"]
+    )
+
+# Marker clusters are rebuilt in the background after each ingest, so
+# requests only look them up; their responses are cached by the version
+# of the tiers that served them, apart from the other GET responses
+cluster_tiers = ClusterTiersBuilder(_build_cluster_tiers)
+cluster_cache = ResponseCache()
+
+def _geo_add(listing: Dict):
+    if listing["latitude"] is not None and listing["longitude"] is not None:
+        geo_index.add(listing["id"], listing["latitude"], listing["longitude"])
+
+def _geo_remove(listing: Dict):
+    if listing["latitude"] is not None and listing["longitude"] is not None:
+        geo_index.remove(listing["id"], listing["latitude"], listing["longitude"])
+
+def _window_add(listing: Dict):
+    if listing["open_house_start"] and listing["open_house_end"]:
+        window_index.add(
+            listing["id"], to_seconds(listing["open_house_start"]), to_seconds(listing["open_house_end"]),
+            listing["latitude"], listing["longitude"],
+        )
+
+def _window_remove(listing: Dict):
+    if listing["open_house_start"] and listing["open_house_end"]:
+        window_index.remove(listing["id"], to_seconds(listing["open_house_start"]))
+
+def _search_text(listing: Dict) -> str:
+    return f"{listing['address']} {listing['description']}"
+
+_WINDOW_FIELDS = ("open_house_start", "open_house_end", "latitude", "longitude")
+
+def apply_changes(changes: ChangeSet):
+    """Update the incrementally maintained indexes for one ingest"""
+    for listing in changes.inserted:
+        _geo_add(listing)
+        _window_add(listing)
+        search_index.add(listing["id"], _search_text(listing))
+    for old, new in changes.updated:
+        if (old["latitude"], old["longitude"]) != (new["latitude"], new["longitude"]):
+            _geo_remove(old)
+            _geo_add(new)
+        if any(old[k] != new[k] for k in _WINDOW_FIELDS):
+            _window_remove(old)
+            _window_add(new)
+        if _search_text(old) != _search_text(new):
+            search_index.remove(old["id"], _search_text(old))
+            search_index.add(new["id"], _search_text(new))
+    for listing in changes.deleted:
+        _geo_remove(listing)
+        _window_remove(listing)
+        search_index.remove(listing["id"], _search_text(listing))
+    _indexed["version"] = store.version
+    if changes:
+        cluster_tiers.invalidate()
+
+def sync_shared_dataset():
+    """Switch to a generation another worker published, if there is one.
+
+    Never waits: while an ingest holds the lock, reads keep serving the
+    current generation (the ingest starts by syncing anyway).
+    """
+    if shared_dataset is None or not shared_dataset.changed():
+        return
+    if not _ingest_lock.acquire(blocking=False):
+        return
+    try:
+        apply_changes(shared_dataset.sync(store))
+    finally:
+        _ingest_lock.release()
+
+@contextmanager
+def ingesting():
+    """Hold the ingest lock around changes to the listings.
+
+    With a shared dataset this also holds its cross-process lock, starts
+    from the latest published generation and publishes the result.
+    """
+    with _ingest_lock:
+        if shared_dataset is None:
+            yield
+            return
+        with shared_dataset.lock():
+            apply_changes(shared_dataset.sync(store))
+            version = store.version
+            try:
+                yield
+            finally:
+                if store.version != version:
+                    shared_dataset.publish(store)
+
+def parse_bbox(bbox: str):
+    """Parse 'west,south,east,north' into (min_lat, min_lng, max_lat, max_lng)"""
+    try:
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be 'west,south,east,north'")
+    if south > north or west > east:
+        raise HTTPException(status_code=400, detail="bbox south/west must not exceed north/east")
+    return south, west, north, east
+
+def cached_response(request: Request, params: Dict, compute: Callable[[], Dict],
+                    cache: ResponseCache = response_cache,
+                    version: Callable[[], int] = lambda: _indexed["version"]) -> Response:
+    """Serve a GET from the response cache, computing it on a miss.
+
+    Responses carry a strong ETag; a matching If-None-Match gets an empty
+    304. The cache is keyed on the dataset version, so ingests and clears (which
+    bump it) invalidate every entry at once.
+    """
+    sync_shared_dataset()
+    key = cache_key(request.url.path, params)
+    etag, body = cache.get_or_compute(key, version, compute)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/")
 def root():
@@ -27,52 +198,350 @@ def health():
     return {"status": "healthy"}
 
 @app.get("/api/v1/open-houses")
-def get_open_houses():
-    """Return all listings"""
-    return {"open_houses": listings_storage}
+def get_open_houses(
+    request: Request,
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    beds: Optional[int] = Query(None, ge=0),
+    min_beds: Optional[int] = Query(None, ge=0),
+    min_baths: Optional[float] = Query(None, ge=0),
+    weekend: bool = False,
+    day: Optional[str] = Query(None, description="Day of week, e.g. 'sat'"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size; every match when unset"),
+    cursor: Optional[int] = Query(None, ge=0, description="next_cursor from the previous page"),
+):
+    """Return the filtered listings, in id order, optionally one page at a time.
 
-@app.post("/api/v1/listings/bulk")
-def bulk_upload_listings(data: Dict):
-    """Accept bulk listings from data ingestion"""
-    global listings_storage
-    
-    try:
-        new_listings = data.get("listings", [])
-        
-        # Clear old data and add new
-        listings_storage.clear()
-        
-        # Convert format to match frontend expectations
-        for listing in new_listings:
-            formatted_listing = {
-                "id": len(listings_storage) + 1,
-                "address": listing.get("address", ""),
-                "price": listing.get("price", 0) // 100,  # Convert cents to dollars
-                "beds": listing.get("beds", 0),
-                "baths": listing.get("baths", 0),
-                "latitude": listing.get("latitude", 37.7749),
-                "longitude": listing.get("longitude", -122.4194),
-                "open_house_time": listing.get("open_house_time", "TBD"),
-                "description": listing.get("description", "")
-            }
-            listings_storage.append(formatted_listing)
-        
+    next_cursor is the last id of the page. Ids are never reused, so paging
+    on it neither skips nor repeats listings when ingests land in between.
+    """
+    days = list(WEEKEND_DAYS) if weekend else []
+    if day:
+        code = DAY_CODES.get(day[:3].lower())
+        if code is None:
+            raise HTTPException(status_code=400, detail=f"Unknown day: {day}")
+        if weekend and code not in WEEKEND_DAYS:
+            return {"open_houses": [], "total": 0, "next_cursor": None}
+        days = [code]
+
+    filters = {
+        "min_price": min_price,
+        "max_price": max_price,
+        "beds": beds,
+        "min_beds": min_beds,
+        "min_baths": min_baths,
+        "days": days,
+    }
+
+    def compute():
+        ids, next_cursor, total = get_listing_index().query_ids(limit=limit, cursor=cursor, **filters)
+        fragments = Fragments(store.encoded(ids))
+        return {"open_houses": fragments, "total": total, "next_cursor": next_cursor}
+
+    return cached_response(request, {**filters, "limit": limit, "cursor": cursor}, compute)
+
+@app.get("/api/v1/open-houses/bbox")
+def get_open_houses_in_bbox(
+    request: Request,
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Return listings inside a map viewport"""
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="min_lat/min_lng must not exceed max_lat/max_lng")
+
+    def compute():
+        ids = geo_index.bbox(min_lat, min_lng, max_lat, max_lng, limit=limit)
+        return {"open_houses": Fragments(store.encoded(ids))}
+
+    params = {"min_lat": min_lat, "min_lng": min_lng, "max_lat": max_lat, "max_lng": max_lng, "limit": limit}
+    return cached_response(request, params, compute)
+
+@app.get("/api/v1/open-houses/near")
+def get_open_houses_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(2.0, gt=0, le=100),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Return listings within radius_km of a point, nearest first"""
+
+    def compute():
+        hits = geo_index.near(lat, lng, radius_km, limit=limit)
+        return {
+            "open_houses": Fragments(
+                with_fields(fragment, {"distance_km": round(distance, 3)})
+                for i, distance in hits if (fragment := store.fragment(i))
+            )
+        }
+
+    return cached_response(request, {"lat": lat, "lng": lng, "radius_km": radius_km, "limit": limit}, compute)
+
+@app.get("/api/v1/open-houses/window")
+def get_open_houses_in_window(
+    request: Request,
+    start: datetime = Query(..., description="Window start, local time, e.g. 2026-10-24T13:00"),
+    end: datetime = Query(..., description="Window end, local time"),
+    bbox: Optional[str] = Query(None, description="west,south,east,north"),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Return listings with an open house overlapping [start, end), earliest first"""
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    window = (to_seconds(start), to_seconds(end))
+    viewport = parse_bbox(bbox) if bbox else None
+
+    def compute():
+        ids = window_index.overlapping(*window, bbox=viewport, limit=limit)
+        return {"open_houses": Fragments(store.encoded(ids))}
+
+    return cached_response(request, {"window": window, "bbox": viewport, "limit": limit}, compute)
+
+@app.get("/api/v1/search")
+def search_open_houses(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in the address or description"),
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    beds: Optional[int] = Query(None, ge=0),
+    min_beds: Optional[int] = Query(None, ge=0),
+    min_baths: Optional[float] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Full-text search over addresses and descriptions, best BM25 match first.
+
+    Every word must match; the last one also matches as a prefix, so
+    "bay vi" finds "bay views".
+    """
+    filters = {
+        "min_price": min_price,
+        "max_price": max_price,
+        "beds": beds,
+        "min_beds": min_beds,
+        "min_baths": min_baths,
+    }
+
+    def compute():
+        allowed_ids = None
+        if any(value is not None for value in filters.values()):
+            allowed_ids = get_listing_index().matching_ids(**filters)
+        hits, total = search_index.search(q, limit=limit, allowed_ids=allowed_ids)
         return {
+            "open_houses": Fragments(
+                with_fields(fragment, {"score": round(score, 4)})
+                for i, score in hits if (fragment := store.fragment(i))
+            ),
+            "total": total,
+        }
+
+    return cached_response(request, {**filters, "q": q, "limit": limit}, compute)
+
+@app.get("/api/v1/open-houses/clusters")
+def get_open_house_clusters(
+    request: Request,
+    bbox: str = Query(..., description="west,south,east,north"),
+    zoom: int = Query(..., ge=0, le=22),
+):
+    """Return precomputed marker clusters for the viewport at a zoom level.
+
+    A bbox too wide for the zoom is served from a coarser tier; the response
+    carries the zoom actually used. Tiers are rebuilt in the background, so
+    for a moment after an ingest they may not include it yet.
+    """
+    viewport = parse_bbox(bbox)
+
+    def compute():
+        _, tiers = cluster_tiers.current
+        return {
+            "zoom": ClusterTiers.viewport_zoom(*viewport, zoom),
+            "clusters": tiers.query(*viewport, zoom),
+        }
+
+    return cached_response(request, {"bbox": viewport, "zoom": zoom}, compute,
+                           cache=cluster_cache, version=lambda: cluster_tiers.current[0])
+
+# Per-row errors included in an ingest response; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Responses of recent bulk uploads by Idempotency-Key, so retried chunks are not applied twice
+MAX_IDEMPOTENCY_KEYS = 4096
+_idempotent_responses = OrderedDict()
+
+@app.post("/api/v1/listings/bulk")
+def bulk_upload_listings(data: Dict, idempotency_key: Optional[str] = Header(None)):
+    """Accept bulk listings from data ingestion.
+
+    mode="sync" (default) treats the push as a full snapshot and deletes
+    listings that are missing from it; mode="upsert" only inserts/updates.
+    Rows that cannot be stored are reported and skipped, like bad stream
+    lines. A repeated Idempotency-Key replays the original response.
+    """
+    new_listings = data.get("listings", [])
+    mode = data.get("mode", "sync")
+    if mode not in ("sync", "upsert"):
+        raise HTTPException(status_code=400, detail=f"Unknown mode: {mode}")
+    if not isinstance(new_listings, list):
+        raise HTTPException(status_code=400, detail="listings must be a list")
+
+    # Looked up and stored under the ingest lock, so concurrent retries of one chunk apply it once
+    with ingesting():
+        replayed = _idempotent_responses.get(idempotency_key) if idempotency_key else None
+        if replayed is not None:
+            return {**replayed, "replayed": True}
+
+        changes = store.upsert(new_listings, delete_missing=(mode == "sync"))
+        apply_changes(changes)
+        response = {
             "status": "success",
-            "message": f"Added {len(new_listings)} listings",
-            "total_listings": len(listings_storage)
+            "message": f"Processed {len(new_listings)} listings",
+            **changes.counts(),
+            "error_count": len(changes.errors),
+            "errors": changes.errors[:MAX_REPORTED_ERRORS],
+            "total_listings": len(store)
         }
-        
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+        if idempotency_key:
+            _idempotent_responses[idempotency_key] = response
+            if len(_idempotent_responses) > MAX_IDEMPOTENCY_KEYS:
+                _idempotent_responses.popitem(last=False)
+    return response
+
+STREAM_BATCH_SIZE = 500
+
+@app.post("/api/v1/listings/stream")
+async def stream_upload_listings(request: Request, mode: str = "sync"):
+    """Accept listings as NDJSON (optionally gzip-encoded).
+
+    The body is spooled (in memory, then a temporary file past
+    SPOOL_MEMORY_BYTES) before the ingest lock is taken, so a slow client
+    never holds up other ingests; a corrupt gzip body or a dropped
+    connection applies nothing. The spooled lines are then applied in
+    batches as one ingest, and a shared dataset gets one new generation.
+    Bad or overlong lines are reported and skipped; mode="sync" deletes
+    listings missing from the stream once every line is applied.
+    """
+    if mode not in ("sync", "upsert"):
+        raise HTTPException(status_code=400, detail=f"Unknown mode: {mode}")
+
+    encoding = request.headers.get("content-encoding", "").lower()
+    lines = NdjsonLines(request.stream(), gzipped=(encoding == "gzip"))
+
+    seen = set() if mode == "sync" else None
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    errors = []
+    error_count = 0
+
+    def report(number, message):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": number, "error": message})
+
+    def flush(batch):
+        changes = ChangeSet()
+        for number, line in batch:
+            try:
+                listing = json.loads(line)
+                if not isinstance(listing, dict):
+                    raise ValueError("line is not a JSON object")
+                store.apply(listing, changes, seen)
+            except Exception as e:
+                report(number, str(e))
+        store.commit(changes)
+        apply_changes(changes)
+        for name, count in changes.counts().items():
+            totals[name] += count
+        batch.clear()
+
+    def apply(spool):
+        with ingesting():
+            batch = []
+            for entry in spool:
+                batch.append(entry)
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    flush(batch)
+            flush(batch)
+
+            if seen is not None:
+                changes = ChangeSet()
+                store.delete_unseen(seen, changes)
+                store.commit(changes)
+                apply_changes(changes)
+                totals["deleted"] += len(changes.deleted)
+            return len(store)
+
+    with LineSpool() as spool:
+        try:
+            async for number, line in lines:
+                if line is None:
+                    report(number, f"line is longer than {MAX_LINE_BYTES} bytes")
+                else:
+                    spool.write(number, line)
+        except zlib.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+        except ClientDisconnect:
+            raise HTTPException(status_code=400, detail="Client disconnected before the body was complete")
+        total_listings = await run_in_threadpool(apply, spool)
+
+    return {
+        "status": "success",
+        "message": f"Processed {lines.count} lines",
+        **totals,
+        "error_count": error_count,
+        "errors": sorted(errors, key=lambda error: error["line"]),  # Overlong lines are found while spooling
+        "total_listings": total_listings
+    }
+
+@app.post("/api/v1/listings/snapshot")
+def save_snapshot():
+    """Write the current listings to SNAPSHOT_PATH for the next cold start to load"""
+    path = snapshot_path()
+    if not path:
+        raise HTTPException(status_code=400, detail="SNAPSHOT_PATH is not configured")
+    with ingesting():
+        count = write_snapshot(store, path)
+    return {"message": f"Saved {count} listings", "path": path}
 
 @app.delete("/api/v1/listings/clear")
 def clear_listings():
     """Clear all listings"""
-    global listings_storage
-    count = len(listings_storage)
-    listings_storage.clear()
+    with ingesting():
+        count = store.clear()
+        geo_index.clear()
+        window_index.clear()
+        search_index.clear()
+        _indexed["version"] = store.version
+        response_cache.clear()
+        cluster_cache.clear()
+        if count:
+            cluster_tiers.invalidate()
     return {"message": f"Cleared {count} listings"}
 
+def load_startup_snapshot():
+    """Fill the store and indexes from SNAPSHOT_PATH, if one has been built"""
+    path = snapshot_path()
+    if path and os.path.exists(path):
+        with _ingest_lock:
+            apply_changes(load_snapshot(store, path))
+
+def load_shared_dataset():
+    """Map the latest published generation of the shared dataset.
+
+    If none has been published yet, whatever the startup snapshot loaded
+    becomes the first one.
+    """
+    if shared_dataset is None:
+        return
+    with ingesting():
+        if not shared_dataset.exists() and len(store):
+            shared_dataset.publish(store)
+
+# At import rather than on a startup event: serverless runtimes may skip lifespan events
+load_startup_snapshot()
+load_shared_dataset()
+
 # Export for Vercel
 app_handler = app
@@ -0,0 +1,31 @@
+"""
+Benchmark: /open-houses/clusters payload size and latency by zoom
+Shows that the number of clusters is bounded by the viewport, not the dataset
+"""
+import time
+
+from common import latency_ms, make_listings
+
+from app.services.clusters import ClusterTiers
+
+# ~1200x800px viewport centred on San Francisco at each zoom
+def viewport(zoom):
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    return 37.7749 - 400 * deg_per_px, -122.4194 - 600 * deg_per_px, 37.7749 + 400 * deg_per_px, -122.4194 + 600 * deg_per_px
+
+
+def main():
+    for n in (10_000, 1_000_000):
+        listings = make_listings(n)
+        start = time.perf_counter()
+        tiers = ClusterTiers(listings)
+        print(f"\n{n} listings, precompute {time.perf_counter() - start:.2f}s")
+        for zoom in (8, 11, 13, 15):
+            box = viewport(zoom)
+            clusters = tiers.query(*box, zoom)
+            stats = latency_ms(lambda: tiers.query(*box, zoom), runs=100)
+            print(f"  zoom {zoom:>2}: {len(clusters):>4} clusters, p50 {stats['p50']:.3f}ms p99 {stats['p99']:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
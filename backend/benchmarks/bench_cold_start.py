@@ -0,0 +1,106 @@
+"""
+Benchmark: cold start of the API entry points, with a budget
+Measures `python -X importtime` for app.main (the Vercel entry point) and
+app.simple_main, checks that neither pulls in ingestion-only or heavy
+packages, and times a fresh process loading a prebuilt snapshot.
+
+Exits non-zero when an import budget is exceeded or a forbidden package is
+imported, so it can run as a CI check:
+    python benchmarks/bench_cold_start.py --budget-main-ms 600 --budget-simple-ms 900
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from common import make_raw_listings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from app.services.listing_store import ListingStore  # noqa: E402
+from app.services.snapshot import write_snapshot  # noqa: E402
+
+# Packages that must never load on the serving path
+INGESTION_ONLY = {"requests", "bs4", "fake_useragent", "lxml", "selectolax", "aiohttp", "rapidfuzz", "pandas"}
+FORBIDDEN = {
+    "app.main": INGESTION_ONLY | {"numpy", "sqlalchemy"},
+    "app.simple_main": INGESTION_ONLY | {"sqlalchemy"},
+}
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(module, env=None):
+    """(cumulative microseconds for module, set of top-level packages imported, slowest imports)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    total, packages, direct = 0, set(), []
+    for match in _IMPORTTIME_RE.finditer(result.stderr):
+        _, cumulative, indent, name = match.groups()
+        packages.add(name.split(".")[0])
+        if name == module:
+            total = int(cumulative)
+        elif len(indent) == 3:  # Direct imports of a top-level module
+            direct.append((int(cumulative), name))
+    return total, packages, sorted(direct, reverse=True)[:5]
+
+
+def snapshot_start_ms(path):
+    """Wall time for a fresh process to import app.simple_main and load the snapshot"""
+    code = (
+        "import time; start = time.perf_counter(); import app.simple_main as m; "
+        "print((time.perf_counter() - start) * 1000, len(m.store))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env={**os.environ, "SNAPSHOT_PATH": path},
+        capture_output=True, text=True, check=True,
+    )
+    elapsed, rows = result.stdout.split()
+    return float(elapsed), int(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-main-ms", type=float, default=600)
+    parser.add_argument("--budget-simple-ms", type=float, default=900)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--snapshot-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    env = {key: value for key, value in os.environ.items() if key != "SNAPSHOT_PATH"}
+    failures = []
+    for module, budget in (("app.main", args.budget_main_ms), ("app.simple_main", args.budget_simple_ms)):
+        runs = [import_profile(module, env) for _ in range(args.runs)]
+        best = min(run[0] for run in runs) / 1000
+        packages = set.union(*(run[1] for run in runs))
+        status = "ok" if best <= budget else "OVER BUDGET"
+        print(f"{module:<16} import {best:7.1f}ms (budget {budget:.0f}ms) {status}")
+        for cumulative, name in runs[0][2]:
+            print(f"    {cumulative / 1000:7.1f}ms  {name}")
+        if best > budget:
+            failures.append(f"{module} import took {best:.1f}ms (budget {budget:.0f}ms)")
+        leaked = sorted(packages & FORBIDDEN[module])
+        if leaked:
+            failures.append(f"{module} imports {', '.join(leaked)}")
+
+    store = ListingStore()
+    store.upsert(make_raw_listings(args.snapshot_rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "listings.snapshot")
+        write_snapshot(store, path)
+        size_mb = os.path.getsize(path) / 1e6
+        elapsed, rows = min(snapshot_start_ms(path) for _ in range(args.runs))
+    print(f"app.simple_main + snapshot of {rows:,} rows ({size_mb:.1f}MB): {elapsed:.1f}ms to ready")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark: bbox and radius queries over 1M random points
+Compares a full scan with the GridIndex used by /open-houses/bbox and /near
+"""
+import random
+
+from common import latency_ms
+
+from app.services.geo_index import GridIndex, haversine_km
+
+N = 1_000_000
+
+
+def main():
+    rng = random.Random(7)
+    points = [(i, 37.0 + rng.random() * 2, -123.0 + rng.random() * 2) for i in range(N)]
+
+    index = GridIndex()
+    for listing_id, lat, lng in points:
+        index.add(listing_id, lat, lng)
+
+    # Roughly a city-block viewport and a 1km radius
+    bbox = (37.77, -122.43, 37.79, -122.40)
+    center = (37.7749, -122.4194, 1.0)
+
+    def scan_bbox():
+        return [i for i, lat, lng in points if bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3]]
+
+    def scan_near():
+        return [i for i, lat, lng in points if haversine_km(center[0], center[1], lat, lng) <= center[2]]
+
+    print(f"{N} points, bbox hits={len(scan_bbox())}, near hits={len(scan_near())}")
+    for name, fn, runs in (
+        ("scan bbox", scan_bbox, 5),
+        ("grid bbox", lambda: index.bbox(*bbox), 200),
+        ("scan near", scan_near, 3),
+        ("grid near", lambda: index.near(*center), 200),
+    ):
+        stats = latency_ms(fn, runs=runs)
+        print(f"{name:>10}: p50 {stats['p50']:8.3f}ms  p99 {stats['p99']:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Benchmark: filtered /api/v1/open-houses queries
+Compares a full Python scan over the list of dicts with the columnar ListingIndex
+"""
+from common import latency_ms, make_listings
+
+from app.services.listing_index import WEEKEND_DAYS, ListingIndex, day_mask, parse_days
+
+FILTERS = {"min_price": 800_000, "max_price": 1_200_000, "min_beds": 2, "days": list(WEEKEND_DAYS)}
+
+
+def naive_query(listings, limit=500):
+    matches = [
+        l for l in listings
+        if FILTERS["min_price"] <= l["price"] <= FILTERS["max_price"]
+        and l["beds"] >= FILTERS["min_beds"]
+        and parse_days(l["open_house_time"]) & day_mask(FILTERS["days"])
+    ]
+    return matches[:limit], len(matches)
+
+
+def main():
+    print(f"{'rows':>10} {'naive p50':>10} {'naive p99':>10} {'index p50':>10} {'index p99':>10}")
+    for n in (1_000, 100_000, 1_000_000):
+        listings = make_listings(n)
+        index = ListingIndex(listings)
+        runs = 20 if n >= 1_000_000 else 50
+
+        naive = latency_ms(lambda: naive_query(listings), runs=runs)
+        indexed = latency_ms(lambda: index.query(limit=500, **FILTERS), runs=runs)
+        print(f"{n:>10} {naive['p50']:>9.2f}ms {naive['p99']:>9.2f}ms {indexed['p50']:>9.2f}ms {indexed['p99']:>9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
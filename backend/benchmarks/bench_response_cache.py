@@ -0,0 +1,58 @@
+"""
+Benchmark: repeated GET requests with and without the response cache
+Replays a mix of map pans and filter toggles (many repeats) against the app,
+comparing a cold cache on every request with the version-keyed ResponseCache
+"""
+import random
+
+from fastapi.testclient import TestClient
+
+from common import latency_ms, make_raw_listings
+
+from app import simple_main
+
+REQUESTS = [
+    "/api/v1/open-houses?min_price=800000&max_price=1200000&min_beds=2&weekend=true",
+    "/api/v1/open-houses?min_beds=3",
+    "/api/v1/open-houses?day=sun&limit=100",
+    "/api/v1/open-houses/bbox?min_lat=37.70&min_lng=-122.50&max_lat=37.80&max_lng=-122.40",
+    "/api/v1/open-houses/bbox?min_lat=37.75&min_lng=-122.45&max_lat=37.85&max_lng=-122.35",
+    "/api/v1/open-houses/clusters?bbox=-122.9,37.3,-121.9,38.3&zoom=11",
+]
+
+
+def main():
+    client = TestClient(simple_main.app)
+    client.post("/api/v1/listings/stream?mode=sync", content="\n".join(
+        simple_main.json.dumps(listing) for listing in make_raw_listings(200_000)
+    ))
+    rng = random.Random(1)
+    urls = [rng.choice(REQUESTS) for _ in range(200)]
+    cycle = iter(urls * 1000)
+
+    def uncached():
+        simple_main.response_cache.clear()
+        client.get(next(cycle))
+
+    def cached():
+        client.get(next(cycle))
+
+    def revalidated():
+        url = next(cycle)
+        client.get(url, headers={"If-None-Match": etags[url]})
+
+    client.get(REQUESTS[0])  # Build the derived indexes outside the timings
+    cold = latency_ms(uncached, runs=200)
+    warm = latency_ms(cached, runs=200)
+    etags = {url: client.get(url).headers["etag"] for url in REQUESTS}
+    not_modified = latency_ms(revalidated, runs=200)
+    cache = simple_main.response_cache
+    print(f"200,000 listings, {len(REQUESTS)} distinct requests")
+    print(f"  uncached:          p50 {cold['p50']:>7.2f}ms  p99 {cold['p99']:>7.2f}ms")
+    print(f"  cached:            p50 {warm['p50']:>7.2f}ms  p99 {warm['p99']:>7.2f}ms")
+    print(f"  If-None-Match 304: p50 {not_modified['p50']:>7.2f}ms  p99 {not_modified['p99']:>7.2f}ms")
+    print(f"  cache: {len(cache)} entries, {cache.size_bytes / 1e6:.1f}MB, {cache.hits} hits / {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: /api/v1/search full-text queries
+Compares a substring scan over every address and description (unranked) with
+the BM25-ranked inverted SearchIndex, alone and combined with price/beds filters
+"""
+import random
+import time
+
+from common import STREETS, latency_ms
+
+from app.services.listing_index import ListingIndex
+from app.services.search_index import SearchIndex
+
+PHRASES = [
+    "stunning modern condo", "charming Victorian home", "original details", "city views",
+    "panoramic bay views", "updated kitchen", "private yard", "attached garage",
+    "hardwood floors", "in-unit laundry", "quiet residential street", "walk to shops and transit",
+    "sunny south-facing garden", "luxury penthouse", "historic building", "converted loft",
+    "two-car garage", "chef's kitchen", "close to parks", "Edwardian flat", "fireplace",
+]
+QUERIES = ["garage", "bay views", "victorian garage", "vic", "hardwood floors fireplace"]
+FILTERS = {"min_price": 800_000, "max_price": 1_200_000, "min_beds": 2}
+
+
+def make_documents(n, seed=42):
+    rng = random.Random(seed)
+    listings = []
+    for i in range(n):
+        words = rng.sample(PHRASES, rng.randint(2, 5))
+        listings.append({
+            "id": i + 1,
+            "address": f"{i + 1} {rng.choice(STREETS)}, San Francisco, CA",
+            "price": rng.randint(300_000, 5_000_000),
+            "beds": rng.randint(0, 6),
+            "baths": rng.choice([1, 1.5, 2, 2.5, 3, 4]),
+            "open_house_time": "Sat 1-4pm",
+            "description": ", ".join(words).capitalize(),
+        })
+    return listings
+
+
+def naive_search(listings, query, filters=None, limit=50):
+    words = query.lower().split()
+    hits = []
+    for listing in listings:
+        if filters and not (
+            filters["min_price"] <= listing["price"] <= filters["max_price"] and listing["beds"] >= filters["min_beds"]
+        ):
+            continue
+        text = f"{listing['address']} {listing['description']}".lower()
+        if all(word in text for word in words):
+            hits.append(listing["id"])
+    return hits[:limit], len(hits)
+
+
+def main():
+    for n in (100_000, 1_000_000):
+        listings = make_documents(n)
+        index = SearchIndex()
+        started = time.perf_counter()
+        for listing in listings:
+            index.add(listing["id"], f"{listing['address']} {listing['description']}")
+        build = time.perf_counter() - started
+        allowed = ListingIndex(listings).matching_ids(**FILTERS)
+        print(f"{n:,} listings: incremental build {build:.1f}s ({n / build:,.0f} docs/sec), "
+              f"{len(index.postings):,} terms")
+        print(f"  {'query':<28} {'naive p50':>10} {'index p50':>10} {'index p99':>10} {'matches':>9}")
+        for query in QUERIES:
+            for filters in (None, FILTERS):
+                index.search(query, limit=50, allowed_ids=allowed if filters else None)  # Warm term arrays
+                naive = latency_ms(lambda: naive_search(listings, query, filters), runs=3 if n >= 1_000_000 else 10)
+                indexed = latency_ms(
+                    lambda: index.search(query, limit=50, allowed_ids=allowed if filters else None), runs=30
+                )
+                total = index.search(query, limit=50, allowed_ids=allowed if filters else None)[1]
+                label = query + (" +filters" if filters else "")
+                print(f"  {label:<28} {naive['p50']:>9.1f}ms {indexed['p50']:>9.2f}ms {indexed['p99']:>9.2f}ms {total:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: serializing a 10k-listing /api/v1/open-houses response
+Compares FastAPI's default path (jsonable_encoder + stdlib json), plain stdlib
+json, orjson over the dicts, and splicing the fragments ListingStore encodes at ingest
+"""
+import json
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+
+from common import make_raw_listings
+
+from app.services.encoding import Fragments, render
+from app.services.listing_store import ListingStore
+
+import orjson
+
+N = 10_000
+
+
+def default_response(rows):
+    # What JSONResponse does with a returned dict
+    return json.dumps(jsonable_encoder({"open_houses": rows, "total": len(rows)}), ensure_ascii=False,
+                      allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def measure(fn, runs=20):
+    fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    samples.sort()
+    return samples[len(samples) // 2], peak / 1e6
+
+
+def main():
+    store = ListingStore()
+    store.upsert(make_raw_listings(N))
+    ids = store.live_ids().tolist()
+    rows = [dict(store.get(i)) for i in ids]
+
+    cases = [
+        ("jsonable_encoder + json", lambda: default_response(rows)),
+        ("json.dumps", lambda: json.dumps({"open_houses": rows, "total": len(rows)}).encode()),
+        ("orjson.dumps", lambda: orjson.dumps({"open_houses": rows, "total": len(rows)})),
+        ("pre-encoded fragments", lambda: render({"open_houses": Fragments(store.encoded(ids)), "total": len(ids)})),
+    ]
+    assert json.loads(cases[0][1]()) == json.loads(cases[-1][1]())
+    print(f"{N:,} listings per response")
+    print(f"  {'method':<26} {'p50':>9} {'peak alloc':>11}")
+    for name, fn in cases:
+        p50, peak = measure(fn)
+        print(f"  {name:<26} {p50:>7.2f}ms {peak:>9.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: one memory-mapped dataset file shared by several API workers
+Reports the cost of publishing a generation, of mapping it into a fresh
+worker (a cold start), of picking up a small ingest published by another
+worker, and what each mapped worker's store costs: its own heap (key
+lookups, traced with tracemalloc) and the mapped file pages, which are
+shared. PSS divides shared pages between the processes mapping them.
+Usage: python benchmarks/bench_shared_dataset.py [--n 1000000] [--workers 3] [--path /tmp/x]
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+
+from common import make_raw_listings
+
+from app.services.listing_store import ListingStore
+from app.services.shared_dataset import SharedDataset
+
+CHUNK = 10_000
+CHANGED = 1_000
+
+
+def populate(store, n):
+    for start in range(0, n, CHUNK):
+        raw = make_raw_listings(min(CHUNK, n - start), seed=start)
+        for listing in raw:
+            listing["address"] = f"{start}-{listing['address']}"
+        store.upsert(raw)
+
+
+def mapping_kb(path):
+    """(rss, pss, shared) in kB of this process's mappings of path, from /proc/self/smaps"""
+    totals = {"Rss": 0, "Pss": 0, "Shared_Clean": 0, "Shared_Dirty": 0}
+    in_path = False
+    with open("/proc/self/smaps") as f:
+        for line in f:
+            parts = line.split()
+            if "-" in parts[0] and not parts[0].endswith(":"):
+                in_path = parts[-1] == path
+            elif in_path and parts[0].rstrip(":") in totals:
+                totals[parts[0].rstrip(":")] += int(parts[1])
+    return totals["Rss"], totals["Pss"], totals["Shared_Clean"] + totals["Shared_Dirty"]
+
+
+def decode_all(changes):
+    """Read every changed row once, like apply_changes does"""
+    return sum(1 for _ in changes.inserted) + len(changes.updated) + sum(1 for _ in changes.deleted)
+
+
+def worker(path, one_at_a_time, all_mapped, results):
+    with one_at_a_time:  # Keep the workers' decode peaks apart
+        tracemalloc.start()
+        store = ListingStore()
+        decode_all(SharedDataset(path).sync(store))
+        gc.collect()
+        heap, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    all_mapped.wait()
+    results.put((len(store), heap) + mapping_kb(path))
+    all_mapped.wait()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "bench-dataset.bin"))
+    args = parser.parse_args()
+    n, path = args.n, args.path
+
+    writer, writer_shared = ListingStore(), SharedDataset(path)
+    populate(writer, n)
+    with writer_shared.lock():
+        _, publish = timed(lambda: writer_shared.publish(writer))
+    size = os.path.getsize(path)
+
+    reader, reader_shared = ListingStore(), SharedDataset(path)
+    decoded, cold = timed(lambda: decode_all(reader_shared.sync(reader)))
+    assert decoded == n
+
+    raw = make_raw_listings(CHANGED, seed=0)
+    for listing in raw:
+        listing["address"] = f"0-{listing['address']}"
+        listing["price"] += 100_000
+    with writer_shared.lock():
+        writer_shared.sync(writer)
+        _, small_ingest = timed(lambda: writer.upsert(raw))
+        _, small_publish = timed(lambda: writer_shared.publish(writer))
+    decoded, small_sync = timed(lambda: decode_all(reader_shared.sync(reader)))
+    assert decoded == CHANGED
+    del writer, reader
+    gc.collect()
+
+    print(f"{n:,} listings, dataset file {size / 1e6:.0f}MB ({size / n:.0f} B/listing)")
+    print(f"  publish a generation         {publish * 1000:>8.0f}ms")
+    print(f"  cold start: map + install    {cold * 1000:>8.0f}ms  (decodes every row for the indexes)")
+    print(f"  ingest {CHANGED:,} changed rows     {small_ingest * 1000:>8.0f}ms")
+    print(f"  publish that generation      {small_publish * 1000:>8.0f}ms")
+    print(f"  other worker picks it up     {small_sync * 1000:>8.0f}ms  (stat, map, diff by hash)")
+
+    context = multiprocessing.get_context("spawn")
+    one_at_a_time, all_mapped, results = context.Lock(), context.Barrier(args.workers + 1), context.Queue()
+    workers = [
+        context.Process(target=worker, args=(path, one_at_a_time, all_mapped, results))
+        for _ in range(args.workers)
+    ]
+    for process in workers:
+        process.start()
+    all_mapped.wait()
+    measured = [results.get() for _ in workers]
+    all_mapped.wait()
+    for process in workers:
+        process.join()
+
+    print(f"  {args.workers} mapped workers, store memory each:")
+    for count, heap, rss, pss, shared in measured:
+        print(f"    heap {heap / 1e6:>5.0f}MB ({heap / count:.0f} B/listing); mapped file RSS "
+              f"{rss / 1024:.0f}MB, {shared / 1024:.0f}MB of it shared, PSS {pss / 1024:.0f}MB")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
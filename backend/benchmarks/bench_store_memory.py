@@ -0,0 +1,135 @@
+"""
+Benchmark: memory per listing and full-scan throughput of the listing store
+Compares the compact ListingStore (packed JSON blob + typed row array) with
+the previous layout of one formatted dict and one encoded bytes object per row.
+The old layout needs ~5KB per listing (1M of them don't fit in 6GB), so it is
+measured at --baseline-n and reported per listing.
+Usage: python benchmarks/bench_store_memory.py [--n 1000000] [--baseline-n 200000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import make_raw_listings
+
+from app.services.encoding import dumps
+from app.services.listing_index import ListingIndex
+from app.services.listing_store import ListingStore, content_hash, format_listing, listing_key
+
+CHUNK = 10_000
+
+# The scan: price <= $1.5M, 3+ beds, 2+ baths
+MAX_PRICE, MIN_BEDS, MIN_BATHS = 1_500_000, 3, 2
+
+
+def chunks(n):
+    for start in range(0, n, CHUNK):
+        raw = make_raw_listings(min(CHUNK, n - start), seed=start)
+        for listing in raw:
+            listing["address"] = f"{start}-{listing['address']}"
+        yield raw
+
+
+class DictRows:
+    """The previous ListingStore layout, kept here for comparison"""
+
+    def __init__(self):
+        self.rows, self.ids_by_key, self.keys_by_id, self.hashes, self.fragments = {}, {}, {}, {}, {}
+
+    def add(self, listing):
+        listing_id = len(self.rows) + 1
+        key = listing_key(listing)
+        formatted = format_listing(listing, listing_id)
+        self.rows[listing_id] = formatted
+        self.ids_by_key[key] = listing_id
+        self.keys_by_id[listing_id] = key
+        self.fragments[listing_id] = dumps(formatted)
+        self.hashes[listing_id] = content_hash(self.fragments[listing_id])
+
+
+def measure_build(n, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / n, elapsed
+
+
+def build_dict_rows(n):
+    store = DictRows()
+    for raw in chunks(n):
+        for listing in raw:
+            store.add(listing)
+    return store
+
+
+def build_compact(n):
+    store = ListingStore()
+    for raw in chunks(n):
+        store.upsert(raw)
+    return store
+
+
+def best_of(fn, runs=3):
+    result, best = None, float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def scan_dicts(rows):
+    return sum(
+        1 for row in rows
+        if (row["price"] or 0) <= MAX_PRICE and (row["beds"] or 0) >= MIN_BEDS and (row["baths"] or 0) >= MIN_BATHS
+    )
+
+
+def scan_columns(columns):
+    mask = (columns["price"] <= MAX_PRICE) & (columns["beds"] >= MIN_BEDS) & (columns["baths"] >= MIN_BATHS)
+    return int(np.count_nonzero(mask))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--baseline-n", type=int, default=200_000)
+    args = parser.parse_args()
+    n, old_n = args.n, min(args.n, args.baseline_n)
+
+    old, old_bytes, old_build = measure_build(old_n, build_dict_rows)
+    rows = list(old.rows.values())
+    old_count, old_scan = best_of(lambda: scan_dicts(rows))
+    _, old_index = best_of(lambda: ListingIndex(rows), runs=1)
+    del old, rows
+    gc.collect()
+
+    store, new_bytes, new_build = measure_build(n, build_compact)
+    columns, extract = best_of(store.columns)
+    new_count, new_scan = best_of(lambda: scan_columns(columns))
+    _, new_index = best_of(lambda: ListingIndex.from_store(store), runs=1)
+    if old_n == n:
+        assert old_count == new_count
+
+    print(f"  {'layout':<24} {'listings':>10} {'bytes/listing':>14} {'build/1k':>9} {'scan':>10} "
+          f"{'rows/s':>14} {'index build':>12}")
+    for name, size, per_row, build, scan, index in (
+        ("dict rows + fragments", old_n, old_bytes, old_build, old_scan, old_index),
+        ("compact ListingStore", n, new_bytes, new_build, new_scan, new_index),
+    ):
+        print(f"  {name:<24} {size:>10,} {per_row:>12.0f} B {build / size * 1e6:>7.1f}ms {scan * 1000:>8.1f}ms "
+              f"{size / scan:>14,.0f} {index * 1000:>10.0f}ms")
+    print(f"  {new_count:,} listings matched; store.columns() copy {extract * 1000:.1f}ms; "
+          f"blob + row array {store.nbytes / n:.0f} B/listing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: transient memory of /listings/bulk vs. /listings/stream
+Reports peak allocation above the final store size, i.e. the parsing overhead.
+Request bodies are fed straight into the ASGI receive channel chunk by chunk,
+so no HTTP client buffering is included.
+"""
+import asyncio
+import json
+import os
+import sys
+import tracemalloc
+
+from common import make_raw_listings
+
+from starlette.requests import Request
+
+from app import simple_main
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data-ingestion"))
+from utils.backend_integration import BackendIntegrator  # noqa: E402
+
+
+def streaming_request(chunks, headers):
+    chunks = iter(chunks)
+
+    async def receive():
+        chunk = next(chunks, None)
+        return {"type": "http.request", "body": chunk or b"", "more_body": chunk is not None}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/listings/stream",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope, receive)
+
+
+def measure(fn):
+    simple_main.store.clear()
+    simple_main.geo_index.clear()
+    tracemalloc.start()
+    fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (peak - current) / 1e6
+
+
+def main():
+    for n in (10_000, 50_000, 100_000):
+        listings = make_raw_listings(n)
+
+        # The bulk handler receives the fully parsed document
+        bulk = measure(lambda: simple_main.bulk_upload_listings(
+            json.loads(json.dumps({"listings": listings})), idempotency_key=None
+        ))
+        stream = measure(lambda: asyncio.run(simple_main.stream_upload_listings(
+            streaming_request(
+                BackendIntegrator._ndjson_chunks(iter(listings), True, 64 * 1024),
+                {"Content-Encoding": "gzip"},
+            ),
+            mode="upsert",
+        )))
+        print(f"{n:>7} rows: bulk overhead {bulk:7.1f}MB, stream overhead {stream:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
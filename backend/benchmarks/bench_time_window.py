@@ -0,0 +1,62 @@
+"""
+Benchmark: /api/v1/open-houses/window overlap queries
+Compares a full scan over 1M open house events with the bucketed IntervalIndex,
+for a time window alone and combined with a map viewport
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import latency_ms
+
+from app.services.interval_index import IntervalIndex, to_seconds
+
+FIRST_DAY = datetime(2026, 10, 17)
+WINDOW = (to_seconds(FIRST_DAY + timedelta(days=7, hours=13)), to_seconds(FIRST_DAY + timedelta(days=7, hours=15)))
+BBOX = (37.75, -122.45, 37.80, -122.40)  # min_lat, min_lng, max_lat, max_lng
+
+
+def make_events(n, seed=42):
+    """n open houses over four weeks: starts 10am-5pm on the half hour, 1-4 hours long"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        start = to_seconds(FIRST_DAY + timedelta(days=rng.randrange(28), minutes=600 + 30 * rng.randrange(15)))
+        events.append((
+            i + 1, start, start + 3600 * rng.randint(1, 4),
+            round(37.7749 + rng.uniform(-0.5, 0.5), 6), round(-122.4194 + rng.uniform(-0.5, 0.5), 6),
+        ))
+    return events
+
+
+def naive_query(events, start, end, bbox=None, limit=500):
+    hits = []
+    for event_id, s, e, lat, lng in events:
+        if s < end and e > start and (
+            bbox is None or (bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3])
+        ):
+            hits.append((s, event_id))
+    hits.sort()
+    return [event_id for _, event_id in hits[:limit]]
+
+
+def main():
+    print(f"{'events':>10} {'query':>8} {'naive p50':>10} {'index p50':>10} {'index p99':>10}")
+    for n in (10_000, 100_000, 1_000_000):
+        events = make_events(n)
+        index = IntervalIndex()
+        started = time.perf_counter()
+        for event in events:
+            index.add(*event)
+        build = time.perf_counter() - started
+
+        for name, bbox in (("window", None), ("+bbox", BBOX)):
+            assert index.overlapping(*WINDOW, bbox=bbox, limit=500) == naive_query(events, *WINDOW, bbox=bbox)
+            naive = latency_ms(lambda: naive_query(events, *WINDOW, bbox=bbox), runs=5 if n >= 1_000_000 else 20)
+            indexed = latency_ms(lambda: index.overlapping(*WINDOW, bbox=bbox, limit=500), runs=50)
+            print(f"{n:>10} {name:>8} {naive['p50']:>9.2f}ms {indexed['p50']:>9.2f}ms {indexed['p99']:>9.2f}ms")
+        print(f"{'':>10} incremental build: {build:.2f}s ({n / build:,.0f} adds/sec)")
+
+
+if __name__ == "__main__":
+    main()
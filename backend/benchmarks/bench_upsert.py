@@ -0,0 +1,49 @@
+"""
+Benchmark: re-ingest cost of bulk_upload_listings vs. number of changed rows
+Pushes the same 100k listings again with 0%, 1%, 10% and 100% of rows modified
+"""
+import time
+
+from common import make_raw_listings
+
+from app.services.geo_index import GridIndex
+from app.services.listing_store import ListingStore
+
+N = 100_000
+
+
+def clear_and_replace(store, geo, listings):
+    """The previous behaviour: drop everything and rebuild"""
+    store.clear()
+    geo.clear()
+    changes = store.upsert(listings)
+    for row in changes.inserted:
+        geo.add(row["id"], row["latitude"], row["longitude"])
+
+
+def main():
+    base = make_raw_listings(N)
+    store, geo = ListingStore(), GridIndex()
+    clear_and_replace(store, geo, base)
+
+    start = time.perf_counter()
+    clear_and_replace(store, geo, base)
+    print(f"clear-and-replace {N} rows: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    for fraction in (0.0, 0.01, 0.1, 1.0):
+        pushed = [dict(l) for l in base]
+        for listing in pushed[: int(N * fraction)]:
+            listing["price"] += 100_00
+        start = time.perf_counter()
+        changes = store.upsert(pushed, delete_missing=True)
+        for old, new in changes.updated:
+            if (old["latitude"], old["longitude"]) != (new["latitude"], new["longitude"]):
+                geo.remove(old["id"], old["latitude"], old["longitude"])
+                geo.add(new["id"], new["latitude"], new["longitude"])
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"upsert, {fraction:>5.0%} changed: {elapsed:6.0f}ms  {changes.counts()}")
+        store.upsert(base, delete_missing=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Shared helpers for the backend benchmark scripts
+Run benchmarks from the backend/ directory, e.g. `python benchmarks/bench_open_houses.py`
+"""
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Make the `app` package importable when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STREETS = ["Market St", "Mission St", "Hayes St", "Irving St", "Lombard St", "Geary St", "Folsom St", "Bush St"]
+TIMES = ["Sat 1-4pm", "Sun 2-5pm", "Sat 12-3pm", "Sun 1-4pm", "Sat 11am-2pm", "Sun 3-6pm", "Fri 4-6pm", "TBD"]
+DESCRIPTIONS = [
+    "Stunning modern condo with city views and updated kitchen",
+    "Charming Victorian home with original details and garden",
+    "Spacious family home with garage and private yard",
+    "Luxury penthouse with panoramic bay views",
+]
+
+
+def make_listings(n: int, seed: int = 42) -> List[Dict]:
+    """Generate n listings in the shape stored by simple_main (prices in dollars)"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i + 1,
+            "address": f"{i + 1} {rng.choice(STREETS)}, San Francisco, CA",
+            "price": rng.randint(300_000, 5_000_000),
+            "beds": rng.randint(0, 6),
+            "baths": rng.choice([1, 1.5, 2, 2.5, 3, 4]),
+            "latitude": round(37.7749 + rng.uniform(-0.5, 0.5), 6),
+            "longitude": round(-122.4194 + rng.uniform(-0.5, 0.5), 6),
+            "open_house_time": rng.choice(TIMES),
+            "description": rng.choice(DESCRIPTIONS),
+        }
+        for i in range(n)
+    ]
+
+
+def make_raw_listings(n: int, seed: int = 42) -> List[Dict]:
+    """Generate n listings in the ingestion format (prices in cents)"""
+    listings = make_listings(n, seed)
+    for listing in listings:
+        del listing["id"]
+        listing["price"] *= 100
+        listing["source"] = "mock"
+    return listings
+
+
+def latency_ms(fn: Callable[[], object], runs: int = 50) -> Dict[str, float]:
+    """Call fn repeatedly and return p50/p99 latency in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
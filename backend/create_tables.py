@@ -1,15 +1,20 @@
 """
 Script to create all database tables in Supabase
-Run this once to set up your database schema
+Run this once to set up your database schema, and again after model
+changes to upgrade an existing one
 """
 from app.core.database import engine
 from app.models.database import Base
+from app.models.migrations import add_upsert_keys
 
 def create_tables():
     """Create all tables defined in our models"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     print("✅ Tables created successfully!")
+    # create_all leaves existing tables alone, so add any keys they are missing
+    for name in add_upsert_keys(engine):
+        print(f"✅ Added constraint {name} (duplicate rows removed)")
 
 if __name__ == "__main__":
     create_tables()
@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the backend tests
+Run from the backend/ directory: `pip install -r requirements-dev.txt && python -m pytest tests`
+"""
+import os
+import sys
+
+import pytest
+
+# Make the `app` package importable however pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# simple_main loads these at import; the tests start from an empty, private store
+os.environ.pop("SNAPSHOT_PATH", None)
+os.environ.pop("DATASET_PATH", None)
+
+
+def make_listing(number: int, **fields):
+    """An ingestion record as the pipeline sends it (prices in cents)"""
+    listing = {
+        "source": "zillow",
+        "address": f"{number} Market St, San Francisco, CA 94103",
+        "price": (500_000 + number) * 100,
+        "beds": 2,
+        "baths": 1.5,
+        "latitude": 37.77 + number * 1e-4,
+        "longitude": -122.42,
+        "open_house_time": "Sat 1-4pm",
+        "open_house_start": "2026-10-24T13:00:00",
+        "open_house_end": "2026-10-24T16:00:00",
+        "description": "Sunny condo near the park",
+    }
+    listing.update(fields)
+    return listing
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app import simple_main
+
+    simple_main.clear_listings()
+    simple_main._idempotent_responses.clear()
+    with TestClient(simple_main.app) as test_client:
+        yield test_client
+    simple_main.clear_listings()
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import make_listing
+
+from app import simple_main
+from app.services.listing_store import ListingStore
+
+
+def addresses(client, **params):
+    body = client.get("/api/v1/open-houses", params=params).json()
+    return sorted(listing["address"] for listing in body["open_houses"])
+
+
+def test_upsert_inserts_updates_and_skips_unchanged():
+    store = ListingStore()
+    changes = store.upsert([make_listing(1), make_listing(2)])
+    assert changes.counts() == {"inserted": 2, "updated": 0, "unchanged": 0, "deleted": 0}
+    assert len(store) == 2
+
+    changes = store.upsert([make_listing(1), make_listing(2, price=99_900_000)])
+    assert changes.counts() == {"inserted": 0, "updated": 1, "unchanged": 1, "deleted": 0}
+    old, new = changes.updated[0]
+    assert (old["price"], new["price"]) == (500_002, 999_000)
+    assert store.get(new["id"])["price"] == 999_000
+
+
+def test_ids_are_stable_and_never_reused():
+    store = ListingStore()
+    store.upsert([make_listing(1), make_listing(2)])
+    first = {row["address"]: row["id"] for row in store.values()}
+
+    store.upsert([make_listing(2)], delete_missing=True)
+    store.upsert([make_listing(1), make_listing(3)])
+    ids = {row["address"]: row["id"] for row in store.values()}
+    assert ids[make_listing(2)["address"]] == first[make_listing(2)["address"]]
+    assert ids[make_listing(1)["address"]] not in first.values()
+    assert len(set(ids.values())) == 3
+
+
+def test_sync_deletes_missing_listings():
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(5)])
+    changes = store.upsert([make_listing(0), make_listing(4)], delete_missing=True)
+    assert len(changes.deleted) == 3
+    assert len(store) == 2
+    assert sorted(row["address"] for row in store.values()) == sorted(
+        make_listing(i)["address"] for i in (0, 4)
+    )
+    assert [store.get(row["id"]) for row in changes.deleted] == [None, None, None]
+
+
+def test_bad_rows_are_skipped_and_reported():
+    store = ListingStore()
+    store.upsert([make_listing(1)])
+    version = store.version
+
+    changes = store.upsert([
+        make_listing(1, price=1_000_000_00),
+        "not a listing",
+        make_listing(2, latitude="37.71"),
+        make_listing(3, beds=2.5),
+    ], delete_missing=True)
+    assert [error["index"] for error in changes.errors] == [1, 2, 3]
+    assert changes.errors[1]["error"].startswith("latitude:")
+    assert changes.errors[2]["error"].startswith("beds:")
+    assert changes.counts()["updated"] == 1
+    assert store.version == version + 1
+    assert len(store) == 1
+
+
+@pytest.mark.parametrize("fields", [
+    {"latitude": "37.71"}, {"latitude": 91}, {"longitude": float("nan")}, {"longitude": True},
+    {"beds": "3"}, {"beds": 2.5}, {"baths": float("inf")}, {"baths": [1]},
+])
+def test_malformed_numbers_are_rejected_before_the_row_is_stored(fields):
+    store = ListingStore()
+    changes = store.upsert([make_listing(1, **fields), make_listing(2)])
+    assert [error["index"] for error in changes.errors] == [0]
+    assert changes.errors[0]["error"].startswith(next(iter(fields)) + ":")
+    assert len(store) == 1
+
+
+def test_numbers_keep_their_json_type():
+    store = ListingStore()
+    store.upsert([make_listing(1, beds=3.0, baths=2, latitude=None, longitude=None)])
+    row = store.values()[0]
+    assert (row["beds"], row["baths"], row["latitude"], row["longitude"]) == (3, 2, None, None)
+    assert isinstance(row["baths"], int)
+
+
+def test_rejected_row_keeps_its_stored_version_in_a_sync_push():
+    store = ListingStore()
+    store.upsert([make_listing(1), make_listing(2)])
+    changes = store.upsert([make_listing(1), make_listing(2, latitude="junk")], delete_missing=True)
+    assert len(changes.errors) == 1
+    assert changes.deleted == []
+    assert len(store) == 2
+
+
+def test_bulk_sync_and_upsert(client):
+    response = client.post("/api/v1/listings/bulk", json={"listings": [make_listing(i) for i in range(3)]})
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+    assert response.json()["error_count"] == 0
+
+    response = client.post("/api/v1/listings/bulk", json={
+        "mode": "upsert", "listings": [make_listing(3), make_listing(0, beds=4)],
+    })
+    assert {key: response.json()[key] for key in ("inserted", "updated", "deleted", "total_listings")} == {
+        "inserted": 1, "updated": 1, "deleted": 0, "total_listings": 4,
+    }
+    assert len(addresses(client, min_beds=4)) == 1
+
+    response = client.post("/api/v1/listings/bulk", json={"listings": [make_listing(1)]})
+    assert response.json()["deleted"] == 3
+    assert addresses(client) == [make_listing(1)["address"]]
+
+
+def test_bulk_reports_bad_rows_and_applies_the_rest(client):
+    response = client.post("/api/v1/listings/bulk", json={"listings": [
+        make_listing(1), make_listing(2, latitude="37.71"), 7, make_listing(3),
+    ]})
+    body = response.json()
+    assert response.status_code == 200
+    assert body["inserted"] == 2 and body["error_count"] == 2
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert len(addresses(client)) == 2
+    # The indexes caught up with the rows that were applied
+    assert client.get("/api/v1/search", params={"q": "sunny"}).json()["total"] == 2
+    bbox = client.get("/api/v1/open-houses/bbox", params={
+        "min_lat": 37.7, "min_lng": -122.5, "max_lat": 37.8, "max_lng": -122.4,
+    })
+    assert bbox.status_code == 200 and len(bbox.json()["open_houses"]) == 2
+
+
+def test_bulk_rejects_bad_requests(client):
+    assert client.post("/api/v1/listings/bulk", json={"mode": "merge", "listings": []}).status_code == 400
+    assert client.post("/api/v1/listings/bulk", json={"listings": {"a": 1}}).status_code == 400
+
+
+def test_ingests_invalidate_cached_responses(client):
+    client.post("/api/v1/listings/bulk", json={"listings": [make_listing(1)]})
+    first = client.get("/api/v1/open-houses")
+    assert first.json()["total"] == 1
+
+    client.post("/api/v1/listings/bulk", json={"mode": "upsert", "listings": [make_listing(2)]})
+    second = client.get("/api/v1/open-houses", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["total"] == 2
+
+
+def test_bulk_idempotency_key_replays_the_first_response(client):
+    headers = {"Idempotency-Key": "chunk-1"}
+    first = client.post("/api/v1/listings/bulk", json={"mode": "upsert", "listings": [make_listing(1)]},
+                        headers=headers).json()
+    replay = client.post("/api/v1/listings/bulk", json={"mode": "upsert", "listings": [make_listing(2)]},
+                         headers=headers).json()
+    assert replay == {**first, "replayed": True}
+    assert len(addresses(client)) == 1
+
+
+def test_concurrent_retries_of_one_chunk_apply_it_once(client):
+    def post(number):
+        return client.post("/api/v1/listings/bulk", headers={"Idempotency-Key": "chunk-1"},
+                           json={"mode": "upsert", "listings": [make_listing(number)]}).json()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(post, range(8)))
+    assert sum(not response.get("replayed") for response in responses) == 1
+    assert len(addresses(client)) == 1
+
+
+def test_oldest_idempotency_keys_are_forgotten(client, monkeypatch):
+    monkeypatch.setattr(simple_main, "MAX_IDEMPOTENCY_KEYS", 2)
+    for number in range(3):
+        client.post("/api/v1/listings/bulk", headers={"Idempotency-Key": f"chunk-{number}"},
+                    json={"mode": "upsert", "listings": [make_listing(number)]})
+    assert list(simple_main._idempotent_responses) == ["chunk-1", "chunk-2"]
+    retry = client.post("/api/v1/listings/bulk", headers={"Idempotency-Key": "chunk-0"},
+                        json={"mode": "upsert", "listings": [make_listing(0)]}).json()
+    assert "replayed" not in retry and retry["unchanged"] == 1
@@ -0,0 +1,78 @@
+import threading
+
+from conftest import make_listing
+
+from app import simple_main
+from app.services.clusters import MAX_VIEWPORT_CELLS, ClusterTiers, ClusterTiersBuilder
+
+SF = "-122.6,37.6,-122.2,37.9"
+
+
+def cluster_count(client, bbox=SF, zoom=10):
+    body = client.get("/api/v1/open-houses/clusters", params={"bbox": bbox, "zoom": zoom}).json()
+    return sum(cluster["count"] for cluster in body["clusters"])
+
+
+def test_ingests_rebuild_clusters_in_the_background(client):
+    client.post("/api/v1/listings/bulk", json={"listings": [make_listing(i) for i in range(30)]})
+    assert simple_main.cluster_tiers.wait(timeout=10)
+    assert cluster_count(client) == 30
+
+    client.post("/api/v1/listings/bulk", json={"listings": [make_listing(i) for i in range(10)]})
+    assert simple_main.cluster_tiers.wait(timeout=10)
+    assert cluster_count(client) == 10
+
+    client.delete("/api/v1/listings/clear")
+    assert simple_main.cluster_tiers.wait(timeout=10)
+    assert cluster_count(client) == 0
+
+
+def test_listing_queries_do_not_build_clusters(client, monkeypatch):
+    client.post("/api/v1/listings/bulk", json={"listings": [make_listing(i) for i in range(5)]})
+    assert simple_main.cluster_tiers.wait(timeout=10)
+
+    def fail(*args):
+        raise AssertionError("clusters built on the request path")
+
+    monkeypatch.setattr(ClusterTiers, "from_columns", fail)
+    assert client.get("/api/v1/open-houses").json()["total"] == 5
+    assert cluster_count(client) == 5
+
+
+def test_failed_build_keeps_the_previous_tiers():
+    builds = iter([(1, ClusterTiers([{"id": 1, "latitude": 37.7, "longitude": -122.4, "price": 1}]))])
+
+    def build():
+        return next(builds)  # StopIteration the second time
+
+    builder = ClusterTiersBuilder(build)
+    builder.invalidate()
+    assert builder.wait(timeout=10) and builder.current[0] == 1
+    builder.invalidate()
+    assert builder.wait(timeout=10) and builder.current[0] == 1
+
+
+def test_invalidations_during_a_build_are_folded_into_one_more():
+    started, release = threading.Event(), threading.Event()
+    versions = iter(range(1, 100))
+
+    def build():
+        started.set()
+        release.wait()
+        return next(versions), ClusterTiers()
+
+    builder = ClusterTiersBuilder(build)
+    builder.invalidate()
+    assert started.wait(timeout=10)
+    for _ in range(5):
+        builder.invalidate()
+    release.set()
+    assert builder.wait(timeout=10)
+    assert builder.current[0] == 2
+
+
+def test_wide_viewports_are_served_from_a_coarser_tier():
+    zoom = ClusterTiers.viewport_zoom(-90, -180, 90, 180, 16)
+    size = ClusterTiers.cell_size(zoom)
+    assert (180 / size + 1) * (360 / size + 1) <= MAX_VIEWPORT_CELLS * 1.1
+    assert ClusterTiers.viewport_zoom(37.7, -122.5, 37.8, -122.4, 12) == 12
@@ -0,0 +1,54 @@
+from conftest import make_listing
+
+from app.services.listing_index import WEEKEND_DAYS, ListingIndex, parse_days
+from app.services.listing_store import ListingStore
+
+TIMES = ["Sat & Sun 1-4pm", "Sat 1-4pm", "TBD", "Sunday, Oct 26 2-5pm", "Fri 4-6pm"]
+
+
+def test_parse_days_keeps_every_weekday():
+    assert parse_days("Sat & Sun 1-4pm") == (1 << 5) | (1 << 6)
+    assert parse_days("Saturday 11am-2pm") == 1 << 5
+    assert parse_days("TBD") == 0
+    assert parse_days(None) == 0
+
+
+def test_day_filters_match_any_listed_day():
+    store = ListingStore()
+    store.upsert([make_listing(i, open_house_time=text) for i, text in enumerate(TIMES)])
+    index = ListingIndex.from_store(store)
+
+    def times(**filters):
+        ids, _, _ = index.query_ids(limit=None, **filters)
+        return [store.get(i)["open_house_time"] for i in ids]
+
+    assert times(days=[6]) == ["Sat & Sun 1-4pm", "Sunday, Oct 26 2-5pm"]
+    assert times(days=[5]) == ["Sat & Sun 1-4pm", "Sat 1-4pm"]
+    assert times(days=list(WEEKEND_DAYS)) == ["Sat & Sun 1-4pm", "Sat 1-4pm", "Sunday, Oct 26 2-5pm"]
+    assert times(days=[0]) == []
+    # Dict-backed indexes parse the same way
+    assert len(ListingIndex([dict(row) for row in store.values()]).query(limit=None, days=[6])[0]) == 2
+
+
+def test_cursor_pages_by_id_across_ingests():
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(5)])
+    ids, cursor, total = ListingIndex.from_store(store).query_ids(limit=2)
+    assert total == 5 and cursor == ids[-1]
+
+    # A listing deleted before the cursor doesn't shift later pages
+    store.upsert([make_listing(i) for i in range(1, 6)], delete_missing=True)
+    rest, cursor, _ = ListingIndex.from_store(store).query_ids(limit=None, cursor=cursor)
+    assert cursor is None
+    assert rest == [i for i in store.live_ids().tolist() if i > ids[-1]]
+    assert len(rest) == 4
+
+
+def test_day_endpoint_filter(client):
+    client.post("/api/v1/listings/bulk", json={
+        "listings": [make_listing(i, open_house_time=text) for i, text in enumerate(TIMES)],
+    })
+    body = client.get("/api/v1/open-houses", params={"day": "sun"}).json()
+    assert body["total"] == 2
+    assert client.get("/api/v1/open-houses", params={"weekend": True}).json()["total"] == 3
+    assert client.get("/api/v1/open-houses", params={"weekend": True, "day": "fri"}).json()["total"] == 0
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from conftest import make_listing
+
+from app.services.encoding import loads
+from app.services.listing_index import ListingIndex
+from app.services.listing_store import ListingStore
+
+
+def decoded(store):
+    return {row["id"]: dict(row) for row in store.values()}
+
+
+def test_compaction_keeps_rows_and_encodings():
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(50)])
+    for round_number in range(1, 4):
+        store.upsert([make_listing(i, description=f"Round {round_number} " + "x" * 200) for i in range(50)])
+    store.upsert([make_listing(i) for i in range(0, 50, 2)], delete_missing=True)
+    before = decoded(store)
+    ids = sorted(before)
+
+    store.compact()
+    blob, rows = store.buffers()
+    assert len(blob) == int(rows["length"].sum())
+    assert decoded(store) == before
+    assert [loads(fragment) for fragment in store.encoded(ids)] == [before[i] for i in ids]
+    # Ids deleted since they were looked up are skipped
+    assert len(store.encoded(ids + [ids[-1] + 1, 10_000])) == len(ids)
+
+    store.upsert([make_listing(0, price=1)])
+    assert store.get(ids[0])["price"] == 0
+    assert loads(store.encoded([ids[0]])[0])["price"] == 0
+
+
+def test_commit_compacts_once_garbage_outgrows_live_data(monkeypatch):
+    from app.services import listing_store
+    monkeypatch.setattr(listing_store, "MIN_COMPACT_BYTES", 0)
+
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(20)])
+    store.upsert([make_listing(i, description="Renovated") for i in range(20)])
+    store.upsert([make_listing(i, description="Renovated again") for i in range(20)])
+    blob, rows = store.buffers()
+    assert len(blob) < 2 * int(rows["length"].sum())
+    assert {row["description"] for row in store.values()} == {"Renovated again"}
+
+
+def test_columns_match_rows_and_their_own_dictionary():
+    store = ListingStore()
+    store.upsert([make_listing(1), make_listing(2, open_house_time="Sun 2-5pm", beds=4), make_listing(3)])
+    store.upsert([make_listing(1), make_listing(2, open_house_time="Sun 2-5pm", beds=4)], delete_missing=True)
+
+    columns = store.columns()
+    assert columns["id"].tolist() == store.live_ids().tolist()
+    times = [columns["open_house_times"][code] for code in columns["open_house_time"]]
+    assert times == [store.get(i)["open_house_time"] for i in columns["id"].tolist()]
+    assert columns["beds"].tolist() == [2, 4]
+
+    ids, _, total = ListingIndex.from_store(store).query_ids(days=[6])
+    assert total == 1 and store.get(ids[0])["beds"] == 4
+
+
+def test_clear_then_reuse():
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(3)])
+    next_id = store.next_id
+    assert store.clear() == 3
+    assert len(store) == 0 and store.values() == [] and store.columns()["id"].size == 0
+
+    store.upsert([make_listing(7)])
+    assert store.values()[0]["id"] == next_id
+    assert np.array_equal(store.live_ids(), [next_id])
+
+
+def test_dump_and_restore_round_trip():
+    store = ListingStore()
+    store.upsert([make_listing(i) for i in range(6)])
+    store.upsert([make_listing(i) for i in range(1, 6)], delete_missing=True)
+
+    restored = ListingStore()
+    changes = restored.restore(store.dump(), next_id=store.next_id)
+    assert len(changes.inserted) == 5
+    assert decoded(restored) == decoded(store)
+    assert restored.ids_by_key == store.ids_by_key
+    restored.upsert([make_listing(99)])
+    assert max(decoded(restored)) == store.next_id
+
+
+@pytest.mark.parametrize("price", [10 ** 30, -(10 ** 30)])
+def test_out_of_range_numbers_are_rejected(price):
+    store = ListingStore()
+    changes = store.upsert([make_listing(1, price=price), make_listing(2)])
+    assert [error["index"] for error in changes.errors] == [0]
+    assert len(store) == 1
+
+
+@pytest.mark.parametrize("field_name", ["open_house_time", "address", "description"])
+def test_non_string_text_fields_are_rejected(field_name):
+    store = ListingStore()
+    changes = store.upsert([make_listing(1, **{field_name: 123}), make_listing(2)])
+    assert [error["index"] for error in changes.errors] == [0]
+    assert changes.errors[0]["error"].startswith(f"{field_name}:")
+    assert len(store) == 1
+
+
+def test_non_string_open_house_time_leaves_queries_working(client):
+    client.post("/api/v1/listings/bulk", json={
+        "listings": [make_listing(1, open_house_time=123), make_listing(2, open_house_time=None)],
+    })
+    assert client.get("/api/v1/open-houses", params={"day": "sat"}).json()["total"] == 0
+    assert client.get("/api/v1/open-houses").json()["total"] == 1
+    clusters = client.get("/api/v1/open-houses/clusters", params={"bbox": "-122.6,37.6,-122.2,37.9", "zoom": 10})
+    assert clusters.status_code == 200
@@ -0,0 +1,107 @@
+import threading
+
+from conftest import make_listing
+
+from app.services.listing_store import ListingStore
+from app.services.shared_dataset import MappedDataset, SharedDataset, write_dataset
+
+
+def decoded(store):
+    return {row["id"]: dict(row) for row in store.values()}
+
+
+def write_generation(store, path, generation=1):
+    write_dataset(store, path, generation)
+    return MappedDataset(path)
+
+
+def test_swap_installs_a_dataset_and_reports_the_difference(tmp_path):
+    writer = ListingStore()
+    writer.upsert([make_listing(i) for i in range(10)])
+    first = write_generation(writer, str(tmp_path / "first"))
+
+    reader = ListingStore()
+    changes = first.install(reader)
+    assert len(changes.inserted) == 10
+    assert decoded(reader) == decoded(writer)
+    assert reader.columns()["open_house_times"] == writer.columns()["open_house_times"]
+
+    writer.upsert([make_listing(i, open_house_time="Sun 11am-2pm") for i in range(3)]
+                  + [make_listing(i) for i in range(3, 8)] + [make_listing(20)], delete_missing=True)
+    changes = write_generation(writer, str(tmp_path / "second"), 2).install(reader)
+    assert changes.counts() == {"inserted": 1, "updated": 3, "unchanged": 5, "deleted": 2}
+    assert decoded(reader) == decoded(writer)
+    assert reader.ids_by_key == writer.ids_by_key
+
+    # Installing the same generation again changes nothing
+    version = reader.version
+    changes = MappedDataset(str(tmp_path / "second")).install(reader)
+    assert not changes and changes.unchanged == len(writer)
+    assert reader.version == version
+
+
+def test_swapped_store_copies_on_write(tmp_path):
+    writer = ListingStore()
+    writer.upsert([make_listing(i) for i in range(5)])
+    mapped = write_generation(writer, str(tmp_path / "dataset"))
+
+    store = ListingStore()
+    mapped.install(store)
+    assert not store.buffers()[1].flags.writeable
+
+    changes = store.upsert([make_listing(0, price=1_00), make_listing(9)])
+    assert changes.counts()["updated"] == 1 and changes.counts()["inserted"] == 1
+    assert changes.updated[0][1]["price"] == 1
+    assert len(store) == 6
+    # The mapping itself is untouched
+    assert mapped.rows["price"].tolist() == writer.buffers()[1]["price"].tolist()
+
+
+def test_shared_dataset_publish_and_sync(tmp_path):
+    path = str(tmp_path / "dataset")
+    one, two = ListingStore(), ListingStore()
+    one_shared, two_shared = SharedDataset(path), SharedDataset(path)
+
+    with one_shared.lock():
+        one_shared.sync(one)
+        one.upsert([make_listing(i) for i in range(4)])
+        assert one_shared.publish(one) == 1
+    assert len(two_shared.sync(two).inserted) == 4
+
+    with two_shared.lock():
+        two_shared.sync(two)
+        two.upsert([make_listing(1, beds=5)])
+        assert two_shared.publish(two) == 2
+    changes = one_shared.sync(one)
+    assert [new["beds"] for _, new in changes.updated] == [5]
+    assert decoded(one) == decoded(two)
+    assert not one_shared.sync(one)
+
+
+def test_readers_see_whole_generations_while_swapping(tmp_path):
+    small, large = ListingStore(), ListingStore()
+    small.upsert([make_listing(i) for i in range(5)])
+    large.upsert([make_listing(i, description="x" * 500) for i in range(200)])
+    generations = [write_generation(small, str(tmp_path / "small")),
+                   write_generation(large, str(tmp_path / "large"), 2)]
+
+    store = ListingStore()
+    generations[0].install(store)
+    done, failures = threading.Event(), []
+
+    def read():
+        while not done.is_set():
+            try:
+                for row in store.values():
+                    assert row["address"]
+            except Exception as exc:
+                failures.append(exc)
+                return
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for round_number in range(200):
+        generations[round_number % 2].install(store)
+    done.set()
+    reader.join()
+    assert failures == []
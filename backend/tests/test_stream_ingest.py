@@ -0,0 +1,109 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+
+from conftest import make_listing
+
+from app.services.ndjson import MAX_LINE_BYTES, NdjsonLines
+
+
+def ndjson(listings):
+    return b"".join(json.dumps(listing).encode() + b"\n" for listing in listings)
+
+
+def addresses(client, **params):
+    body = client.get("/api/v1/open-houses", params=params).json()
+    return sorted(listing["address"] for listing in body["open_houses"])
+
+
+def read_lines(chunks, gzipped=True):
+    async def chunk_stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for _, line in NdjsonLines(chunk_stream(), gzipped)]
+
+    return asyncio.run(collect())
+
+
+def test_stream_plain_and_gzip(client):
+    body = ndjson(make_listing(i) for i in range(1200))
+    response = client.post("/api/v1/listings/stream", params={"mode": "upsert"}, content=body)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1200
+    assert response.json()["message"] == "Processed 1200 lines"
+
+    body = ndjson([make_listing(i, beds=3) for i in range(600)])
+    response = client.post("/api/v1/listings/stream", content=gzip.compress(body),
+                           headers={"Content-Encoding": "gzip"})
+    summary = response.json()
+    assert (summary["updated"], summary["deleted"], summary["total_listings"]) == (600, 600, 600)
+    assert len(addresses(client, min_beds=3)) == 600
+
+
+def test_stream_reports_bad_lines(client):
+    body = b"\n".join([
+        json.dumps(make_listing(1)).encode(),
+        b"",
+        b"[1, 2]",
+        b"{not json",
+        b'{"address": "x", "open_house_start": "soon"}',
+        b"x" * (MAX_LINE_BYTES + 1),
+        json.dumps(make_listing(2)).encode(),
+    ])
+    summary = client.post("/api/v1/listings/stream", content=body).json()
+    assert summary["inserted"] == 2
+    assert summary["message"] == "Processed 7 lines"
+    assert [error["line"] for error in summary["errors"]] == [3, 4, 5, 6]
+    assert summary["errors"][2]["error"].startswith("open_house_start:")
+
+
+def test_stream_rejects_unknown_mode(client):
+    assert client.post("/api/v1/listings/stream", params={"mode": "merge"}, content=b"").status_code == 400
+
+
+def test_stream_ingests_invalidate_cached_responses(client):
+    client.post("/api/v1/listings/bulk", json={"listings": [make_listing(1)]})
+    first = client.get("/api/v1/open-houses")
+    assert first.json()["total"] == 1
+
+    client.post("/api/v1/listings/stream", params={"mode": "upsert"}, content=ndjson([make_listing(2)]))
+    second = client.get("/api/v1/open-houses", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["total"] == 2
+
+
+def test_concatenated_gzip_members_are_read_as_one_stream():
+    body = gzip.compress(b"a\nb") + gzip.compress(b"c\n") + gzip.compress(b"d\n")
+    assert read_lines([body]) == [b"a", b"bc", b"d"]
+    # Member boundaries falling anywhere in a chunk
+    assert read_lines([body[i:i + 7] for i in range(0, len(body), 7)]) == [b"a", b"bc", b"d"]
+
+
+def test_garbage_after_a_gzip_member_is_an_error():
+    with pytest.raises(zlib.error):
+        read_lines([gzip.compress(b"a\n") + b"not gzip"])
+    with pytest.raises(zlib.error):
+        read_lines([gzip.compress(b"a\n") + gzip.compress(b"b\n")[:10]])
+
+
+def test_stream_multi_member_gzip_body(client):
+    body = b"".join(gzip.compress(ndjson(make_listing(i) for i in range(start, start + 50)))
+                    for start in (0, 50, 100))
+    response = client.post("/api/v1/listings/stream", content=body, headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 150
+
+
+def test_stream_applies_nothing_from_a_corrupt_gzip_body(client):
+    client.post("/api/v1/listings/stream", content=ndjson([make_listing(1)]))
+    compressed = gzip.compress(ndjson(make_listing(i) for i in range(100, 2000)))
+
+    for body in (compressed[:len(compressed) // 2], compressed[:40] + b"garbage" * 20):
+        response = client.post("/api/v1/listings/stream", content=body, headers={"Content-Encoding": "gzip"})
+        assert response.status_code == 400
+    assert addresses(client) == [make_listing(1)["address"]]
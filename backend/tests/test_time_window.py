@@ -0,0 +1,68 @@
+from conftest import make_listing
+
+from app.services.interval_index import IntervalIndex, to_seconds
+from app.services.listing_store import ListingStore
+
+
+def window(client, start, end, **params):
+    response = client.get("/api/v1/open-houses/window", params={"start": start, "end": end, **params})
+    assert response.status_code == 200
+    return [listing["id"] for listing in response.json()["open_houses"]]
+
+
+def test_overlapping_windows_earliest_first():
+    index = IntervalIndex(bucket_seconds=3600)
+    index.add(1, to_seconds("2026-10-24T13:00"), to_seconds("2026-10-24T16:00"))
+    index.add(2, to_seconds("2026-10-24T10:00"), to_seconds("2026-10-24T18:00"))
+    index.add(3, to_seconds("2026-10-24T17:00"), to_seconds("2026-10-24T18:00"))
+    index.add(4, to_seconds("2026-10-24T12:00"), to_seconds("2026-10-24T12:00"))  # Empty, ignored
+    assert index.overlapping(to_seconds("2026-10-24T15:00"), to_seconds("2026-10-24T17:00")) == [2, 1]
+
+    index.remove(2, to_seconds("2026-10-24T10:00"))
+    assert index.overlapping(to_seconds("2026-10-24T15:00"), to_seconds("2026-10-24T17:30")) == [1, 3]
+
+
+def test_window_endpoint_follows_ingests(client):
+    client.post("/api/v1/listings/bulk", json={"listings": [
+        make_listing(1),
+        make_listing(2, open_house_start="2026-10-25T11:00:00", open_house_end="2026-10-25T14:00:00"),
+        make_listing(3, open_house_start=None, open_house_end=None),
+    ]})
+    ids = window(client, "2026-10-24T00:00", "2026-10-26T00:00")
+    assert len(ids) == 2
+    assert window(client, "2026-10-25T13:00", "2026-10-25T15:00") == ids[1:]
+
+    # Moving an open house moves it in the index
+    client.post("/api/v1/listings/bulk", json={"mode": "upsert", "listings": [
+        make_listing(1, open_house_start="2026-10-25T13:30:00", open_house_end="2026-10-25T15:00:00"),
+    ]})
+    assert window(client, "2026-10-25T13:00", "2026-10-25T15:00") == [ids[1], ids[0]]
+    assert window(client, "2026-10-24T12:00", "2026-10-24T18:00") == []
+    assert client.get("/api/v1/open-houses/window", params={
+        "start": "2026-10-25T13:00", "end": "2026-10-25T13:00",
+    }).status_code == 400
+
+
+def test_bad_datetimes_reject_only_their_row():
+    store = ListingStore()
+    store.upsert([make_listing(1)])
+
+    changes = store.upsert([
+        make_listing(1, price=1_000_000_00),
+        make_listing(2, open_house_start="Sat 1-4"),
+        make_listing(3, open_house_end=12345),
+    ], delete_missing=True)
+    assert [error["index"] for error in changes.errors] == [1, 2]
+    assert changes.errors[0]["error"].startswith("open_house_start:")
+    assert changes.errors[1]["error"].startswith("open_house_end:")
+    assert changes.counts()["updated"] == 1
+    assert len(store) == 1
+
+
+def test_bulk_with_a_bad_datetime_applies_the_other_rows(client):
+    response = client.post("/api/v1/listings/bulk", json={"listings": [
+        make_listing(1), make_listing(2, open_house_start="soon"),
+    ]})
+    assert response.status_code == 200
+    assert response.json()["error_count"] == 1
+    assert len(window(client, "2026-10-24T00:00", "2026-10-26T00:00")) == 1
@@ -0,0 +1,101 @@
+"""
+Benchmark: sequential RedfinScraper vs. the async fetch engine
+Serves Redfin-style fixture pages from a local aiohttp server with a fixed
+per-request latency, then scrapes several locations (search + detail pages).
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import detail_page_html, search_page_html  # noqa: E402
+from scrapers.async_engine import AsyncFetchEngine  # noqa: E402
+from scrapers.redfin_scraper import RedfinScraper  # noqa: E402
+from utils.rate_limiter import HostRateLimiter  # noqa: E402
+
+PORT = 8766
+LATENCY = 0.05
+LOCATIONS = [f"City {i}, CA" for i in range(8)]
+
+
+async def search(request):
+    await asyncio.sleep(LATENCY)
+    return web.Response(text=search_page_html(cards=10, seed=hash(request.path) % 1000), content_type="text/html")
+
+
+async def detail(request):
+    await asyncio.sleep(LATENCY)
+    return web.Response(text=detail_page_html(request.match_info["id"]), content_type="text/html")
+
+
+def run_server(ready: threading.Event):
+    async def start():
+        app = web.Application()
+        app.router.add_get("/city/{location}/filter/include=open-house", search)
+        app.router.add_get("/home/{id}", detail)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", PORT).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+class LocalRedfinScraper(RedfinScraper):
+    BASE_URL = f"http://127.0.0.1:{PORT}"
+
+    def __init__(self):
+        # Only measure fetching: start the host at a rate that never binds
+        super().__init__()
+        self.requests_per_second = 1000
+
+
+def sequential(scraper):
+    pages = 0
+    for location in LOCATIONS:
+        listings = scraper.scrape_listings(location)
+        pages += 1
+        for listing in listings:
+            scraper.parse_listing_details(listing["listing_url"])
+            pages += 1
+    return pages
+
+
+async def concurrent(scraper, concurrency, rate):
+    limiter = HostRateLimiter(rate, burst=concurrency, max_concurrency=concurrency, adaptive=False)
+    async with AsyncFetchEngine(limiter, max_concurrency=concurrency) as engine:
+        await scraper.scrape_many_async(LOCATIONS, engine, include_details=True)
+    return engine
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    ready = threading.Event()
+    threading.Thread(target=run_server, args=(ready,), daemon=True).start()
+    ready.wait()
+
+    scraper = LocalRedfinScraper()
+    start = time.perf_counter()
+    pages = sequential(scraper)
+    elapsed = time.perf_counter() - start
+    print(f"sequential get_page:        {pages} pages in {elapsed:5.2f}s = {pages / elapsed:6.1f} pages/sec")
+
+    for concurrency in (4, 16, 64):
+        engine = asyncio.run(concurrent(scraper, concurrency, rate=200))
+        print(f"async, concurrency {concurrency:>2}:     {engine.stats['pages']} pages in {engine.stats['elapsed']:5.2f}s "
+              f"= {engine.pages_per_sec:6.1f} pages/sec")
+
+    engine = asyncio.run(concurrent(scraper, 64, rate=20))
+    print(f"async, 20 req/s host limit: {engine.stats['pages']} pages in {engine.stats['elapsed']:5.2f}s "
+          f"= {engine.pages_per_sec:6.1f} pages/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: chunked, concurrent BackendIntegrator against a local stand-in backend
+The stand-in FastAPI app adds fixed per-request latency and fails a fraction of
+requests with 503, so the numbers show both pipelining and retry behaviour.
+Requires fastapi and uvicorn (see backend/requirements.txt).
+"""
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.backend_integration import BackendIntegrator  # noqa: E402
+
+PORT = 8765
+REQUEST_LATENCY = 0.02
+FAILURE_RATE = 0.05
+
+stand_in = FastAPI()
+applied_keys = set()
+
+
+@stand_in.get("/health")
+def health():
+    return {"status": "healthy"}
+
+
+@stand_in.post("/api/v1/listings/bulk")
+def bulk(data: Dict, idempotency_key: Optional[str] = Header(None)):
+    time.sleep(REQUEST_LATENCY)
+    if random.random() < FAILURE_RATE:
+        raise HTTPException(status_code=503, detail="injected failure")
+    applied_keys.add(idempotency_key)
+    return {"status": "success", "inserted": len(data.get("listings", []))}
+
+
+def main():
+    server = uvicorn.Server(uvicorn.Config(stand_in, port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    logging.basicConfig(level=logging.ERROR)
+    listings = [{"address": f"{i} Main St", "price": 100_000_000, "source": "mock"} for i in range(20_000)]
+
+    integrator = BackendIntegrator(f"http://127.0.0.1:{PORT}", pool_size=16)
+    for concurrency in (1, 2, 4, 8, 16):
+        result = integrator.send_listings_chunked(listings, chunk_size=500, concurrency=concurrency, backoff=0.05)
+        latencies = sorted(chunk.latency for chunk in result.chunks)
+        retries = sum(chunk.attempts - 1 for chunk in result.chunks)
+        print(f"concurrency {concurrency:>2}: {result.rows_per_sec:>9,.0f} rows/sec, "
+              f"p50 chunk {latencies[len(latencies) // 2] * 1000:.0f}ms, "
+              f"{retries} retries, ok={result.success}")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: DataCleaner.clean_listing per row vs the clean_listings batch path
+Checks both produce the same output, then reports rows/sec at each size.
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import raw_listings  # noqa: E402
+from processors.data_cleaner import DataCleaner  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def per_row(cleaner, rows):
+    cleaned = []
+    for raw in rows:
+        listing = cleaner.clean_listing(raw)
+        if listing:
+            cleaned.append(listing)
+    return cleaned
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    cleaner = DataCleaner()
+    for size in SIZES:
+        rows = raw_listings(size)
+
+        start = time.perf_counter()
+        scalar = per_row(cleaner, rows)
+        scalar_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = cleaner.clean_listings(rows)
+        batch_elapsed = time.perf_counter() - start
+
+        assert batch == scalar, "clean_listings output differs from clean_listing"
+        print(f"{size:>9,} rows: per-row {size / scalar_elapsed:>9,.0f} rows/sec, "
+              f"batch {size / batch_elapsed:>9,.0f} rows/sec ({scalar_elapsed / batch_elapsed:.1f}x), "
+              f"{len(batch):,} kept")
+
+
+if __name__ == "__main__":
+    main()
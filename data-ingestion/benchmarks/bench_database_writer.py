@@ -0,0 +1,82 @@
+"""
+Benchmark: DatabaseWriter bulk loads vs per-object ORM inserts on SQLite
+Loads synthetic listings (each with two open houses) into a fresh SQLite
+file at several batch sizes, then reloads them to measure the upsert path.
+The ORM baseline does session.add per object on a smaller sample.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import raw_listings  # noqa: E402
+from processors.data_cleaner import DataCleaner  # noqa: E402
+from utils.database import Base, DatabaseWriter, Listing, OpenHouse, Source  # noqa: E402
+
+LISTINGS = 200_000
+ORM_LISTINGS = 20_000
+BATCH_SIZES = [500, 5000, 20000]
+
+
+def make_listings(count):
+    listings = DataCleaner().clean_listings(raw_listings(count))
+    base = datetime(2026, 10, 24, 13)
+    for i, listing in enumerate(listings):
+        day = base + timedelta(days=i % 7)
+        listing["open_houses"] = [
+            {"start_time": day, "end_time": day + timedelta(hours=3)},
+            {"start_time": day + timedelta(days=1), "end_time": day + timedelta(days=1, hours=2)},
+        ]
+    return listings
+
+
+def orm_baseline(path, listings):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = time.perf_counter()
+    with Session(engine) as session:
+        sources = {}
+        for listing in listings:
+            name = listing["source"]
+            if name not in sources:
+                sources[name] = Source(name=name)
+                session.add(sources[name])
+            row = Listing(address=listing["address"], price=listing["price"], beds=listing["beds"],
+                          baths=listing["baths"], latitude=listing["latitude"], longitude=listing["longitude"],
+                          description=listing["description"], source=sources[name])
+            session.add(row)
+            for event in listing["open_houses"]:
+                session.add(OpenHouse(listing=row, start_time=event["start_time"], end_time=event["end_time"]))
+        session.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    listings = make_listings(LISTINGS)
+    rows = len(listings) * 3
+    print(f"{len(listings):,} listings + {len(listings) * 2:,} open houses")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = listings[:ORM_LISTINGS]
+        elapsed = orm_baseline(os.path.join(tmp, "orm.sqlite"), sample)
+        print(f"  ORM session.add ({len(sample):,} listings): {len(sample) * 3 / elapsed:>9,.0f} rows/sec")
+
+        for batch_size in BATCH_SIZES:
+            writer = DatabaseWriter(f"sqlite:///{os.path.join(tmp, f'bulk-{batch_size}.sqlite')}",
+                                    batch_size=batch_size, create_tables=True)
+            first = writer.write(listings)
+            again = writer.write(listings)
+            print(f"  bulk, batch {batch_size:>6,}: insert {rows / first.elapsed:>9,.0f} rows/sec, "
+                  f"upsert {rows / again.elapsed:>9,.0f} rows/sec ({first.batches} transactions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: Deduplicator scaling and accuracy on synthetic cross-source data
+Each home is listed by one to three sources with formatting variations,
+typos and coordinate jitter. Reports time per listing (flat = linear
+scaling), comparisons per listing, and pairwise precision/recall.
+"""
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.deduplicator import Deduplicator  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000]
+STREETS = ["Market", "Mission", "Valencia", "Castro", "Divisadero", "Geary", "Folsom", "Hayes",
+           "Irving", "Lombard", "Bush", "Fillmore", "Haight", "Noriega", "Taraval", "Judah"]
+SUFFIXES = [("Street", "St"), ("Avenue", "Ave"), ("Boulevard", "Blvd")]
+
+
+def variant(rng, number, street, suffix, unit):
+    """One source's rendering of an address"""
+    suffix = suffix[rng.random() < 0.5]
+    address = f"{number} {street} {suffix}"
+    if unit:
+        address += rng.choice([f" Apt {unit}", f" #{unit}", f", Unit {unit}"])
+    address += rng.choice([", San Francisco, CA", " San Francisco CA", ", San Francisco, California"])
+    if rng.random() < 0.1:
+        i = rng.randrange(len(str(number)) + 1, len(address) - 1)
+        address = address[:i] + address[i + 1:]  # dropped character
+    return address.upper() if rng.random() < 0.1 else address
+
+
+def make_listings(count, seed=1):
+    rng = random.Random(seed)
+    listings, truth = [], []
+    home = 0
+    used = set()
+    while len(listings) < count:
+        number, street, suffix = rng.randint(1, 99999), rng.choice(STREETS), rng.choice(SUFFIXES)
+        unit = rng.randint(1, 12) if rng.random() < 0.3 else None
+        if (number, street, suffix, unit) in used:
+            continue  # A real address belongs to one home
+        used.add((number, street, suffix, unit))
+        lat, lon = 37.70 + rng.random() * 0.12, -122.51 + rng.random() * 0.15
+        for source in rng.sample(["redfin", "zillow", "realtor"], rng.choice([1, 1, 2, 3])):
+            listings.append({
+                "source": source,
+                "address": variant(rng, number, street, suffix, unit),
+                "price": rng.randint(50, 3000) * 100000,
+                "beds": rng.choice([1, 2, 3, None]),
+                "latitude": lat + rng.gauss(0, 0.0002),
+                "longitude": lon + rng.gauss(0, 0.0002),
+            })
+            truth.append(home)
+        home += 1
+    return listings[:count], truth[:count]
+
+
+def pair_counts(labels):
+    groups = defaultdict(list)
+    for i, label in enumerate(labels):
+        groups[label].append(i)
+    return {(a, b) for members in groups.values() for j, a in enumerate(members) for b in members[j + 1:]}
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    for size in SIZES:
+        listings, truth = make_listings(size)
+        dedupe = Deduplicator()
+        start = time.perf_counter()
+        clusters = [dedupe.add(listing)[0] for listing in listings]
+        merged = dedupe.merged()
+        elapsed = time.perf_counter() - start
+
+        line = (f"{size:>9,} listings -> {len(merged):>9,} homes: {elapsed:6.2f}s, "
+                f"{elapsed / size * 1e6:5.1f}us/listing, {dedupe.comparisons / size:.2f} comparisons/listing")
+        if size <= 100_000:
+            predicted, actual = pair_counts(clusters), pair_counts(truth)
+            hits = len(predicted & actual)
+            line += (f", precision {hits / len(predicted) if predicted else 1:.3f}"
+                     f", recall {hits / len(actual) if actual else 1:.3f}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: geocoding enrichment with a persistent cache
+50k listings without coordinates (10k distinct homes, written in several
+address styles) are geocoded twice against a provider that costs a fixed
+latency per call plus per address. The second run should make no provider
+calls.
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.geocoder import GeocodeCache, Geocoder, StubProvider  # noqa: E402
+
+LISTINGS = 50_000
+HOMES = 10_000
+CALL_LATENCY = 0.05
+ADDRESS_LATENCY = 0.0005
+
+
+class SlowStubProvider(StubProvider):
+    """StubProvider with the round-trip cost of a remote geocoder"""
+
+    def geocode_batch(self, addresses):
+        time.sleep(CALL_LATENCY + ADDRESS_LATENCY * len(addresses))
+        return super().geocode_batch(addresses)
+
+
+def make_listings(seed=1):
+    rng = random.Random(seed)
+    streets = [("Market", "Street", "St"), ("Mission", "Street", "St."), ("Geary", "Boulevard", "Blvd")]
+    listings = []
+    for _ in range(LISTINGS):
+        home = rng.randrange(HOMES)
+        name, long_suffix, short_suffix = streets[home % len(streets)]
+        suffix = rng.choice([long_suffix, short_suffix])
+        address = f"{home + 1} {name} {suffix}, San Francisco, CA"
+        listings.append({"address": rng.choice([address, address.upper(), address.replace(",", "")]),
+                         "latitude": None, "longitude": None})
+    return listings
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, cache_path in (("no cache", None), ("cache", os.path.join(tmp, "geocode.sqlite"))):
+            for run in (1, 2):
+                cache = GeocodeCache(cache_path) if cache_path else None
+                geocoder = Geocoder(SlowStubProvider(), cache)
+                listings = make_listings()
+                start = time.perf_counter()
+                for i in range(0, len(listings), 1000):  # Pipeline-sized batches
+                    geocoder.enrich(listings[i:i + 1000])
+                elapsed = time.perf_counter() - start
+                assert all(listing["latitude"] is not None for listing in listings)
+                stats = geocoder.stats
+                print(f"{label:>8} run {run}: {elapsed:6.2f}s, {stats['provider_calls']:>4} provider calls "
+                      f"for {stats['provider_addresses']:>6,} addresses, {stats['cache_hits']:>6,} cache hits")
+                if cache:
+                    cache.close()
+
+
+if __name__ == "__main__":
+    main()
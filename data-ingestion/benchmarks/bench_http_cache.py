@@ -0,0 +1,91 @@
+"""
+Benchmark: repeated scraper runs with and without the HTTP cache
+A local server serves Redfin-style pages with ETags and honours
+If-None-Match, so the second run shows fresh hits (ttl) and 304s (ttl=0).
+"""
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import detail_page_html, search_page_html  # noqa: E402
+from scrapers.redfin_scraper import RedfinScraper  # noqa: E402
+from utils.http_cache import HttpCache  # noqa: E402
+from utils.rate_limiter import HostRateLimiter  # noqa: E402
+
+PORT = 8768
+LATENCY = 0.02
+LOCATIONS = [f"City {i}, CA" for i in range(10)]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        if self.path.startswith("/home/"):
+            body = detail_page_html(self.path.rsplit("/", 1)[-1]).encode()
+        else:
+            body = search_page_html(cards=10, seed=sum(self.path.encode())).encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalRedfinScraper(RedfinScraper):
+    BASE_URL = f"http://127.0.0.1:{PORT}"
+
+    def __init__(self, http_cache=None):
+        super().__init__(http_cache=http_cache)
+        # Measure fetching, not politeness
+        self.requests_per_second = 1000
+        self.rate_limiter = HostRateLimiter(1000, burst=10, adaptive=False)
+
+
+def crawl(scraper):
+    start = time.perf_counter()
+    for location in LOCATIONS:
+        for listing in scraper.scrape_listings(location):
+            scraper.parse_listing_details(listing["listing_url"])
+    return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    server = ThreadingHTTPServer(("127.0.0.1", PORT), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"no cache:          {crawl(LocalRedfinScraper()):.2f}s per run")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, ttl in (("ttl=1h (fresh)", 3600), ("ttl=0 (revalidate)", 0)):
+            cache = HttpCache(os.path.join(tmp, f"{ttl}.sqlite"), ttl=ttl)
+            scraper = LocalRedfinScraper(http_cache=cache)
+            for run in (1, 2):
+                cache.reset_stats()
+                elapsed = crawl(scraper)
+                report = cache.report()
+                print(f"{name:<19} run {run}: {elapsed:.2f}s, hit rate {report['hit_rate']:.0%}, "
+                      f"{report['revalidated']} x 304, {report['parse_hits']} parse hits, "
+                      f"{report['bytes_downloaded'] / 1024:.0f}KB downloaded, {report['bytes_saved'] / 1024:.0f}KB saved")
+            cache.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
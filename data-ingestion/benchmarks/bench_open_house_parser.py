@@ -0,0 +1,54 @@
+"""
+Benchmark: open house time parsing throughput
+Parses a realistic mix of open house strings (many repeats, as scraped
+pages produce) with and without the per-(text, date) cache.
+"""
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processors.open_house_parser import parse_open_house_time  # noqa: E402
+
+COUNT = 1_000_000
+REFERENCE = date(2026, 10, 18)
+
+
+def make_strings(count, seed=1):
+    rng = random.Random(seed)
+    days = ["Sat", "Sun", "Saturday", "Sunday", "Sat & Sun", "Fri"]
+    formats = [
+        lambda: f"{rng.choice(days)} {rng.randint(10, 12)}-{rng.randint(2, 5)}pm",
+        lambda: f"{rng.choice(days)} {rng.randint(1, 3)}-{rng.randint(4, 6)}pm",
+        lambda: f"{rng.choice(days)} {rng.randint(10, 11)}am-{rng.randint(1, 4)}pm",
+        lambda: f"{rng.choice(days)}, Oct {rng.randint(19, 31)} {rng.randint(1, 2)}:00 PM - {rng.randint(3, 5)}:00 PM",
+        lambda: f"{rng.randint(10, 11)}/{rng.randint(1, 28)} {rng.randint(1, 2)}:30-4pm",
+    ]
+    return [rng.choice(formats)() for _ in range(count)]
+
+
+def main():
+    strings = make_strings(COUNT)
+    print(f"{COUNT:,} strings, {len(set(strings)):,} distinct")
+
+    uncached = parse_open_house_time.__wrapped__
+    sample = strings[:200_000]
+    start = time.perf_counter()
+    parsed = sum(1 for text in sample if uncached(text, REFERENCE))
+    elapsed = time.perf_counter() - start
+    print(f"  uncached: {len(sample) / elapsed:>12,.0f} strings/sec ({parsed / len(sample):.1%} parsed)")
+
+    parse_open_house_time.cache_clear()
+    start = time.perf_counter()
+    parsed = sum(1 for text in strings if parse_open_house_time(text, REFERENCE))
+    elapsed = time.perf_counter() - start
+    info = parse_open_house_time.cache_info()
+    print(f"  cached:   {COUNT / elapsed:>12,.0f} strings/sec ({parsed / COUNT:.1%} parsed, "
+          f"{info.hits / (info.hits + info.misses):.1%} cache hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: ParallelCleaner scaling from 1 to N worker processes
+Cleans a synthetic 1M-listing dataset at each worker count, checks the
+output matches the single-process run, and reports rows/sec and speedup.
+"""
+import logging
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import raw_listings  # noqa: E402
+from processors.parallel_cleaner import ParallelCleaner  # noqa: E402
+
+ROWS = int(os.environ.get("BENCH_ROWS", 1_000_000))
+CHUNK_SIZE = 20000
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    rows = raw_listings(ROWS)
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1))) if cores > 1 else [1, 2]
+    print(f"{ROWS:,} listings, chunk size {CHUNK_SIZE:,}, {cores} CPU(s)")
+
+    baseline = None
+    for workers in worker_counts:
+        with ParallelCleaner(workers=workers, chunk_size=CHUNK_SIZE) as cleaner:
+            result = cleaner.clean(rows)
+        if baseline is None:
+            baseline = result
+        else:
+            assert result.listings == baseline.listings and result.rejected == baseline.rejected, \
+                "parallel output differs from single-process output"
+        print(f"  {workers:>2} worker(s): {result.rows_per_sec:>10,.0f} rows/sec, "
+              f"{result.elapsed:.2f}s ({baseline.elapsed / result.elapsed:.2f}x), "
+              f"{len(result.rejected):,} rejected {result.rejection_counts()}")
+
+
+if __name__ == "__main__":
+    main()
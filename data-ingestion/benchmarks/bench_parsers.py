@@ -0,0 +1,61 @@
+"""
+Benchmark: RedfinScraper search-page parsing per parser backend
+Parses saved fixture HTML with each backend and reports pages/sec and peak
+RSS. Each backend runs in its own subprocess so memory numbers don't mix.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import search_page_html  # noqa: E402
+
+PAGES = 200
+CARDS_PER_PAGE = 40
+
+
+def run_backend(name: str):
+    import logging
+    from scrapers.parsers import get_parser
+    from scrapers.redfin_scraper import SEARCH_RESULT_CARDS, RedfinScraper
+
+    logging.disable(logging.CRITICAL)
+    scraper = RedfinScraper(parser=name)
+    pages = [search_page_html(CARDS_PER_PAGE, seed=i).encode() for i in range(20)]
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    reference = RedfinScraper(parser="bs4")._parse_search_page(pages[0], "x")
+    assert scraper._parse_search_page(pages[0], "x") == reference, f"{name} output differs from bs4"
+
+    backend = get_parser(name)
+    start = time.perf_counter()
+    for i in range(PAGES):
+        for card in backend.extract(pages[i % len(pages)], SEARCH_RESULT_CARDS):
+            scraper._parse_listing_card(card)
+    elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"pages_per_sec": PAGES / elapsed, "rss_growth_kb": peak_rss - baseline_rss}))
+
+
+def main():
+    size = len(search_page_html(CARDS_PER_PAGE).encode())
+    print(f"{PAGES} pages x {CARDS_PER_PAGE} cards ({size / 1024:.0f}KB each)")
+    for name in ("bs4", "lxml", "selectolax"):
+        proc = subprocess.run([sys.executable, __file__, name], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{name:>11}: unavailable ({proc.stderr.strip().splitlines()[-1]})")
+            continue
+        result = json.loads(proc.stdout)
+        print(f"{name:>11}: {result['pages_per_sec']:8.1f} pages/sec, peak RSS +{result['rss_growth_kb'] / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_backend(sys.argv[1])
+    else:
+        main()
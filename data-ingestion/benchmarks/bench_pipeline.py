@@ -0,0 +1,108 @@
+"""
+Benchmark: streaming Pipeline vs the materialize-everything flow
+A synthetic crawl yields 500k raw listings page by page with a small
+per-page delay. The batch flow builds the full raw list, cleans and dedupes
+it, then sends; the pipeline streams through bounded queues. Each mode runs
+in its own subprocess so peak RSS numbers don't mix.
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import raw_listings  # noqa: E402
+
+LISTINGS = int(os.environ.get("BENCH_ROWS", 500_000))
+PAGE_SIZE = 50
+PAGE_DELAY = 0.0005  # Stand-in for network time per page
+SINK_BATCH = 1000
+
+
+class SyntheticCrawler:
+    def pages(self):
+        for start in range(0, LISTINGS, PAGE_SIZE):
+            time.sleep(PAGE_DELAY)
+            page = raw_listings(PAGE_SIZE, seed=start)
+            for i, listing in enumerate(page):
+                listing["address"] = f"{start + i + 1} Market St, San Francisco, CA"
+            yield page
+
+    def records(self):
+        for page in self.pages():
+            yield from page
+
+
+class SerializingSink:
+    """Stands in for the backend: JSON-encodes each batch like an upload would"""
+
+    def __init__(self):
+        self.first_at = None
+        self.written = 0
+
+    def write(self, batch):
+        json.dumps(batch)
+        if self.first_at is None:
+            self.first_at = time.perf_counter()
+        self.written += len(batch)
+
+
+def run(mode):
+    import logging
+
+    from processors.data_cleaner import DataCleaner
+    from processors.deduplicator import Deduplicator
+    from processors.pipeline import CleanStage, DedupeStage, Pipeline, Sink
+
+    logging.disable(logging.CRITICAL)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    crawler = SyntheticCrawler()
+    start = time.perf_counter()
+
+    if mode == "batch":
+        sink = SerializingSink()
+        raw = [listing for page in crawler.pages() for listing in page]
+        cleaned = DataCleaner().clean_listings(raw)
+        unique = Deduplicator().deduplicate(cleaned).listings
+        for i in range(0, len(unique), SINK_BATCH):
+            sink.write(unique[i:i + SINK_BATCH])
+        first, written = sink.first_at - start, sink.written
+    else:
+        class BenchSink(Sink):
+            def __init__(self):
+                super().__init__(batch_size=SINK_BATCH)
+                self.inner = SerializingSink()
+
+            def write(self, batch):
+                self.inner.write(batch)
+
+        sink = BenchSink()
+        stats = Pipeline(crawler.records(), [CleanStage(), DedupeStage()], sink).run()
+        first, written = stats.time_to_first_record, stats.records_written
+
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"first": first, "elapsed": elapsed, "written": written,
+                      "rss_growth_kb": peak_rss - baseline_rss}))
+
+
+def main():
+    print(f"{LISTINGS:,} listings in pages of {PAGE_SIZE}, sink batches of {SINK_BATCH}")
+    for mode in ("batch", "pipeline"):
+        proc = subprocess.run([sys.executable, __file__, mode], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stderr)
+            continue
+        result = json.loads(proc.stdout)
+        print(f"{mode:>9}: first record after {result['first']:6.2f}s, total {result['elapsed']:6.2f}s, "
+              f"{result['written']:,} written, peak RSS +{result['rss_growth_kb'] / 1024:.0f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: adaptive per-host limiter against a server that throttles
+The local server allows CAPACITY requests/sec and answers the rest with 429
+(RETRY_AFTER adds a Retry-After header). Compares how many pages a fixed-rate
+limiter and the AIMD one lose to throttling, and how long each crawl takes.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import detail_page_html  # noqa: E402
+from scrapers.async_engine import AsyncFetchEngine  # noqa: E402
+from utils.rate_limiter import HostRateLimiter  # noqa: E402
+
+PORT = 8767
+CAPACITY = 30  # Requests per second the server tolerates
+PAGES = 300
+RETRY_AFTER = None  # e.g. "1" to have the server send Retry-After
+
+
+class Throttle:
+    window_start = time.monotonic()
+    count = 0
+
+
+async def page(request):
+    now = time.monotonic()
+    if now - Throttle.window_start >= 1:
+        Throttle.window_start, Throttle.count = now, 0
+    Throttle.count += 1
+    if Throttle.count > CAPACITY:
+        return web.Response(status=429, headers={"Retry-After": RETRY_AFTER} if RETRY_AFTER else {})
+    await asyncio.sleep(0.02)
+    return web.Response(text=detail_page_html(request.match_info["id"]), content_type="text/html")
+
+
+def run_server(ready: threading.Event):
+    async def start():
+        app = web.Application()
+        app.router.add_get("/home/{id}", page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", PORT).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(start())
+
+
+async def crawl(limiter):
+    urls = [f"http://127.0.0.1:{PORT}/home/{i}" for i in range(PAGES)]
+    async with AsyncFetchEngine(limiter, max_concurrency=16) as engine:
+        pages = await engine.fetch_all(urls)
+    return engine, sum(1 for p in pages if p is None)
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    ready = threading.Event()
+    threading.Thread(target=run_server, args=(ready,), daemon=True).start()
+    ready.wait()
+
+    for name, limiter in (
+        ("fixed 60 req/s", HostRateLimiter(60, burst=5, max_concurrency=16, adaptive=False)),
+        ("AIMD from 60 req/s", HostRateLimiter(60, burst=5, max_concurrency=16, max_rate=60)),
+    ):
+        time.sleep(1.1)
+        engine, failed = asyncio.run(crawl(limiter))
+        stats = next(iter(limiter.stats().values()))
+        print(f"{name:>20}: {engine.stats['pages']} ok / {failed} throttled in {engine.stats['elapsed']:.2f}s, "
+              f"final rate {stats['rate']} req/s, backoffs {stats['backoffs']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Synthetic Redfin-style HTML used by the scraper benchmarks
+"""
+import random
+
+
+def search_page_html(cards: int = 40, seed: int = 1, filler: int = 20) -> str:
+    """A search results page with `cards` HomeCard containers plus unrelated markup"""
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Open houses</title></head><body><div id='results'>"]
+    for i in range(cards):
+        parts.append(
+            f"<div class='HomeCard'><div class='photo'><img src='/img/{i}.jpg'/></div>"
+            f"<span class='price'>${rng.randint(500, 3000) * 1000:,}</span>"
+            f"<div class='address'> {rng.randint(1, 999)} Market St, San Francisco, CA </div>"
+            f"<div class='stats'>{rng.randint(1, 5)} beds, {rng.choice([1, 1.5, 2, 3])} baths</div>"
+            f"<div class='open-house-time'>Sat {rng.randint(10, 13)}-{rng.randint(2, 5)}pm</div>"
+            f"<a href='/home/{seed}-{i}'>Details</a>"
+            + "".join(f"<span class='tag'>tag {j}</span>" for j in range(filler))
+            + "</div>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def detail_page_html(listing_id: str) -> str:
+    return (
+        f"<html><body><h1>Listing {listing_id}</h1>"
+        "<div class='description'>Beautiful property with modern amenities</div></body></html>"
+    )
+
+
+def raw_listings(count: int, seed: int = 1):
+    """Scraper-shaped listing dicts with messy whitespace and a mix of valid and invalid fields"""
+    rng = random.Random(seed)
+    streets = ["Market St", "Mission St", "Valencia St", "Castro St", "Divisadero St"]
+    listings = []
+    for i in range(count):
+        listings.append({
+            "source": rng.choice(["Redfin", "Zillow"]),
+            "address": f"  {i + 1}  {rng.choice(streets)},   san francisco, CA ",
+            "price": rng.randint(50, 3000) * 100000 if rng.random() < 0.9 else rng.choice([None, 0]),
+            "beds": rng.choice([1, 2, 3, 4, 12, None]),
+            "baths": rng.choice([1, 1.5, 2, 3.5, None]),
+            "open_house_time": f" Sat {rng.randint(10, 13)}-{rng.randint(2, 5)}pm ",
+            "description": "Beautiful  property with\tmodern amenities " * rng.randint(1, 20),
+            "latitude": 37.7 + rng.random() * 0.1,
+            "longitude": -122.5 + rng.random() * 0.1,
+            "listing_url": f"https://example.com/home/{i}",
+        })
+    return listings
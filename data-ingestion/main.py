@@ -7,7 +7,8 @@ from typing import List, Dict
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.mock_scraper import MockScraper
-from processors.data_cleaner import DataCleaner
+from processors.parallel_cleaner import ParallelCleaner
+from processors.deduplicator import Deduplicator
 
 # Set up logging
 logging.basicConfig(
@@ -22,7 +23,6 @@ def test_mock_scraper():
     
     # Initialize components
     scraper = MockScraper()
-    cleaner = DataCleaner()
     
     # Scrape mock data
     print("\n📊 Scraping mock listings...")
@@ -32,14 +32,18 @@ def test_mock_scraper():
     
     # Clean the data
     print("\n🧹 Cleaning scraped data...")
-    cleaned_listings = []
-    
-    for raw_listing in raw_listings:
-        cleaned = cleaner.clean_listing(raw_listing)
-        if cleaned:
-            cleaned_listings.append(cleaned)
+    with ParallelCleaner() as cleaner:
+        result = cleaner.clean(raw_listings)
+    cleaned_listings = result.listings
     
     print(f"✅ Cleaned {len(cleaned_listings)} listings")
+    if result.rejected:
+        print(f"⚠️  Rejected {len(result.rejected)}: {result.rejection_counts()}")
+    
+    # Merge repeated addresses and cross-source duplicates
+    deduped = Deduplicator().deduplicate(cleaned_listings)
+    cleaned_listings = deduped.listings
+    print(f"✅ {len(cleaned_listings)} unique listings ({deduped.duplicates} duplicates merged)")
     
     # Display results
     print("\n📋 Sample Cleaned Listings:")
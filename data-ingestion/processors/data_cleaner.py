@@ -1,23 +1,53 @@
 import re
-from typing import Dict, List, Optional
+import time
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
+from processors.open_house_parser import first_window
+from utils.metrics import metrics
+
+# Price bounds in cents ($100K - $50M)
+MIN_PRICE = 10000000
+MAX_PRICE = 5000000000
+MAX_DESCRIPTION_LENGTH = 500
+
 class DataCleaner:
     """Clean and standardize scraped real estate data"""
     
-    def __init__(self):
+    def __init__(self, reference_date: Optional[date] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Scrape date that weekday-only open house times ("Sat 1-4pm") resolve against
+        self.reference_date = reference_date
     
     def clean_listing(self, raw_listing: Dict) -> Optional[Dict]:
         """Clean and validate a single listing"""
+        with metrics.timer('cleaner_seconds', {'mode': 'single'}):
+            cleaned, reason = self.clean_listing_with_reason(raw_listing)
+        metrics.inc('cleaner_records_total')
+        if reason:
+            metrics.inc('cleaner_rejections_total', labels={'reason': _reason_label(reason)})
+        return cleaned
+    
+    def clean_listing_with_reason(self, raw_listing: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+        """Clean a single listing, returning (cleaned, None) or (None, rejection reason)"""
         try:
+            open_house_time = self._clean_open_house_time(raw_listing.get('open_house_time', ''))
+            reference_date = self.reference_date or date.today()
+            open_house_start, open_house_end = first_window(open_house_time, reference_date)
             cleaned = {
                 'source': raw_listing.get('source', '').lower(),
                 'address': self._clean_address(raw_listing.get('address', '')),
                 'price': self._validate_price(raw_listing.get('price')),
                 'beds': self._validate_beds(raw_listing.get('beds')),
                 'baths': self._validate_baths(raw_listing.get('baths')),
-                'open_house_time': self._clean_open_house_time(raw_listing.get('open_house_time', '')),
+                'open_house_time': open_house_time,
+                'open_house_start': open_house_start,
+                'open_house_end': open_house_end,
+                'scrape_date': reference_date.isoformat(),  # What open_house_time was resolved against
                 'description': self._clean_description(raw_listing.get('description', '')),
                 'latitude': raw_listing.get('latitude'),
                 'longitude': raw_listing.get('longitude'),
@@ -27,13 +57,147 @@ class DataCleaner:
             # Validate required fields
             if not all([cleaned['address'], cleaned['price']]):
                 self.logger.warning(f"Missing required fields in listing: {cleaned['address']}")
-                return None
+                return None, rejection_reason(cleaned['address'], cleaned['price'])
             
-            return cleaned
+            return cleaned, None
             
         except Exception as e:
             self.logger.error(f"Error cleaning listing: {e}")
-            return None
+            return None, f"error: {e}"
+    
+    def clean_listings(self, raw_listings: List[Dict],
+                       rejected: Optional[List[Tuple[int, str]]] = None) -> List[Dict]:
+        """Clean and validate a batch of listings.
+        
+        Returns the same listings, in the same order, as calling clean_listing
+        on each one and dropping the rejects. Price/beds/baths are validated
+        as NumPy columns; rows with unusual field types (non-string text,
+        NaN prices, string bed counts, ...) go through clean_listing itself
+        so edge cases behave identically.
+        
+        If a `rejected` list is given, (index, reason) is appended to it for
+        every dropped listing, in input order.
+        """
+        started = time.perf_counter()
+        n = len(raw_listings)
+        results: List[Optional[Dict]] = [None] * n
+        reasons: List[Optional[str]] = [None] * n
+        
+        fast_rows = []
+        sources, addresses, times, descriptions = [], [], [], []
+        prices, beds, baths = [], [], []
+        odd_beds, odd_baths = [], []  # (position in fast_rows, raw value) for scalar validation
+        
+        for i, raw in enumerate(raw_listings):
+            source = raw.get('source', '')
+            address = raw.get('address', '')
+            time_str = raw.get('open_house_time', '')
+            description = raw.get('description', '')
+            price = raw.get('price')
+            
+            bed = raw.get('beds')
+            bath = raw.get('baths')
+            
+            if not (type(source) is str and type(address) is str and type(time_str) is str
+                    and type(description) is str and _is_plain_price(price)
+                    and not _is_huge_int(bath) and not _is_nonfinite(bed)):
+                results[i], reasons[i] = self.clean_listing_with_reason(raw)
+                continue
+            
+            position = len(fast_rows)
+            fast_rows.append(i)
+            sources.append(source)
+            addresses.append(address)
+            times.append(time_str)
+            descriptions.append(description)
+            prices.append(price or np.nan)
+            
+            if bed is None:
+                beds.append(-1)
+            elif type(bed) is int:
+                beds.append(bed if 0 <= bed <= 10 else -1)
+            else:
+                beds.append(-1)
+                odd_beds.append((position, bed))
+            
+            if bath is None or type(bath) in (int, float):
+                baths.append(np.nan if bath is None else bath)
+            else:
+                baths.append(np.nan)
+                odd_baths.append((position, bath))
+        
+        if fast_rows:
+            self._clean_columns(raw_listings, results, reasons, fast_rows, sources, addresses, times,
+                                descriptions, prices, beds, baths, odd_beds, odd_baths)
+        
+        cleaned = [listing for listing in results if listing is not None]
+        if rejected is not None:
+            rejected.extend((i, reason) for i, reason in enumerate(reasons) if reason is not None)
+        
+        metrics.observe('cleaner_seconds', time.perf_counter() - started, {'mode': 'batch'})
+        metrics.inc('cleaner_records_total', n)
+        for reason, count in Counter(_reason_label(r) for r in reasons if r is not None).items():
+            metrics.inc('cleaner_rejections_total', count, {'reason': reason})
+        if len(cleaned) < n:
+            self.logger.warning(f"Rejected {n - len(cleaned)} of {n} listings")
+        return cleaned
+    
+    def _clean_columns(self, raw_listings, results, reasons, fast_rows, sources, addresses, times,
+                       descriptions, prices, beds, baths, odd_beds, odd_baths):
+        """Vectorized part of clean_listings for rows with plain field types"""
+        # Truncated before the range check, as _validate_price does with int()
+        price_arr = np.trunc(np.array(prices, dtype=np.float64))
+        price_ok = (price_arr >= MIN_PRICE) & (price_arr <= MAX_PRICE)
+        price_out = np.where(price_ok, np.nan_to_num(price_arr), 0).astype(np.int64).tolist()
+        price_ok = price_ok.tolist()
+        
+        beds_arr = np.array(beds, dtype=np.int64)
+        beds_out = beds_arr.tolist()
+        beds_ok = ((beds_arr >= 0) & (beds_arr <= 10)).tolist()
+        for position, value in odd_beds:
+            validated = self._validate_beds(value)
+            beds_ok[position] = validated is not None
+            beds_out[position] = validated
+        
+        baths_arr = np.array(baths, dtype=np.float64)
+        baths_out = baths_arr.tolist()
+        baths_ok = ((baths_arr >= 0) & (baths_arr <= 20)).tolist()
+        for position, value in odd_baths:
+            validated = self._validate_baths(value)
+            baths_ok[position] = validated is not None
+            baths_out[position] = validated
+        
+        # str.split()/join collapses the same whitespace as re.sub(r'\s+') + strip()
+        addresses = [' '.join(a.split()).title() for a in addresses]
+        descriptions = [' '.join(d.split()) for d in descriptions]
+        descriptions = [
+            d if len(d) <= MAX_DESCRIPTION_LENGTH else d[:MAX_DESCRIPTION_LENGTH - 3] + "..."
+            for d in descriptions
+        ]
+        
+        reference_date = self.reference_date or date.today()
+        for position, i in enumerate(fast_rows):
+            if not (addresses[position] and price_ok[position]):
+                reasons[i] = rejection_reason(addresses[position], price_ok[position])
+                continue
+            raw = raw_listings[i]
+            open_house_time = times[position].strip()
+            open_house_start, open_house_end = first_window(open_house_time, reference_date)
+            results[i] = {
+                'source': sources[position].lower(),
+                'address': addresses[position],
+                'price': price_out[position],
+                'beds': beds_out[position] if beds_ok[position] else None,
+                'baths': baths_out[position] if baths_ok[position] else None,
+                'open_house_time': open_house_time,
+                'open_house_start': open_house_start,
+                'open_house_end': open_house_end,
+                'scrape_date': reference_date.isoformat(),  # What open_house_time was resolved against
+                'description': descriptions[position],
+                'latitude': raw.get('latitude'),
+                'longitude': raw.get('longitude'),
+                'listing_url': raw.get('listing_url', ''),
+            }
     
     def _clean_address(self, address: str) -> str:
         """Standardize address format"""
@@ -57,7 +221,7 @@ class DataCleaner:
         price = int(price)
         
         # Basic sanity check (between $100K and $50M)
-        if 10000000 <= price <= 5000000000:  # In cents
+        if MIN_PRICE <= price <= MAX_PRICE:  # In cents
             return price
         
         return None
@@ -85,16 +249,11 @@ class DataCleaner:
             return None
     
     def _clean_open_house_time(self, time_str: str) -> str:
-        """Standardize open house time format"""
+        """Standardize open house time format (the display text; see open_house_parser for datetimes)"""
         if not time_str:
             return ""
         
-        # Clean up common formats
-        time_str = time_str.strip()
-        
-        # Convert to standard format if possible
-        # This would need more sophisticated parsing for real data
-        return time_str
+        return time_str.strip()
     
     def _clean_description(self, description: str) -> str:
         """Clean property description"""
@@ -105,7 +264,37 @@ class DataCleaner:
         description = re.sub(r'\s+', ' ', description.strip())
         
         # Limit length
-        if len(description) > 500:
-            description = description[:497] + "..."
+        if len(description) > MAX_DESCRIPTION_LENGTH:
+            description = description[:MAX_DESCRIPTION_LENGTH - 3] + "..."
         
         return description
+
+def rejection_reason(address, price) -> str:
+    """Why a listing failed the required-field check"""
+    if not address:
+        return "missing address"
+    return "invalid price"
+
+
+def _reason_label(reason: str) -> str:
+    """Metric label for a rejection reason (error details would explode the label set)"""
+    return "error" if reason.startswith("error") else reason
+
+
+def _is_plain_price(price) -> bool:
+    """True if the vectorized path validates this price exactly like _validate_price
+    (None, or an int/float that converts to a float64 without NaN/inf/overflow)"""
+    if price is None:
+        return True
+    if type(price) is int:
+        return not _is_huge_int(price)
+    return type(price) is float and price == price and abs(price) != float('inf')
+
+
+def _is_huge_int(value) -> bool:
+    return type(value) is int and abs(value) > 2 ** 53
+
+
+def _is_nonfinite(value) -> bool:
+    # int(nan) / int(inf) raise inside _validate_beds and reject the whole listing
+    return type(value) is float and (value != value or abs(value) == float('inf'))
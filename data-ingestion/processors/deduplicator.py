@@ -0,0 +1,253 @@
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _difflib_ratio(a: str, b: str) -> float:
+    from difflib import SequenceMatcher
+    return SequenceMatcher(None, a, b).ratio() * 100
+
+
+def _load_ratio():
+    """rapidfuzz's ratio if installed (0-100 like difflib's, much faster).
+
+    Imported on first use rather than with this module: rapidfuzz can pull
+    in pandas, and normalize_address users (the geocoder) never need it.
+    """
+    try:
+        from rapidfuzz.fuzz import ratio
+    except ImportError:  # pragma: no cover - rapidfuzz is optional
+        return _difflib_ratio
+    return ratio
+
+# Lower number wins when duplicate records are merged; unknown sources rank last
+DEFAULT_SOURCE_PRIORITY = {
+    'redfin': 0,
+    'zillow': 1,
+    'realtor': 2,
+    'mock': 9,
+}
+
+_STREET_SUFFIXES = {
+    'street': 'st', 'avenue': 'ave', 'av': 'ave', 'boulevard': 'blvd', 'road': 'rd',
+    'drive': 'dr', 'lane': 'ln', 'court': 'ct', 'place': 'pl', 'terrace': 'ter',
+    'highway': 'hwy', 'parkway': 'pkwy', 'circle': 'cir', 'square': 'sq', 'way': 'way',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+    'first': '1st', 'second': '2nd', 'third': '3rd', 'fourth': '4th', 'fifth': '5th',
+    'california': 'ca',
+}
+_UNIT_WORDS = {'apt', 'apartment', 'unit', 'ste', 'suite', '#'}
+_TOKEN_RE = re.compile(r'#|[a-z0-9]+')
+
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def normalize_address(address: str) -> Tuple[str, str, str]:
+    """Split an address into (normalized text, house number, unit).
+
+    Lowercases, drops punctuation and abbreviates common street words so
+    "425 First Street, Apt 2" and "425 1st st #2" normalize the same.
+    """
+    tokens = [_STREET_SUFFIXES.get(t, t) for t in _TOKEN_RE.findall(address.lower())]
+    number = tokens[0] if tokens and tokens[0][0].isdigit() else ''
+    unit = ''
+    kept = []
+    i = 0
+    while i < len(tokens):
+        if tokens[i] in _UNIT_WORDS and i + 1 < len(tokens):
+            unit = tokens[i + 1]
+            i += 2
+            continue
+        kept.append(tokens[i])
+        i += 1
+    return ' '.join(kept), number, unit
+
+
+def geohash(latitude: float, longitude: float, precision: int = 6) -> str:
+    """Standard base32 geohash of a point"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular distance in meters (accurate at the scale of a block)"""
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371000 * math.hypot(x, y)
+
+
+@dataclass
+class DedupeResult:
+    """Merged listings in order of first appearance, plus matching counters"""
+    listings: List[Dict] = field(default_factory=list)
+    input_count: int = 0
+    comparisons: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def duplicates(self) -> int:
+        return self.input_count - len(self.listings)
+
+
+class _Cluster:
+    __slots__ = ('records', 'text', 'unit', 'latitude', 'longitude')
+
+    def __init__(self, record: Dict, text: str, unit: str, keep: bool):
+        self.records = [record] if keep else []
+        self.text = text
+        self.unit = unit
+        self.latitude = record.get('latitude')
+        self.longitude = record.get('longitude')
+
+
+class Deduplicator:
+    """Find listings of the same home across (and within) sources and merge them.
+
+    Records are matched online, one at a time:
+      1. an identical normalized address joins that address's cluster;
+      2. otherwise candidates come only from blocks sharing the record's
+         (geohash cell, house number) or (house number, street token), and
+         a candidate matches if its unit is the same, its address is at least
+         `similarity` percent similar, and (when both have coordinates) it
+         lies within `max_distance_m`.
+    Blocks hold a handful of clusters each, so work grows linearly with the
+    number of listings instead of comparing every pair.
+
+    Each cluster is merged field by field, taking the first non-empty value
+    from its records ordered by source priority, then by arrival. With
+    keep_records=False only the matching keys are kept (for streaming use,
+    where callers act on add()'s return value and never call merged()).
+    """
+
+    def __init__(self, source_priority: Optional[Dict[str, int]] = None, similarity: float = 90,
+                 max_distance_m: float = 150, geohash_precision: int = 6, keep_records: bool = True):
+        self.source_priority = DEFAULT_SOURCE_PRIORITY if source_priority is None else source_priority
+        self.similarity = similarity
+        self.max_distance_m = max_distance_m
+        self.geohash_precision = geohash_precision
+        self.keep_records = keep_records
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._ratio = _load_ratio()
+        self.reset()
+
+    def reset(self):
+        self._clusters: List[_Cluster] = []
+        self._by_address: Dict[Tuple[str, str], int] = {}
+        self._blocks: Dict[Tuple, List[int]] = {}
+        self.input_count = 0
+        self.comparisons = 0
+
+    def add(self, listing: Dict) -> Tuple[int, bool]:
+        """Assign a listing to a cluster; returns (cluster id, True if the cluster is new)"""
+        self.input_count += 1
+        text, number, unit = normalize_address(listing.get('address') or '')
+
+        cluster_id = self._by_address.get((text, unit))
+        if cluster_id is not None:
+            self._keep(cluster_id, listing)
+            return cluster_id, False
+
+        block_keys = self._block_keys(listing, text, number)
+        cluster_id = self._find_match(listing, text, unit, block_keys)
+        if cluster_id is not None:
+            self._keep(cluster_id, listing)
+            self._by_address[(text, unit)] = cluster_id
+            return cluster_id, False
+
+        cluster_id = len(self._clusters)
+        self._clusters.append(_Cluster(listing, text, unit, self.keep_records))
+        self._by_address[(text, unit)] = cluster_id
+        for key in block_keys:
+            self._blocks.setdefault(key, []).append(cluster_id)
+        return cluster_id, True
+
+    def _keep(self, cluster_id: int, listing: Dict):
+        if self.keep_records:
+            self._clusters[cluster_id].records.append(listing)
+
+    def _block_keys(self, listing: Dict, text: str, number: str) -> List[Tuple]:
+        if not number:
+            # No house number to block on; only exact address matches apply
+            return []
+        keys = []
+        street = text.split(' ', 2)
+        if len(street) > 1:
+            keys.append(('street', number, street[1]))
+        latitude, longitude = listing.get('latitude'), listing.get('longitude')
+        if latitude is not None and longitude is not None:
+            keys.append(('cell', geohash(latitude, longitude, self.geohash_precision), number))
+        return keys
+
+    def _find_match(self, listing: Dict, text: str, unit: str, block_keys: List[Tuple]) -> Optional[int]:
+        latitude, longitude = listing.get('latitude'), listing.get('longitude')
+        seen = set()
+        for key in block_keys:
+            for cluster_id in self._blocks.get(key, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                cluster = self._clusters[cluster_id]
+                if cluster.unit != unit:
+                    continue
+                if (latitude is not None and longitude is not None
+                        and cluster.latitude is not None and cluster.longitude is not None
+                        and distance_m(latitude, longitude, cluster.latitude, cluster.longitude) > self.max_distance_m):
+                    continue
+                self.comparisons += 1
+                if self._ratio(text, cluster.text) >= self.similarity:
+                    return cluster_id
+        return None
+
+    def _priority(self, listing: Dict) -> int:
+        return self.source_priority.get((listing.get('source') or '').lower(), len(self.source_priority) + 100)
+
+    def merge(self, records: List[Dict]) -> Dict:
+        """Combine one cluster's records into a single listing by source priority"""
+        if len(records) == 1:
+            return dict(records[0])
+        ranked = sorted(records, key=self._priority)  # stable: ties keep arrival order
+        merged = dict(ranked[0])
+        for record in ranked[1:]:
+            for key, value in record.items():
+                if merged.get(key) in (None, '') and value not in (None, ''):
+                    merged[key] = value
+        return merged
+
+    def merged(self) -> List[Dict]:
+        """Merged listings for everything added so far, in order of first appearance"""
+        return [self.merge(cluster.records) for cluster in self._clusters]
+
+    def deduplicate(self, listings: Iterable[Dict]) -> DedupeResult:
+        """Deduplicate a batch from scratch"""
+        start = time.perf_counter()
+        self.reset()
+        for listing in listings:
+            self.add(listing)
+        result = DedupeResult(
+            listings=self.merged(),
+            input_count=self.input_count,
+            comparisons=self.comparisons,
+        )
+        result.elapsed = time.perf_counter() - start
+        if result.duplicates:
+            self.logger.info(f"Merged {result.duplicates} duplicate listings into {len(result.listings)}")
+        return result
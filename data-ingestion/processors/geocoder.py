@@ -0,0 +1,251 @@
+"""
+Geocoding enrichment for listings without coordinates
+
+Geocoder.enrich fills in latitude/longitude for listings that lack them.
+Addresses are keyed by their normalized form (so "425 First Street" and
+"425 1st St." share an entry), looked up in a persistent SQLite cache, and
+only the misses go to the provider, in batches. A second run over the same
+addresses makes no provider calls.
+
+Providers:
+  - GazetteerProvider: offline lookup from a dict or CSV (address, lat, lon)
+  - StubProvider:      deterministic fake coordinates inside a bounding box, for tests
+  - NominatimProvider: OpenStreetMap's public geocoder, one request per address
+"""
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from processors.deduplicator import normalize_address
+from utils.metrics import metrics
+from utils.rate_limiter import HostRateLimiter
+
+Coordinates = Tuple[float, float]
+
+
+def geocode_key(address: str) -> str:
+    """Cache key for an address: its normalized text plus unit"""
+    text, _, unit = normalize_address(address)
+    return f"{text} #{unit}" if unit else text
+
+
+class GeocodingProvider(ABC):
+    """Turns addresses into coordinates; returns None for addresses it can't place"""
+    name = "base"
+    batch_size = 100  # Most addresses the provider should get per call
+
+    @abstractmethod
+    def geocode_batch(self, addresses: List[str]) -> Dict[str, Optional[Coordinates]]:
+        pass
+
+
+class GazetteerProvider(GeocodingProvider):
+    """Offline lookup table keyed by normalized address"""
+    name = "gazetteer"
+    batch_size = 10000
+
+    def __init__(self, entries: Optional[Dict[str, Coordinates]] = None):
+        self.entries = {geocode_key(address): coords for address, coords in (entries or {}).items()}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "GazetteerProvider":
+        """Load rows of address,latitude,longitude (header optional)"""
+        entries = {}
+        with open(path, newline="") as f:
+            for row in csv.reader(f):
+                if len(row) < 3:
+                    continue
+                try:
+                    entries[row[0]] = (float(row[1]), float(row[2]))
+                except ValueError:
+                    continue  # Header or malformed row
+        return cls(entries)
+
+    def geocode_batch(self, addresses):
+        return {address: self.entries.get(geocode_key(address)) for address in addresses}
+
+
+class StubProvider(GeocodingProvider):
+    """Stable pseudo-coordinates from a hash of the address (San Francisco by default)"""
+    name = "stub"
+    batch_size = 1000
+
+    def __init__(self, bbox: Tuple[float, float, float, float] = (-122.51, 37.70, -122.36, 37.81)):
+        self.bbox = bbox  # west, south, east, north
+
+    def geocode_batch(self, addresses):
+        west, south, east, north = self.bbox
+        results = {}
+        for address in addresses:
+            digest = hashlib.blake2b(geocode_key(address).encode(), digest_size=8).digest()
+            x = int.from_bytes(digest[:4], "big") / 2 ** 32
+            y = int.from_bytes(digest[4:], "big") / 2 ** 32
+            results[address] = (round(south + y * (north - south), 6), round(west + x * (east - west), 6))
+        return results
+
+
+class NominatimProvider(GeocodingProvider):
+    """OpenStreetMap Nominatim search API (no batch endpoint; usage policy is 1 request/sec).
+
+    The policy is a hard limit, so by default the provider gets its own
+    fixed-rate limiter: the shared adaptive one would ramp a healthy host up
+    to 4x its starting rate. Retry-After is still honoured.
+    """
+    name = "nominatim"
+    batch_size = 20
+    URL = "https://nominatim.openstreetmap.org/search"
+    REQUESTS_PER_SECOND = 1.0
+
+    def __init__(self, user_agent: str = "open-house-finder", rate_limiter: Optional[HostRateLimiter] = None):
+        import requests  # Only needed for this provider; keeps the geocoder module light to import
+
+        self.rate_limiter = rate_limiter or HostRateLimiter(
+            requests_per_second=self.REQUESTS_PER_SECOND, max_concurrency=1, adaptive=False
+        )
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def geocode_batch(self, addresses):
+        import requests
+
+        results = {}
+        for address in addresses:
+            self.rate_limiter.acquire(self.URL, rate=self.REQUESTS_PER_SECOND)
+            status = None
+            started = time.monotonic()
+            try:
+                response = self.session.get(self.URL, params={"q": address, "format": "json", "limit": 1}, timeout=10)
+                status = response.status_code
+                response.raise_for_status()
+                matches = response.json()
+                results[address] = (float(matches[0]["lat"]), float(matches[0]["lon"])) if matches else None
+            except (requests.RequestException, ValueError, KeyError) as e:
+                self.logger.error(f"Error geocoding {address}: {e}")
+                # Left out of results so the address is retried on a later run
+            finally:
+                self.rate_limiter.release(self.URL, status, time.monotonic() - started)
+        return results
+
+
+class GeocodeCache:
+    """Persistent normalized-address -> coordinates cache, backed by SQLite.
+
+    Addresses the provider could not place are cached too (with NULL
+    coordinates) and retried once they are older than `miss_ttl` seconds.
+    """
+
+    def __init__(self, path: str = ".cache/geocode.sqlite", miss_ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.miss_ttl = miss_ttl
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocodes (
+                key TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                provider TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Coordinates]]:
+        """Cached results for the keys that have a usable entry"""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, latitude, longitude, updated_at FROM geocodes "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, latitude, longitude, updated_at in rows:
+                    if latitude is not None:
+                        found[key] = (latitude, longitude)
+                    elif now - updated_at < self.miss_ttl:
+                        found[key] = None
+        return found
+
+    def put_many(self, results: Dict[str, Optional[Coordinates]], provider: str):
+        now = time.time()
+        rows = [
+            (key, coords[0] if coords else None, coords[1] if coords else None, provider, now)
+            for key, coords in results.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocodes (key, latitude, longitude, provider, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Geocoder:
+    """Fill in missing coordinates from the cache, then the provider in batches"""
+
+    def __init__(self, provider: GeocodingProvider, cache: Optional[GeocodeCache] = None):
+        self.provider = provider
+        self.cache = cache
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats = {"listings": 0, "cache_hits": 0, "provider_calls": 0, "provider_addresses": 0, "unresolved": 0}
+
+    def enrich(self, listings: List[Dict]) -> List[Dict]:
+        """Set latitude/longitude on listings that have neither; returns the same list"""
+        missing: Dict[str, List[Dict]] = {}
+        addresses: Dict[str, str] = {}
+        for listing in listings:
+            if listing.get('latitude') is not None and listing.get('longitude') is not None:
+                continue
+            address = listing.get('address') or ''
+            if not address:
+                continue
+            key = geocode_key(address)
+            missing.setdefault(key, []).append(listing)
+            addresses.setdefault(key, address)
+        if not missing:
+            return listings
+        self.stats["listings"] += sum(len(group) for group in missing.values())
+
+        resolved = self.cache.get_many(missing) if self.cache else {}
+        self.stats["cache_hits"] += len(resolved)
+        metrics.inc('geocode_lookups_total', len(resolved), {'result': 'cache_hit'})
+
+        to_fetch = [key for key in missing if key not in resolved]
+        for i in range(0, len(to_fetch), self.provider.batch_size):
+            batch = to_fetch[i:i + self.provider.batch_size]
+            with metrics.timer('geocode_provider_seconds', {'provider': self.provider.name}):
+                by_address = self.provider.geocode_batch([addresses[key] for key in batch])
+            self.stats["provider_calls"] += 1
+            self.stats["provider_addresses"] += len(batch)
+            metrics.inc('geocode_lookups_total', len(batch), {'result': 'provider'})
+            fetched = {key: by_address[addresses[key]] for key in batch if addresses[key] in by_address}
+            if self.cache:
+                self.cache.put_many(fetched, self.provider.name)
+            resolved.update(fetched)
+
+        for key, group in missing.items():
+            coords = resolved.get(key)
+            if coords is None:
+                self.stats["unresolved"] += len(group)
+                continue
+            for listing in group:
+                listing['latitude'], listing['longitude'] = coords
+        return listings
@@ -0,0 +1,164 @@
+"""
+Parse free-text open house times into concrete start/end datetimes
+
+Handles the forms scrapers return: "Sat 1-4pm", "Sun 11am-2pm",
+"Sat & Sun 12:30-3pm", "Saturday, Oct 26 1:00 PM - 4:00 PM", "10/26 1-4pm",
+"Today 5-7pm". Weekdays resolve to their next occurrence on or after the
+reference (scrape) date. Strings repeat heavily across listings, so results
+are cached per (text, reference date).
+"""
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+Window = Tuple[datetime, datetime]
+
+_WEEKDAYS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_TIME_RANGE_RE = re.compile(
+    r'(\d{1,2})(?::(\d{2}))?\s*(am|pm|a|p)?\.?\s*(?:-|to)\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm|a|p)?\b'
+)
+_WEEKDAY_RE = re.compile(r'\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\b')
+_MONTH_DAY_RE = re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b')
+_NUMERIC_DATE_RE = re.compile(r'\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b')
+_DASHES_RE = re.compile(r'[‒-―]')
+
+
+def _hour(hour: int, meridiem: Optional[str]) -> int:
+    if hour > 12 or meridiem is None:
+        return hour
+    if meridiem.startswith('p'):
+        return hour if hour == 12 else hour + 12
+    return 0 if hour == 12 else hour
+
+
+def _time_range(match) -> Optional[Tuple[Tuple[int, int], Tuple[int, int], bool]]:
+    """((start h, m), (end h, m), ends next day) from a time-range match"""
+    start_h, start_m, start_mer, end_h, end_m, end_mer = match.groups()
+    start_h, end_h = int(start_h), int(end_h)
+    start_m, end_m = int(start_m or 0), int(end_m or 0)
+    if start_h > 23 or end_h > 23 or start_m > 59 or end_m > 59:
+        return None
+
+    if end_mer is None and start_mer is None:
+        # Bare "1-4": open houses are daytime events, so 1-7 means afternoon
+        end_mer = 'pm' if end_h < 8 or end_h == 12 else 'am'
+    elif end_mer is None:
+        end_mer = start_mer
+    end = _hour(end_h, end_mer)
+
+    if start_mer is None:
+        # "11-2pm": the start shares the end's meridiem unless that puts it after the end
+        start = _hour(start_h, end_mer)
+        if start > end and start_h <= 12:
+            start = _hour(start_h, 'am')
+    else:
+        start = _hour(start_h, start_mer)
+
+    overnight = (start, start_m) >= (end, end_m)
+    return (start, start_m), (end, end_m), overnight
+
+
+def _dates(text: str, reference: date) -> List[date]:
+    match = _MONTH_DAY_RE.search(text)
+    if match:
+        month, day = _MONTHS[match.group(1)], int(match.group(2))
+        return _explicit_date(reference, month, day, None)
+
+    match = _NUMERIC_DATE_RE.search(text)
+    if match:
+        year = match.group(3)
+        return _explicit_date(reference, int(match.group(1)), int(match.group(2)), int(year) if year else None)
+
+    if 'today' in text:
+        return [reference]
+    if 'tomorrow' in text:
+        return [reference + timedelta(days=1)]
+
+    dates = []
+    for day_name in _WEEKDAY_RE.findall(text):
+        ahead = (_WEEKDAYS[day_name] - reference.weekday()) % 7
+        day = reference + timedelta(days=ahead)
+        if day not in dates:
+            dates.append(day)
+    return dates
+
+
+def _explicit_date(reference: date, month: int, day: int, year: Optional[int]) -> List[date]:
+    if year is not None and year < 100:
+        year += 2000
+    try:
+        resolved = date(year or reference.year, month, day)
+        # A date well before the scrape date without a year means next year's
+        if year is None and resolved < reference - timedelta(days=30):
+            resolved = date(reference.year + 1, month, day)
+    except ValueError:
+        return []
+    return [resolved]
+
+
+def _day_segments(text: str, ranges: List, reference: date) -> List[str]:
+    """The text naming each time range's days.
+
+    A lone range takes its days from either side of it. With several, each
+    range owns the text since the previous one ("Sat 1-4pm, Sun 2-4pm"), or
+    the text up to the next one when days follow their ranges
+    ("1-4pm Sat, 2-4pm Sun"). The ranges themselves are left out, so
+    "10/26 1-4pm" doesn't read 1-4 as a date.
+    """
+    if len(ranges) == 1:
+        return [text[:ranges[0].start()] + ' ' + text[ranges[0].end():]]
+    starts = [match.start() for match in ranges]
+    ends = [match.end() for match in ranges]
+    before = [text[end:start] for end, start in zip([0] + ends, starts)]
+    after = [text[end:start] for end, start in zip(ends, starts[1:] + [len(text)])]
+    return before if _dates(before[0], reference) else after
+
+
+@lru_cache(maxsize=65536)
+def parse_open_house_time(text: str, reference: date) -> Tuple[Window, ...]:
+    """All (start, end) windows described by an open house string, earliest first.
+
+    Each day is paired with its own time range, so "Sat 1-4pm, Sun 2-4pm"
+    gives two different windows; a range with no days of its own
+    ("Sat 10-12, 2-4pm") shares the previous range's. Returns an empty tuple
+    when the string has no recognizable day or time range (callers keep the
+    raw text for display either way).
+    """
+    if not text:
+        return ()
+    normalized = _DASHES_RE.sub('-', text.lower())
+    ranges = list(_TIME_RANGE_RE.finditer(normalized))
+    if not ranges:
+        return ()
+
+    windows = set()
+    days: List[date] = []
+    for match, segment in zip(ranges, _day_segments(normalized, ranges, reference)):
+        days = _dates(segment, reference) or days
+        times = _time_range(match)
+        if times is None:
+            continue
+        (start_h, start_m), (end_h, end_m), overnight = times
+        for day in days:
+            start = datetime(day.year, day.month, day.day, start_h, start_m)
+            end = datetime(day.year, day.month, day.day, end_h, end_m)
+            if overnight:
+                end += timedelta(days=1)
+            windows.add((start, end))
+    return tuple(sorted(windows))
+
+
+@lru_cache(maxsize=65536)
+def first_window(text: str, reference: date) -> Tuple[Optional[str], Optional[str]]:
+    """ISO start/end of the first window, or (None, None) if the text can't be parsed"""
+    windows = parse_open_house_time(text, reference)
+    if not windows:
+        return None, None
+    start, end = windows[0]
+    return start.isoformat(), end.isoformat()
@@ -0,0 +1,97 @@
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+from processors.data_cleaner import DataCleaner
+
+# One DataCleaner per worker process, built on first use (and again if the reference date changes)
+_worker_cleaner: Optional[DataCleaner] = None
+
+
+def _clean_chunk(reference_date: date, chunk: List[Dict]) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    """Worker entry point: clean one chunk, with rejections indexed within the chunk"""
+    global _worker_cleaner
+    if _worker_cleaner is None or _worker_cleaner.reference_date != reference_date:
+        _worker_cleaner = DataCleaner(reference_date)
+    rejected: List[Tuple[int, str]] = []
+    cleaned = _worker_cleaner.clean_listings(chunk, rejected)
+    return cleaned, rejected
+
+
+@dataclass
+class CleanResult:
+    """Cleaned listings in input order, plus (input index, reason) for every reject"""
+    listings: List[Dict] = field(default_factory=list)
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+    chunks: int = 0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return (len(self.listings) + len(self.rejected)) / self.elapsed if self.elapsed else 0.0
+
+    def rejection_counts(self) -> Dict[str, int]:
+        return dict(Counter(reason for _, reason in self.rejected))
+
+
+class ParallelCleaner:
+    """Run DataCleaner.clean_listings over a process pool in chunks.
+
+    Chunks are mapped in order, so the output is identical to a single
+    clean_listings call no matter how many workers run. Batches that fit in
+    one chunk (or workers=1) are cleaned in-process without starting a pool.
+    The pool is kept between calls; use as a context manager or call close().
+    Every chunk of a call resolves open house times against the same
+    reference_date (default: the day clean is called).
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 20000,
+                 reference_date: Optional[date] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.reference_date = reference_date
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def clean(self, raw_listings: List[Dict]) -> CleanResult:
+        start = time.perf_counter()
+        chunks = [raw_listings[i:i + self.chunk_size] for i in range(0, len(raw_listings), self.chunk_size)]
+        result = CleanResult(workers=self.workers, chunks=len(chunks))
+        clean_chunk = partial(_clean_chunk, self.reference_date or date.today())
+
+        if self.workers == 1 or len(chunks) <= 1:
+            result.workers = 1
+            outputs = map(clean_chunk, chunks)
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            outputs = self._executor.map(clean_chunk, chunks)
+
+        for chunk_index, (cleaned, rejected) in enumerate(outputs):
+            offset = chunk_index * self.chunk_size
+            result.listings.extend(cleaned)
+            result.rejected.extend((offset + i, reason) for i, reason in rejected)
+
+        result.elapsed = time.perf_counter() - start
+        if result.rejected:
+            self.logger.info(f"Rejected {len(result.rejected)} of {len(raw_listings)} listings: "
+                             f"{result.rejection_counts()}")
+        return result
@@ -0,0 +1,382 @@
+"""
+Streaming ingestion pipeline
+
+Records flow source -> stages -> sink in batches. Every stage and the sink
+run in their own thread, connected by bounded queues, so a slow consumer
+blocks its producer (backpressure) instead of letting batches pile up, and
+the first records reach the sink while scraping is still going.
+
+    pipeline = Pipeline(
+        scrape_source(MockScraper(), ["San Francisco, CA"]),
+        [CleanStage(), DedupeStage(), MapStage(geocode)],
+        BackendSink(BackendIntegrator(), batch_size=500),
+    )
+    stats = pipeline.run()
+"""
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from processors.data_cleaner import DataCleaner
+from processors.deduplicator import Deduplicator
+from utils.metrics import metrics
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+# How often a blocked put/get wakes up to check whether the pipeline failed
+_POLL_INTERVAL = 0.1
+
+
+class Stage(ABC):
+    """A batch-at-a-time transformation between the source and the sink"""
+    name = "stage"
+
+    @abstractmethod
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        pass
+
+    def flush(self) -> List[Dict]:
+        """Records still held back when the input ends"""
+        return []
+
+
+class CleanStage(Stage):
+    """DataCleaner.clean_listings on each batch; rejects are counted by reason"""
+    name = "clean"
+
+    def __init__(self, cleaner: Optional[DataCleaner] = None):
+        self.cleaner = cleaner or DataCleaner()
+        self.rejections: Dict[str, int] = {}
+
+    def process(self, batch):
+        rejected = []
+        cleaned = self.cleaner.clean_listings(batch, rejected)
+        for _, reason in rejected:
+            self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        return cleaned
+
+
+class DedupeStage(Stage):
+    """Pass on the first record seen for each home and drop later duplicates.
+
+    Records are emitted as soon as they arrive, so unlike
+    Deduplicator.deduplicate a later, higher-priority source cannot fill in
+    fields of a record that already went downstream.
+    """
+    name = "dedupe"
+
+    def __init__(self, deduplicator: Optional[Deduplicator] = None):
+        self.deduplicator = deduplicator or Deduplicator(keep_records=False)
+
+    def process(self, batch):
+        return [listing for listing in batch if self.deduplicator.add(listing)[1]]
+
+
+class MapStage(Stage):
+    """Apply a function to each batch (enrichment and other per-record work)"""
+
+    def __init__(self, fn: Callable[[List[Dict]], List[Dict]], name: str = "map"):
+        self.fn = fn
+        self.name = name
+
+    def process(self, batch):
+        return self.fn(batch)
+
+
+class Sink(ABC):
+    """Final consumer; receives batches of exactly batch_size (the last may be short)"""
+    name = "sink"
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    @abstractmethod
+    def write(self, batch: List[Dict]):
+        pass
+
+    def close(self):
+        pass
+
+    def abort(self):
+        """The pipeline failed; close() will not be called"""
+
+
+class ListSink(Sink):
+    """Collect everything in memory (for scripts that print or save the results)"""
+    name = "list"
+
+    def __init__(self, batch_size: int = 500):
+        super().__init__(batch_size)
+        self.listings: List[Dict] = []
+
+    def write(self, batch):
+        self.listings.extend(batch)
+
+
+class _UploadAborted(Exception):
+    """Raised into a streamed upload's body to cancel it"""
+
+
+class BackendSink(Sink):
+    """Send each batch to the backend as it arrives.
+
+    mode="sync" (default) streams every batch into one NDJSON upload in sync
+    mode, so once the run finishes the backend deletes listings it did not
+    see, as a full push did. A failed run cancels the upload and the backend
+    keeps its previous data. mode="upsert" posts each batch as a retried
+    chunk and never deletes anything.
+    """
+    name = "backend"
+
+    def __init__(self, integrator, batch_size: int = 500, max_retries: int = 3, mode: str = "sync"):
+        super().__init__(batch_size)
+        if mode not in ("sync", "upsert"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.integrator = integrator
+        self.max_retries = max_retries
+        self.mode = mode
+        self.failed_rows = 0
+        self.summary: Optional[Dict] = None  # The backend's response to a sync upload
+        self._batches: queue.Queue = queue.Queue(maxsize=2)
+        self._upload: Optional[threading.Thread] = None
+        self._rows_queued = 0
+
+    def write(self, batch):
+        if self.mode == "upsert":
+            result = self.integrator.send_listings_chunked(batch, chunk_size=len(batch), concurrency=1,
+                                                           max_retries=self.max_retries)
+            if not result.success:
+                self.failed_rows += len(batch)
+            return
+        if self._upload is None:
+            self._upload = threading.Thread(target=self._stream, daemon=True)
+            self._upload.start()
+        if self._hand_over(batch):
+            self._rows_queued += len(batch)
+        else:
+            self.failed_rows += len(batch)
+
+    def close(self):
+        # No batches at all sends nothing rather than a sync that deletes everything
+        if self._upload is None:
+            return
+        self._hand_over(_DONE)
+        self._upload.join()
+        if self.summary is None:
+            self.failed_rows += self._rows_queued
+        else:
+            self.failed_rows += self.summary.get("error_count", 0)
+
+    def abort(self):
+        if self._upload is not None:
+            self._hand_over(_UploadAborted())
+            self._upload.join()
+
+    def _hand_over(self, item) -> bool:
+        """Queue item for the upload thread; False if the upload already ended"""
+        while self._upload.is_alive():
+            try:
+                self._batches.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _listings(self) -> Iterator[Dict]:
+        while True:
+            item = self._batches.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _UploadAborted):
+                raise item
+            yield from item
+
+    def _stream(self):
+        try:
+            self.summary = self.integrator.stream_listings(self._listings(), mode="sync")
+        except _UploadAborted:
+            self.summary = None
+
+
+class DatabaseSink(Sink):
+    """Bulk-load each batch into the SQLAlchemy schema (one transaction per batch)"""
+    name = "database"
+
+    def __init__(self, writer, batch_size: int = 5000):
+        super().__init__(batch_size)
+        self.writer = writer
+
+    def write(self, batch):
+        self.writer.write(batch)
+
+
+def scrape_source(scraper, locations: Iterable[str]) -> Iterator[Dict]:
+    """Yield raw listings location by location as the scraper returns them"""
+    for location in locations:
+        yield from scraper.scrape_listings(location)
+
+
+@dataclass
+class StageStats:
+    name: str
+    records_in: int = 0
+    records_out: int = 0
+    seconds: float = 0.0  # Time spent inside the stage's own code
+
+
+@dataclass
+class PipelineStats:
+    stages: List[StageStats] = field(default_factory=list)
+    time_to_first_record: Optional[float] = None  # Seconds until the sink got its first record
+    elapsed: float = 0.0
+
+    @property
+    def records_written(self) -> int:
+        return self.stages[-1].records_in if self.stages else 0
+
+
+class _Failed(Exception):
+    """Raised inside a worker thread when another thread already failed"""
+
+
+class Pipeline:
+    """Run a source, stages and a sink concurrently over bounded queues.
+
+    source_batch_size is how many source records travel together; each
+    queue holds at most queue_size batches. run() returns once the sink has
+    written everything, and re-raises the first error from any thread.
+    """
+
+    def __init__(self, source: Iterable[Dict], stages: List[Stage], sink: Sink,
+                 source_batch_size: int = 200, queue_size: int = 4):
+        self.source = source
+        self.stages = stages
+        self.sink = sink
+        self.source_batch_size = source_batch_size
+        self.queue_size = queue_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._failed = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    def run(self) -> PipelineStats:
+        stats = PipelineStats(
+            stages=[StageStats("source")] + [StageStats(stage.name) for stage in self.stages]
+            + [StageStats(self.sink.name)]
+        )
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._started = time.perf_counter()
+
+        threads = [threading.Thread(target=self._guard, args=(self._run_source, queues[0], stats.stages[0]))]
+        for i, stage in enumerate(self.stages):
+            threads.append(threading.Thread(
+                target=self._guard, args=(self._run_stage, stage, queues[i], queues[i + 1], stats.stages[i + 1])
+            ))
+        threads.append(threading.Thread(target=self._guard, args=(self._run_sink, queues[-1], stats)))
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats.elapsed = time.perf_counter() - self._started
+        if self._error is not None:
+            raise self._error
+        self.logger.info(f"Wrote {stats.records_written} records in {stats.elapsed:.2f}s "
+                         f"(first after {stats.time_to_first_record or 0:.2f}s)")
+        return stats
+
+    def _guard(self, target, *args):
+        try:
+            target(*args)
+        except _Failed:
+            pass
+        except BaseException as e:
+            if not self._failed.is_set():
+                self._error = e
+                self._failed.set()
+
+    def _put(self, q: queue.Queue, item):
+        while True:
+            if self._failed.is_set():
+                raise _Failed()
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue):
+        while True:
+            if self._failed.is_set():
+                raise _Failed()
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _run_source(self, out_q: queue.Queue, stats: StageStats):
+        batch = []
+        for record in self.source:
+            batch.append(record)
+            if len(batch) >= self.source_batch_size:
+                stats.records_out += len(batch)
+                self._put(out_q, batch)
+                batch = []
+        if batch:
+            stats.records_out += len(batch)
+            self._put(out_q, batch)
+        self._put(out_q, _DONE)
+
+    def _run_stage(self, stage: Stage, in_q: queue.Queue, out_q: queue.Queue, stats: StageStats):
+        while True:
+            batch = self._get(in_q)
+            started = time.perf_counter()
+            output = stage.flush() if batch is _DONE else stage.process(batch)
+            elapsed = time.perf_counter() - started
+            stats.seconds += elapsed
+            metrics.inc('pipeline_records_total', len(output), {'stage': stage.name})
+            if batch is not _DONE:
+                stats.records_in += len(batch)
+                metrics.observe('pipeline_stage_seconds', elapsed, {'stage': stage.name})
+            if output:
+                stats.records_out += len(output)
+                self._put(out_q, output)
+            if batch is _DONE:
+                self._put(out_q, _DONE)
+                return
+
+    def _run_sink(self, in_q: queue.Queue, stats: PipelineStats):
+        try:
+            self._drain_into_sink(in_q, stats)
+        except BaseException:
+            self.sink.abort()
+            raise
+
+    def _drain_into_sink(self, in_q: queue.Queue, stats: PipelineStats):
+        sink_stats = stats.stages[-1]
+        pending: List[Dict] = []
+        while True:
+            batch = self._get(in_q)
+            if batch is not _DONE:
+                pending.extend(batch)
+            while pending and (len(pending) >= self.sink.batch_size or batch is _DONE):
+                chunk, pending = pending[:self.sink.batch_size], pending[self.sink.batch_size:]
+                started = time.perf_counter()
+                self.sink.write(chunk)
+                elapsed = time.perf_counter() - started
+                sink_stats.seconds += elapsed
+                metrics.observe('pipeline_stage_seconds', elapsed, {'stage': self.sink.name})
+                metrics.inc('pipeline_records_total', len(chunk), {'stage': self.sink.name})
+                if stats.time_to_first_record is None:
+                    stats.time_to_first_record = time.perf_counter() - self._started
+                sink_stats.records_in += len(chunk)
+                sink_stats.records_out += len(chunk)
+            if batch is _DONE:
+                self.sink.close()
+                return
@@ -1,47 +1,198 @@
 from abc import ABC, abstractmethod
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import time
-import random
-from fake_useragent import UserAgent
 import logging
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional
+
+from utils.http_cache import HttpCache
+from utils.metrics import metrics
+from .parsers import ParserBackend, get_parser
+from utils.rate_limiter import HostRateLimiter, parse_retry_after, shared_rate_limiter
+
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
 
 class BaseScraper(ABC):
-    """Base class for all real estate scrapers"""
+    """Base class for all real estate scrapers
+
+    The HTTP session (with its fake_useragent User-Agent, which may download
+    browser data) and the parser backend are built on first use, so scrapers
+    that never fetch, like MockScraper, stay cheap to create and import.
+    """
+    
+    # Bump when selectors or parsing logic change, so cached parse results
+    # of unchanged pages are parsed again
+    PARSE_VERSION = 1
+    
+    # True for scrapers with the search/detail page hooks (see PageScraper),
+    # which scrape_many_async fetches through an AsyncFetchEngine
+    HAS_PAGE_HOOKS = False
     
-    def __init__(self, delay_range=(1, 3)):
+    def __init__(self, delay_range=(1, 3), rate_limiter: Optional[HostRateLimiter] = None,
+                 http_cache: Optional[HttpCache] = None, parser: str = "auto"):
         self.delay_range = delay_range
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self.http_cache = http_cache
+        self.parser_name = parser
+        # delay_range is kept as the starting request rate per host; the
+        # shared limiter then adapts it to how the host responds
+        self.requests_per_second = 2 / sum(delay_range) if sum(delay_range) else 100.0
+        self.rate_limiter = rate_limiter or shared_rate_limiter
         self.logger = logging.getLogger(self.__class__.__name__)
-        
-        # Set up headers to look like a real browser
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
-    
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
+        self._parser: Optional[ParserBackend] = None
+        self._ua = None
+        self._session: Optional["requests.Session"] = None
+    
+    @property
+    def parser(self) -> ParserBackend:
+        """Backend used by the page hooks; get_page still returns a BeautifulSoup"""
+        if self._parser is None:
+            self._parser = get_parser(self.parser_name)
+        return self._parser
+    
+    @property
+    def ua(self):
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+    
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            # Set up headers to look like a real browser
+            self._session.headers.update({
+                'User-Agent': self.ua.random,
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive',
+            })
+        return self._session
+    
+    def get_page(self, url: str) -> Optional["BeautifulSoup"]:
         """Get and parse a web page with error handling"""
+        body, _ = self.fetch(url)
+        return self.parse_html(body) if body is not None else None
+    
+    @property
+    def parser_key(self) -> str:
+        """Identifies what produced a cached parse result: scraper, parser backend and PARSE_VERSION"""
+        return f"{self.__class__.__name__}/{self.parser.name}/v{self.PARSE_VERSION}"
+    
+    def get_parsed(self, url: str, parse: Callable[[bytes], Any]) -> Optional[Any]:
+        """Fetch a page and run parse on its raw HTML, reusing a cached parse
+        result when the HTTP cache shows the page has not changed and the
+        result came from the same parser_key"""
+        body, unchanged = self.fetch(url)
+        if body is None:
+            return None
+        
+        if unchanged and self.http_cache:
+            parsed = self.http_cache.get_parsed(url, self.parser_key)
+            if parsed is not None:
+                return parsed
+        
+        parsed = parse(body)
+        if self.http_cache:
+            self.http_cache.put_parsed(url, parsed, self.parser_key)
+        return parsed
+    
+    def fetch(self, url: str):
+        """Return (body, unchanged) for a URL, going through the HTTP cache if
+        one is configured. unchanged is True when the body came from the cache
+        (fresh hit or 304). body is None on error."""
+        with metrics.timer('scraper_fetch_seconds', {'scraper': self.__class__.__name__}):
+            return self._fetch(url)
+    
+    def _fetch(self, url: str):
+        import requests
+        
+        labels = {'scraper': self.__class__.__name__}
+        entry = self.http_cache.lookup(url) if self.http_cache else None
+        if entry and self.http_cache.is_fresh(entry):
+            self.http_cache.record_hit(entry)
+            metrics.inc('scraper_pages_total', labels={**labels, 'result': 'cached'})
+            return entry.body, True
+        
+        # Wait for the host's rate limiter instead of a fixed sleep
+        self.rate_limiter.acquire(url, rate=self.requests_per_second)
+        status, retry_after = None, None
+        started = time.monotonic()
         try:
             self.logger.info(f"Fetching: {url}")
             
-            # Random delay to be respectful
-            delay = random.uniform(*self.delay_range)
-            time.sleep(delay)
+            headers = entry.conditional_headers() if entry else None
+            response = self.session.get(url, headers=headers, timeout=10)
+            status = response.status_code
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            
+            if status == 304 and entry:
+                self.http_cache.record_not_modified(entry, time.monotonic() - started)
+                metrics.inc('scraper_pages_total', labels={**labels, 'result': 'not_modified'})
+                return entry.body, True
             
-            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            return BeautifulSoup(response.content, 'html.parser')
+            if self.http_cache:
+                self.http_cache.store(
+                    url, response.content, response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'), time.monotonic() - started
+                )
+            metrics.inc('scraper_pages_total', labels={**labels, 'result': 'ok'})
+            metrics.inc('scraper_bytes_total', len(response.content), labels)
+            return response.content, False
             
         except requests.RequestException as e:
             self.logger.error(f"Error fetching {url}: {e}")
-            return None
+            metrics.inc('scraper_pages_total', labels={**labels, 'result': 'error'})
+            return None, False
+        
+        finally:
+            self.rate_limiter.release(url, status, time.monotonic() - started, retry_after)
+    
+    def parse_html(self, html) -> "BeautifulSoup":
+        """Parse a fetched page into a soup"""
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, 'html.parser')
+    
+    async def scrape_many_async(self, locations: List[str], engine=None,
+                                include_details: bool = False) -> Dict[str, List[Dict]]:
+        """Scrape several locations concurrently with an AsyncFetchEngine.
+
+        For a PageScraper, search pages (and, with include_details, every
+        listing's detail page) are fetched concurrently under the engine's
+        per-host rate limits. Other scrapers run scrape_listings in worker
+        threads instead.
+        """
+        from .async_engine import AsyncFetchEngine
+        
+        if not self.HAS_PAGE_HOOKS:
+            results = await asyncio.gather(*(asyncio.to_thread(self.scrape_listings, loc) for loc in locations))
+            return dict(zip(locations, results))
+        
+        urls = [self._build_search_url(location) for location in locations]
+        if engine is None:
+            async with AsyncFetchEngine(self.rate_limiter, headers=dict(self.session.headers),
+                                        requests_per_second=self.requests_per_second) as engine:
+                return await self.scrape_many_async(locations, engine, include_details)
+        
+        pages = await engine.fetch_all(urls)
+        results = {
+            location: self._parse_search_page(html, location) if html else []
+            for location, html in zip(locations, pages)
+        }
+        
+        if include_details:
+            listings = [l for found in results.values() for l in found if l.get('listing_url')]
+            detail_pages = await engine.fetch_all([l['listing_url'] for l in listings])
+            for listing, html in zip(listings, detail_pages):
+                if html:
+                    listing.update(self._parse_detail_page(html))
+        
+        return results
     
     @abstractmethod
     def scrape_listings(self, location: str) -> List[Dict]:
@@ -65,3 +216,24 @@ class BaseScraper(ABC):
     def normalize_address(self, address_str: str) -> str:
         """Clean and normalize address"""
         return address_str.strip() if address_str else ""
+
+
+class PageScraper(BaseScraper):
+    """Scraper built from page hooks, so scrape_many_async can fetch its pages
+    concurrently instead of running scrape_listings in threads"""
+    
+    HAS_PAGE_HOOKS = True
+    
+    @abstractmethod
+    def _build_search_url(self, location: str) -> str:
+        """Search page URL for a location"""
+        pass
+    
+    @abstractmethod
+    def _parse_search_page(self, html, location: str) -> List[Dict]:
+        """Extract listings from a search results page's HTML (use self.parser)"""
+        pass
+    
+    def _parse_detail_page(self, html) -> Dict:
+        """Extract extra fields from a listing detail page's HTML"""
+        return {}
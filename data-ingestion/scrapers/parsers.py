@@ -0,0 +1,166 @@
+"""
+Pluggable HTML parser backends for scrapers
+
+Scrapers describe what they extract with a CardSpec (a container selector
+plus one CSS selector per field). Each backend compiles a spec once and then
+extracts plain dicts of strings, so the scraper's field cleanup does not
+depend on which HTML library did the parsing.
+
+Backends:
+  - "bs4":        BeautifulSoup + html.parser (pure Python, always available)
+  - "lxml":       lxml.html with selectors precompiled to XPath (needs lxml, cssselect)
+  - "selectolax": selectolax's Lexbor parser (needs selectolax)
+  - "auto":       the fastest installed of selectolax, lxml, bs4
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+
+class CardSpec:
+    """Repeated containers on a page and the fields to pull from each.
+
+    fields maps a name to (css_selector, attribute); attribute None means the
+    element's text.
+    """
+
+    def __init__(self, container: str, fields: Dict[str, Tuple[str, Optional[str]]]):
+        self.container = container
+        self.fields = fields
+
+
+class ParserBackend(ABC):
+    name = "base"
+
+    def __init__(self):
+        self._compiled = {}
+
+    def compiled(self, spec: CardSpec):
+        key = id(spec)
+        if key not in self._compiled:
+            self._compiled[key] = self.compile(spec)
+        return self._compiled[key]
+
+    def compile(self, spec: CardSpec):
+        return spec
+
+    @abstractmethod
+    def extract(self, html, spec: CardSpec, limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+        """Return one dict per container with the raw field strings (None if missing)"""
+        pass
+
+
+class Bs4Backend(ParserBackend):
+    name = "bs4"
+
+    def __init__(self):
+        super().__init__()
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def extract(self, html, spec, limit=None):
+        soup = self._soup(html, "html.parser")
+        cards = []
+        for container in soup.select(spec.container, limit=limit or 0):
+            card = {}
+            for field, (selector, attr) in spec.fields.items():
+                node = container.select_one(selector)
+                if node is None:
+                    card[field] = None
+                else:
+                    card[field] = node.get(attr) if attr else node.get_text()
+            cards.append(card)
+        return cards
+
+
+class LxmlBackend(ParserBackend):
+    name = "lxml"
+
+    def __init__(self):
+        super().__init__()
+        import lxml.html
+        from cssselect import GenericTranslator
+        from lxml import etree
+
+        self._html = lxml.html
+        self._etree = etree
+        self._translator = GenericTranslator()
+
+    def compile(self, spec):
+        xpath = self._etree.XPath
+        container = xpath(self._translator.css_to_xpath(spec.container))
+        fields = [
+            (field, xpath(self._translator.css_to_xpath(selector, prefix="descendant::")), attr)
+            for field, (selector, attr) in spec.fields.items()
+        ]
+        return container, fields
+
+    def extract(self, html, spec, limit=None):
+        container_xpath, fields = self.compiled(spec)
+        root = self._html.fromstring(html)
+        containers = container_xpath(root)
+        if limit:
+            containers = containers[:limit]
+        cards = []
+        for container in containers:
+            card = {}
+            for field, field_xpath, attr in fields:
+                nodes = field_xpath(container)
+                if not nodes:
+                    card[field] = None
+                else:
+                    card[field] = nodes[0].get(attr) if attr else nodes[0].text_content()
+            cards.append(card)
+        return cards
+
+
+class SelectolaxBackend(ParserBackend):
+    name = "selectolax"
+
+    def __init__(self):
+        super().__init__()
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser = LexborHTMLParser
+
+    def compile(self, spec):
+        return spec.container, list(spec.fields.items())
+
+    def extract(self, html, spec, limit=None):
+        container_selector, fields = self.compiled(spec)
+        tree = self._parser(html)
+        containers = tree.css(container_selector)
+        if limit:
+            containers = containers[:limit]
+        cards = []
+        for container in containers:
+            card = {}
+            for field, (selector, attr) in fields:
+                node = container.css_first(selector)
+                if node is None:
+                    card[field] = None
+                else:
+                    card[field] = node.attributes.get(attr) if attr else node.text()
+            cards.append(card)
+        return cards
+
+
+BACKENDS = {
+    "bs4": Bs4Backend,
+    "lxml": LxmlBackend,
+    "selectolax": SelectolaxBackend,
+}
+
+
+def get_parser(name: str = "bs4") -> ParserBackend:
+    """Build a parser backend by name; "auto" picks the fastest one installed"""
+    if name == "auto":
+        for candidate in ("selectolax", "lxml"):
+            try:
+                return BACKENDS[candidate]()
+            except ImportError:
+                continue
+        return Bs4Backend()
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name} (choose from {', '.join(BACKENDS)}, auto)")
+    return BACKENDS[name]()
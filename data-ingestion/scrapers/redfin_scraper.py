@@ -1,33 +1,46 @@
-from .base_scraper import BaseScraper
+from .base_scraper import PageScraper
+from .parsers import CardSpec
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from urllib.parse import urljoin, quote
 
-class RedfinScraper(BaseScraper):
+# Listing cards on a search results page (example selectors - would need to match actual Redfin HTML)
+SEARCH_RESULT_CARDS = CardSpec('div.HomeCard', {
+    'price': ('span.price', None),
+    'address': ('div.address', None),
+    'stats': ('div.stats', None),
+    'open_house_time': ('div.open-house-time', None),
+    'href': ('a[href]', 'href'),
+})
+
+BEDS_RE = re.compile(r'(\d+)\s*bed')
+BATHS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*bath')
+
+class RedfinScraper(PageScraper):
     """Scraper for Redfin open house listings"""
     
     BASE_URL = "https://www.redfin.com"
     
-    def __init__(self):
-        super().__init__(delay_range=(2, 4))  # Be extra respectful
+    def __init__(self, http_cache=None, parser: str = "auto"):
+        super().__init__(delay_range=(2, 4), http_cache=http_cache, parser=parser)  # Be extra respectful
     
     def scrape_listings(self, location: str = "San Francisco, CA") -> List[Dict]:
         """Scrape open house listings from Redfin"""
-        listings = []
-        
         # Build search URL for open houses
         search_url = self._build_search_url(location)
         
-        soup = self.get_page(search_url)
-        if not soup:
-            return listings
+        listings = self.get_parsed(search_url, lambda html: self._parse_search_page(html, location))
+        return listings or []
+    
+    def _parse_search_page(self, html, location: str) -> List[Dict]:
+        """Parse listings out of a search results page"""
+        listings = []
         
-        # Find listing containers (this will need adjustment based on actual HTML)
-        listing_containers = soup.find_all('div', class_='HomeCard')
+        cards = self.parser.extract(html, SEARCH_RESULT_CARDS, limit=10)  # Limit to 10 for testing
         
-        for container in listing_containers[:10]:  # Limit to 10 for testing
+        for card in cards:
             try:
-                listing_data = self._parse_listing_container(container)
+                listing_data = self._parse_listing_card(card)
                 if listing_data:
                     listings.append(listing_data)
             except Exception as e:
@@ -43,29 +56,16 @@ class RedfinScraper(BaseScraper):
         encoded_location = quote(location)
         return f"{self.BASE_URL}/city/{encoded_location}/filter/include=open-house"
     
-    def _parse_listing_container(self, container) -> Dict:
-        """Parse individual listing from HTML container"""
-        # This is example parsing - would need to match actual Redfin HTML
+    def _parse_listing_card(self, card: Dict[str, Optional[str]]) -> Dict:
+        """Turn the raw field strings of one listing card into a listing"""
         try:
-            # Price
-            price_elem = container.find('span', class_='price')
-            price = self.normalize_price(price_elem.text) if price_elem else None
-            
-            # Address
-            address_elem = container.find('div', class_='address')
-            address = address_elem.text.strip() if address_elem else ""
-            
-            # Beds/Baths
-            stats_elem = container.find('div', class_='stats')
-            beds, baths = self._parse_bed_bath(stats_elem.text) if stats_elem else (None, None)
-            
-            # Open house time
-            oh_elem = container.find('div', class_='open-house-time')
-            open_house_time = oh_elem.text.strip() if oh_elem else ""
+            price = self.normalize_price(card['price']) if card['price'] else None
+            address = card['address'].strip() if card['address'] else ""
+            beds, baths = self._parse_bed_bath(card['stats']) if card['stats'] else (None, None)
+            open_house_time = card['open_house_time'].strip() if card['open_house_time'] else ""
             
             # Listing URL for details
-            link_elem = container.find('a', href=True)
-            listing_url = urljoin(self.BASE_URL, link_elem['href']) if link_elem else ""
+            listing_url = urljoin(self.BASE_URL, card['href']) if card['href'] else ""
             
             return {
                 'source': 'redfin',
@@ -81,13 +81,14 @@ class RedfinScraper(BaseScraper):
             }
             
         except Exception as e:
-            self.logger.error(f"Error parsing listing container: {e}")
+            self.logger.error(f"Error parsing listing card: {e}")
             return None
     
     def _parse_bed_bath(self, stats_text: str) -> tuple:
         """Extract beds/baths from stats string like '2 beds, 1 bath'"""
-        beds_match = re.search(r'(\d+)\s*bed', stats_text.lower())
-        baths_match = re.search(r'(\d+(?:\.\d+)?)\s*bath', stats_text.lower())
+        stats_text = stats_text.lower()
+        beds_match = BEDS_RE.search(stats_text)
+        baths_match = BATHS_RE.search(stats_text)
         
         beds = int(beds_match.group(1)) if beds_match else None
         baths = float(baths_match.group(1)) if baths_match else None
@@ -96,10 +97,11 @@ class RedfinScraper(BaseScraper):
     
     def parse_listing_details(self, listing_url: str) -> Dict:
         """Get additional details from listing page"""
-        soup = self.get_page(listing_url)
-        if not soup:
-            return {}
-        
+        details = self.get_parsed(listing_url, self._parse_detail_page)
+        return details or {}
+    
+    def _parse_detail_page(self, html) -> Dict:
+        """Parse a listing detail page"""
         # Extract description, more details, etc.
         # This would be implemented based on actual Redfin page structure
         return {
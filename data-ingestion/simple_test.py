@@ -27,12 +27,7 @@ def simple_test():
     # Test 2: Data Cleaner
     print("\n2️⃣ Testing Data Cleaner...")
     cleaner = DataCleaner()
-    cleaned_listings = []
-    
-    for raw in raw_listings:
-        cleaned = cleaner.clean_listing(raw)
-        if cleaned:
-            cleaned_listings.append(cleaned)
+    cleaned_listings = cleaner.clean_listings(raw_listings)
     
     print(f"✅ Cleaned {len(cleaned_listings)} listings")
     
@@ -1,3 +1,4 @@
+import argparse
 import logging
 import sys
 import os
@@ -7,7 +8,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.mock_scraper import MockScraper
 from processors.data_cleaner import DataCleaner
+from processors.geocoder import GeocodeCache, Geocoder, StubProvider
+from processors.pipeline import BackendSink, CleanStage, DedupeStage, MapStage, Pipeline, scrape_source
 from utils.backend_integration import BackendIntegrator
+from utils.metrics import metrics, profile_run
 
 logging.basicConfig(level=logging.INFO)
 
@@ -21,6 +25,7 @@ def test_full_pipeline():
     scraper = MockScraper()
     cleaner = DataCleaner()
     backend = BackendIntegrator()
+    geocoder = Geocoder(StubProvider(), GeocodeCache())
     
     # Step 1: Test backend connection
     print("\n1️⃣ Testing backend connection...")
@@ -28,23 +33,19 @@ def test_full_pipeline():
         print("❌ Backend not available. Make sure it's running on localhost:8000")
         return False
     
-    # Step 2: Scrape data
-    print("\n2️⃣ Scraping mock listings...")
-    raw_listings = scraper.scrape_listings()
-    print(f"   📊 Scraped: {len(raw_listings)} listings")
-    
-    # Step 3: Clean data
-    print("\n3️⃣ Cleaning data...")
-    cleaned_listings = []
-    for raw in raw_listings:
-        cleaned = cleaner.clean_listing(raw)
-        if cleaned:
-            cleaned_listings.append(cleaned)
-    print(f"   🧹 Cleaned: {len(cleaned_listings)} listings")
-    
-    # Step 4: Send to backend
-    print("\n4️⃣ Sending to backend...")
-    success = backend.send_listings(cleaned_listings)
+    # Steps 2-4: Scrape, clean, dedupe, geocode and send, streaming batches end to end
+    print("\n2️⃣ Scraping, cleaning and sending mock listings...")
+    sink = BackendSink(backend, batch_size=500)
+    pipeline = Pipeline(
+        scrape_source(scraper, ["San Francisco, CA"]),
+        [CleanStage(cleaner), DedupeStage(), MapStage(geocoder.enrich, name="geocode")],
+        sink,
+    )
+    stats = pipeline.run()
+    for stage in stats.stages:
+        print(f"   {stage.name:>8}: {stage.records_in} in, {stage.records_out} out")
+    print(f"   ⏱️  First record sent after {stats.time_to_first_record or 0:.2f}s")
+    success = stats.records_written > 0 and sink.failed_rows == 0
     
     if success:
         print("\n🎉 Pipeline test successful!")
@@ -56,4 +57,23 @@ def test_full_pipeline():
         return False
 
 if __name__ == "__main__":
-    test_full_pipeline()
+    parser = argparse.ArgumentParser(description="Scrape, clean and send mock listings to the backend")
+    parser.add_argument("--report", help="Write a JSON metrics report for the run to this path")
+    parser.add_argument("--prometheus", help="Write metrics in Prometheus text format to this path")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], help="Profile the run")
+    parser.add_argument("--profile-out", help="Where to save the profile (pstats file or pyinstrument HTML)")
+    args = parser.parse_args()
+    
+    if args.profile:
+        with profile_run(args.profile_out, mode=args.profile):
+            test_full_pipeline()
+    else:
+        test_full_pipeline()
+    
+    if args.report:
+        metrics.write_report(args.report)
+        print(f"📈 Metrics report written to {args.report}")
+    if args.prometheus:
+        with open(args.prometheus, "w") as f:
+            f.write(metrics.to_prometheus())
+        print(f"📈 Prometheus metrics written to {args.prometheus}")
@@ -0,0 +1,9 @@
+"""
+Shared setup for the data-ingestion tests
+Run from the data-ingestion/ directory: `pip install -r requirements-dev.txt && python -m pytest tests`
+"""
+import os
+import sys
+
+# The pipeline modules import each other as top-level packages (scrapers, processors, utils)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from scrapers.async_engine import AsyncFetchEngine
+from scrapers.base_scraper import PageScraper
+from scrapers.mock_scraper import MockScraper
+from scrapers.redfin_scraper import RedfinScraper
+from utils.rate_limiter import HostRateLimiter
+
+
+async def serve(hosts: int):
+    """One app listening on a port per host (the limiter keys hosts by host:port)"""
+    async def page(request):
+        return web.Response(text=request.path)
+
+    app = web.Application()
+    app.router.add_get("/{name}", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    for _ in range(hosts):
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, [f"http://{host}:{port}" for host, port in runner.addresses]
+
+
+def test_a_throttled_host_does_not_hold_slots_other_hosts_need():
+    async def run():
+        runner, (slow, fast) = await serve(2)
+        limiter = HostRateLimiter(requests_per_second=1000, adaptive=False)
+        # The slow host starts at 2 requests a second, its one banked token spent
+        limiter.acquire(f"{slow}/warmup", rate=2)
+        limiter.release(f"{slow}/warmup", 200)
+
+        finished = {}
+
+        async def timed(engine, url):
+            body = await engine.fetch(url)
+            finished[url] = time.monotonic()
+            return body
+
+        try:
+            async with AsyncFetchEngine(limiter, max_concurrency=2) as engine:
+                started = time.monotonic()
+                urls = [f"{slow}/s{i}" for i in range(4)] + [f"{fast}/f{i}" for i in range(4)]
+                bodies = await asyncio.gather(*(timed(engine, url) for url in urls))
+        finally:
+            await runner.cleanup()
+        return started, urls, bodies, finished
+
+    started, urls, bodies, finished = asyncio.run(run())
+    assert bodies == ["/" + url.rsplit("/", 1)[1] for url in urls]
+    fast_done = max(finished[url] for url in urls[4:]) - started
+    slow_done = max(finished[url] for url in urls[:4]) - started
+    assert slow_done > 1.0
+    assert fast_done < 0.5
+
+
+def test_scrapers_without_page_hooks_scrape_in_threads():
+    results = asyncio.run(MockScraper().scrape_many_async(["A", "B"]))
+    assert sorted(results) == ["A", "B"]
+    assert all(len(listings) == 6 for listings in results.values())
+
+
+def test_page_scrapers_must_implement_the_hooks():
+    class Incomplete(PageScraper):
+        def scrape_listings(self, location):
+            return []
+
+        def parse_listing_details(self, listing_url):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert RedfinScraper.HAS_PAGE_HOOKS and not MockScraper.HAS_PAGE_HOOKS
@@ -0,0 +1,66 @@
+from processors.deduplicator import Deduplicator, geohash, normalize_address
+
+SF = (37.7793, -122.4193)
+
+
+def listing(address, source="redfin", latitude=SF[0], longitude=SF[1], **fields):
+    return {"source": source, "address": address, "latitude": latitude, "longitude": longitude, **fields}
+
+
+def clusters(listings, **options):
+    deduplicator = Deduplicator(**options)
+    return [deduplicator.add(record)[0] for record in listings]
+
+
+def test_address_spellings_normalize_together():
+    assert normalize_address("425 First Street, Apt 2") == normalize_address("425 1st st #2")
+    assert normalize_address("425 First Street, Apt 2") == ("425 1st st", "425", "2")
+    assert geohash(37.7793, -122.4193, 5) == "9q8yy"
+
+
+def test_same_home_from_two_sources_merges_by_priority():
+    result = Deduplicator().deduplicate([
+        listing("425 First Street, San Francisco, CA", source="zillow", price=100, description="From Zillow"),
+        listing("425 1st St, San Francisco CA", source="redfin", price=200, description=""),
+        listing("9 Hayes St, San Francisco, CA"),
+    ])
+    assert result.input_count == 3 and result.duplicates == 1
+    merged = result.listings[0]
+    assert (merged["source"], merged["price"], merged["description"]) == ("redfin", 200, "From Zillow")
+
+
+def test_units_of_one_building_stay_apart():
+    assert clusters([
+        listing("100 Van Ness Ave, Unit 5, San Francisco, CA"),
+        listing("100 Van Ness Ave #6, San Francisco, CA"),
+        listing("100 Van Ness Ave, San Francisco, CA"),
+        listing("100 Van Ness Avenue Unit 5 San Francisco CA", source="zillow"),
+    ]) == [0, 1, 2, 0]
+
+
+def test_block_key_collisions_need_a_real_match():
+    assert clusters([
+        # Same house number and street token, different cities
+        listing("100 Main St, San Francisco, CA"),
+        listing("100 Main St, Oakland, CA", latitude=37.8044, longitude=-122.2712),
+        # Same geohash cell and house number, different streets
+        listing("10 Hayes St, San Francisco, CA"),
+        listing("10 Grove St, San Francisco, CA"),
+        # Same street block key, but too far apart to be the same home
+        listing("10 Hayes St, San Francisco, CA, 94102", latitude=37.80, longitude=-122.40),
+    ]) == [0, 1, 2, 3, 4]
+
+
+def test_addresses_without_a_house_number_only_match_exactly():
+    deduplicator = Deduplicator()
+    assert [deduplicator.add(listing(address)) for address in (
+        "Lot on Skyline Blvd, Woodside, CA", "lot on skyline boulevard woodside ca", "Lot on Skyline Blvd, Woodside",
+    )] == [(0, True), (0, False), (1, True)]
+    assert deduplicator.comparisons == 0
+
+
+def test_streaming_without_records():
+    deduplicator = Deduplicator(keep_records=False)
+    assert [deduplicator.add(listing(address)) for address in ("1 Market St", "1 Market Street", "2 Market St")] == [
+        (0, True), (0, False), (1, True),
+    ]
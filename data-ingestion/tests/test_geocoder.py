@@ -0,0 +1,72 @@
+import pytest
+
+from processors.geocoder import GazetteerProvider, GeocodeCache, Geocoder, GeocodingProvider, StubProvider
+
+
+class CountingProvider(StubProvider):
+    """StubProvider that records every address it was asked for"""
+    batch_size = 2
+
+    def __init__(self, unknown=()):
+        super().__init__()
+        self.asked = []
+        self.unknown = set(unknown)
+
+    def geocode_batch(self, addresses):
+        self.asked.extend(addresses)
+        results = super().geocode_batch(addresses)
+        return {address: None if address in self.unknown else coords for address, coords in results.items()}
+
+
+def listing(address, **fields):
+    return {"address": address, "latitude": None, "longitude": None, **fields}
+
+
+def test_second_run_is_served_from_the_cache(tmp_path):
+    path = str(tmp_path / "geocode.sqlite")
+    provider = CountingProvider()
+    first = Geocoder(provider, GeocodeCache(path)).enrich([
+        listing("425 First Street, San Francisco"), listing("425 1st St., San Francisco"),
+        listing("9 Hayes St"), listing("10 Grove St"), listing("1 Market St", latitude=37.79, longitude=-122.39),
+    ])
+    assert len(provider.asked) == 3  # Spellings of one address share a lookup; placed listings are skipped
+    assert first[0]["latitude"] is not None
+    assert (first[0]["latitude"], first[0]["longitude"]) == (first[1]["latitude"], first[1]["longitude"])
+    assert first[4]["latitude"] == 37.79
+
+    again = CountingProvider()
+    geocoder = Geocoder(again, GeocodeCache(path))  # A new process reading the same cache file
+    second = geocoder.enrich([listing("425 first st san francisco"), listing("9 Hayes Street")])
+    assert again.asked == []
+    assert geocoder.stats["cache_hits"] == 2 and geocoder.stats["provider_calls"] == 0
+    assert (second[0]["latitude"], second[0]["longitude"]) == (first[0]["latitude"], first[0]["longitude"])
+
+
+def test_misses_are_cached_until_they_expire(tmp_path):
+    path = str(tmp_path / "geocode.sqlite")
+    provider = CountingProvider(unknown={"Nowhere Rd"})
+    geocoder = Geocoder(provider, GeocodeCache(path))
+    assert geocoder.enrich([listing("Nowhere Rd")])[0]["latitude"] is None
+    geocoder.enrich([listing("Nowhere Rd")])
+    assert provider.asked == ["Nowhere Rd"]
+    assert geocoder.stats["unresolved"] == 2
+
+    expired = Geocoder(provider, GeocodeCache(path, miss_ttl=0))
+    expired.enrich([listing("Nowhere Rd")])
+    assert provider.asked == ["Nowhere Rd", "Nowhere Rd"]
+
+
+def test_providers_are_called_in_batches():
+    provider = CountingProvider()
+    geocoder = Geocoder(provider)
+    geocoder.enrich([listing(f"{n} Market St") for n in range(5)])
+    assert geocoder.stats["provider_calls"] == 3 and len(provider.asked) == 5
+
+
+def test_gazetteer_matches_normalized_addresses(tmp_path):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text("address,latitude,longitude\n425 First Street,37.78,-122.39\nbad,row\n")
+    provider = GazetteerProvider.from_csv(str(path))
+    assert provider.geocode_batch(["425 1st St.", "9 Hayes St"]) == {"425 1st St.": (37.78, -122.39), "9 Hayes St": None}
+    with pytest.raises(TypeError):
+        GeocodingProvider()
@@ -0,0 +1,54 @@
+import json
+import logging
+
+import pytest
+
+from utils.metrics import Histogram, MetricsRegistry, profile_run
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 7.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert (histogram.quantile(0.5), histogram.quantile(0.75), histogram.quantile(1.0)) == (0.1, 1.0, 7.0)
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry()
+    registry.describe("pages_total", "Pages fetched")
+    registry.inc("pages_total", labels={"result": "ok"})
+    registry.inc("pages_total", 2, labels={"result": "ok"})
+    registry.observe("fetch_seconds", 0.2)
+    text = registry.to_prometheus()
+    assert "# HELP pages_total Pages fetched\n# TYPE pages_total counter\n" in text
+    assert 'pages_total{result="ok"} 3\n' in text
+    assert 'fetch_seconds_bucket{le="0.25"} 1\n' in text
+    assert 'fetch_seconds_bucket{le="+Inf"} 1\nfetch_seconds_sum 0.200000\nfetch_seconds_count 1\n' in text
+    assert registry.counter_value("pages_total", {"result": "ok"}) == 3
+
+
+def test_report_is_valid_json(tmp_path):
+    registry = MetricsRegistry()
+    with registry.timer("stage_seconds", {"stage": "clean"}):
+        pass
+    registry.observe("stage_seconds", 1e6, {"stage": "clean"})  # Past the last bucket
+    path = tmp_path / "report.json"
+    registry.write_report(str(path))
+    report = json.loads(path.read_text())
+    latency = report["latency_seconds"]["stage_seconds"]['{stage="clean"}']
+    assert latency["count"] == 2 and latency["p99"] == 1e6
+
+
+def test_profile_run_logs_instead_of_printing(tmp_path, caplog, capsys):
+    path = tmp_path / "run.prof"
+    with caplog.at_level(logging.INFO, logger="utils.metrics"):
+        with profile_run(str(path), top=5):
+            sum(range(1000))
+    assert path.exists()
+    assert "cumulative" in caplog.text
+    assert capsys.readouterr().out == ""
+    with pytest.raises(ValueError):
+        with profile_run(mode="perf"):
+            pass
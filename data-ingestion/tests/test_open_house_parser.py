@@ -0,0 +1,51 @@
+from datetime import date, datetime
+
+import pytest
+
+from processors.open_house_parser import first_window, parse_open_house_time
+
+WEDNESDAY = date(2026, 10, 21)
+
+
+def windows(text, reference=WEDNESDAY):
+    return [(start.isoformat(timespec="minutes"), end.strftime("%H:%M")) for start, end in
+            parse_open_house_time(text, reference)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Sat 1-4pm", [("2026-10-24T13:00", "16:00")]),
+    ("Sun 11am-2pm", [("2026-10-25T11:00", "14:00")]),
+    ("Sat & Sun 12:30-3pm", [("2026-10-24T12:30", "15:00"), ("2026-10-25T12:30", "15:00")]),
+    ("Saturday, Oct 26 1:00 PM - 4:00 PM", [("2026-10-26T13:00", "16:00")]),
+    ("10/26 1-4pm", [("2026-10-26T13:00", "16:00")]),
+    ("Today 5-7pm", [("2026-10-21T17:00", "19:00")]),
+    ("Sat 1–4 p.m.", [("2026-10-24T13:00", "16:00")]),
+])
+def test_supported_forms(text, expected):
+    assert windows(text) == expected
+
+
+@pytest.mark.parametrize("text", ["Sat 1-4pm, Sun 2-4pm", "1-4pm Sat, 2-4pm Sun", "SAT 1-4PM; SUNDAY 2 to 4 PM"])
+def test_each_day_keeps_its_own_time_range(text):
+    assert windows(text) == [("2026-10-24T13:00", "16:00"), ("2026-10-25T14:00", "16:00")]
+
+
+def test_a_range_without_days_shares_the_previous_ones():
+    assert windows("Sat 10-12, 2-4pm") == [("2026-10-24T10:00", "12:00"), ("2026-10-24T14:00", "16:00")]
+
+
+def test_dates_resolve_relative_to_the_reference():
+    assert windows("Wed 1-4pm") == [("2026-10-21T13:00", "16:00")]
+    assert windows("Jan 3 1-4pm") == [("2027-01-03T13:00", "16:00")]
+    assert windows("Tomorrow 9pm-1am") == [("2026-10-22T21:00", "01:00")]
+    assert parse_open_house_time("Tomorrow 9pm-1am", WEDNESDAY)[0][1] == datetime(2026, 10, 23, 1, 0)
+
+
+@pytest.mark.parametrize("text", ["", "TBD", "By appointment", "Sat", "Sat 25-26pm", "2/30 1-4pm"])
+def test_unparseable_text_gives_no_windows(text):
+    assert windows(text) == []
+
+
+def test_first_window_is_the_earliest():
+    assert first_window("Sun 2-4pm, Sat 1-4pm", WEDNESDAY) == ("2026-10-24T13:00:00", "2026-10-24T16:00:00")
+    assert first_window("TBD", WEDNESDAY) == (None, None)
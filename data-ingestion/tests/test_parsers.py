@@ -0,0 +1,54 @@
+import pytest
+
+from scrapers.parsers import BACKENDS, CardSpec, ParserBackend, get_parser
+from scrapers.redfin_scraper import RedfinScraper
+
+PAGE = b"""<html><body><div id="results">
+<div class="HomeCard"><span class="price">$1,250,000</span><div class="address"> 12 Market St </div>
+  <div class="stats">3 beds, 2.5 baths</div><a href="/home/1">Details</a></div>
+<div class="HomeCard"><span class="price">$900,000</span><div class="address">8 Hayes St</div>
+  <div class="open-house-time">Sun 1-4pm</div></div>
+<div class="HomeCard"><span class="price">$700,000</span></div>
+</div></body></html>"""
+
+SPEC = CardSpec("div.HomeCard", {
+    "price": ("span.price", None),
+    "address": ("div.address", None),
+    "time": ("div.open-house-time", None),
+    "href": ("a[href]", "href"),
+})
+
+
+def backend(name):
+    try:
+        return get_parser(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backends_extract_the_same_cards(name):
+    cards = backend(name).extract(PAGE, SPEC)
+    assert cards == [
+        {"price": "$1,250,000", "address": " 12 Market St ", "time": None, "href": "/home/1"},
+        {"price": "$900,000", "address": "8 Hayes St", "time": "Sun 1-4pm", "href": None},
+        {"price": "$700,000", "address": None, "time": None, "href": None},
+    ]
+    assert len(backend(name).extract(PAGE.decode(), SPEC, limit=2)) == 2
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_redfin_cards_parse_the_same_on_every_backend(name):
+    backend(name)
+    listings = RedfinScraper(parser=name)._parse_search_page(PAGE, "San Francisco, CA")
+    assert listings == RedfinScraper(parser="bs4")._parse_search_page(PAGE, "San Francisco, CA")
+    assert (listings[0]["price"], listings[0]["beds"], listings[0]["baths"]) == (125_000_000, 3, 2.5)
+    assert listings[0]["listing_url"] == "https://www.redfin.com/home/1"
+
+
+def test_get_parser_names():
+    assert get_parser("auto").name in BACKENDS
+    with pytest.raises(ValueError):
+        get_parser("html5lib")
+    with pytest.raises(TypeError):
+        ParserBackend()
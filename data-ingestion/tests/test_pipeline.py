@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from processors.pipeline import BackendSink, ListSink, MapStage, Pipeline, Sink, Stage
+from utils.backend_integration import BackendIntegrator
+
+
+def records(count):
+    return ({"n": n} for n in range(count))
+
+
+class RecordingSink(ListSink):
+    def __init__(self, batch_size=7):
+        super().__init__(batch_size)
+        self.batch_sizes, self.closed, self.aborted = [], False, False
+
+    def write(self, batch):
+        self.batch_sizes.append(len(batch))
+        super().write(batch)
+
+    def close(self):
+        self.closed = True
+
+    def abort(self):
+        self.aborted = True
+
+
+def test_records_keep_their_order_and_the_sink_gets_full_batches():
+    sink = RecordingSink()
+    stats = Pipeline(records(1000), [MapStage(lambda batch: [dict(record) for record in batch])], sink,
+                     source_batch_size=30, queue_size=2).run()
+    assert [record["n"] for record in sink.listings] == list(range(1000))
+    assert sink.batch_sizes == [7] * 142 + [6]
+    assert sink.closed and not sink.aborted
+    assert stats.records_written == 1000
+    assert [stage.records_out for stage in stats.stages] == [1000, 1000, 1000]
+
+
+def test_a_slow_sink_holds_back_the_source():
+    produced, release = [], threading.Event()
+
+    def source():
+        for record in records(10_000):
+            produced.append(record)
+            yield record
+
+    class BlockedSink(RecordingSink):
+        def write(self, batch):
+            release.wait(timeout=10)
+            super().write(batch)
+
+    sink = BlockedSink(batch_size=10)
+    pipeline = Pipeline(source(), [MapStage(lambda batch: batch)], sink, source_batch_size=10, queue_size=1)
+    runner = threading.Thread(target=pipeline.run)
+    runner.start()
+    time.sleep(0.5)
+    # A batch in each of the two one-batch queues, plus one held by each of
+    # the source, stage and sink threads
+    assert len(produced) <= 10 * 5
+    release.set()
+    runner.join(timeout=10)
+    assert len(sink.listings) == 10_000
+
+
+def test_a_failing_stage_stops_the_run_and_aborts_the_sink():
+    class Boom(Stage):
+        name = "boom"
+
+        def __init__(self):
+            self.batches = 0
+
+        def process(self, batch):
+            self.batches += 1
+            if self.batches == 3:
+                raise RuntimeError("stage failed")
+            return batch
+
+    sink = RecordingSink()
+    with pytest.raises(RuntimeError, match="stage failed"):
+        Pipeline(records(10_000), [Boom()], sink, source_batch_size=10).run()
+    assert sink.aborted and not sink.closed
+    assert len(sink.listings) <= 20
+
+
+def test_stage_and_sink_need_their_hooks():
+    with pytest.raises(TypeError):
+        Stage()
+    with pytest.raises(TypeError):
+        Sink()
+
+
+class StreamServer(ThreadingHTTPServer):
+    """Records the listings of every chunked upload whose body arrived complete"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StreamHandler)
+        self.completed, self.requests = [], 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.server.requests += 1
+        body = b""
+        while True:
+            size = self.rfile.readline()
+            if not size:
+                return  # Connection dropped before the last chunk
+            size = int(size, 16)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+            if size == 0:
+                break
+        lines = zlib.decompress(body, 16 + zlib.MAX_WBITS).splitlines()
+        self.server.completed.append([json.loads(line) for line in lines])
+        summary = json.dumps({"inserted": len(lines), "error_count": 0}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(summary)))
+        self.end_headers()
+        self.wfile.write(summary)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stream_server():
+    server = StreamServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def listings(count):
+    return ({"address": f"{n} Market St", "price": n} for n in range(count))
+
+
+def test_backend_sink_sends_one_sync_upload(stream_server):
+    sink = BackendSink(BackendIntegrator(stream_server.url), batch_size=100)
+    Pipeline(listings(1000), [], sink, source_batch_size=50).run()
+    assert len(stream_server.completed) == 1
+    assert [listing["price"] for listing in stream_server.completed[0]] == list(range(1000))
+    assert sink.summary["inserted"] == 1000 and sink.failed_rows == 0
+
+
+def test_a_failed_run_never_completes_the_sync_upload(stream_server):
+    def failing():
+        yield from listings(5000)
+        raise RuntimeError("scraper failed")
+
+    sink = BackendSink(BackendIntegrator(stream_server.url), batch_size=100)
+    with pytest.raises(RuntimeError, match="scraper failed"):
+        Pipeline(failing(), [], sink, source_batch_size=50).run()
+    time.sleep(0.2)
+    assert stream_server.requests == 1
+    assert stream_server.completed == []
+    assert sink.summary is None
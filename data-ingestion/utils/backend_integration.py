@@ -1,14 +1,69 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from typing import List, Dict
+import random
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
 import logging
 
+from utils.metrics import metrics
+
+# Statuses worth retrying; anything else in 4xx is a permanent failure
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+@dataclass
+class ChunkResult:
+    """Outcome of sending one chunk of listings"""
+    index: int
+    rows: int
+    success: bool = False
+    attempts: int = 0
+    latency: float = 0.0  # Seconds for the final attempt
+    error: Optional[str] = None
+    response: Optional[Dict] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.latency if self.latency else 0.0
+
+@dataclass
+class SendResult:
+    """Outcome of a chunked send, with per-chunk throughput and latency"""
+    chunks: List[ChunkResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(chunk.success for chunk in self.chunks)
+
+    @property
+    def rows_sent(self) -> int:
+        return sum(chunk.rows for chunk in self.chunks if chunk.success)
+
+    @property
+    def failed_chunks(self) -> List[ChunkResult]:
+        return [chunk for chunk in self.chunks if not chunk.success]
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_sent / self.elapsed if self.elapsed else 0.0
+
 class BackendIntegrator:
     """Send scraped data to the backend API"""
     
-    def __init__(self, backend_url: str = "http://localhost:8000"):
+    def __init__(self, backend_url: str = "http://localhost:8000", pool_size: int = 8):
         self.backend_url = backend_url.rstrip('/')
         self.logger = logging.getLogger(self.__class__.__name__)
+        
+        # One pooled keep-alive session shared by every request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def send_listings(self, listings: List[Dict]) -> bool:
         """Send listings to backend API"""
@@ -21,14 +76,17 @@ class BackendIntegrator:
                 "source": "data-ingestion"
             }
             
-            response = requests.post(
-                url, 
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            with metrics.timer('backend_send_seconds', {'endpoint': 'bulk'}):
+                response = self.session.post(
+                    url, 
+                    json=payload,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=30
+                )
+            metrics.inc('backend_bytes_total', len(response.request.body or b''), {'endpoint': 'bulk'})
             
             if response.status_code == 200:
+                metrics.inc('backend_rows_total', len(listings), {'endpoint': 'bulk'})
                 self.logger.info(f"✅ Successfully sent {len(listings)} listings to backend")
                 return True
             else:
@@ -39,10 +97,148 @@ class BackendIntegrator:
             self.logger.error(f"❌ Failed to send data to backend: {e}")
             return False
     
+    def send_listings_chunked(self, listings: List[Dict], chunk_size: int = 500,
+                              concurrency: int = 4, max_retries: int = 3,
+                              backoff: float = 0.5) -> SendResult:
+        """Send listings as concurrent upsert chunks with retries.
+
+        Up to `concurrency` chunks are in flight at once over the pooled
+        session. Each chunk carries an Idempotency-Key that is reused across
+        its retries, so a retried chunk is never applied twice. Chunks use
+        mode="upsert" since no single chunk is a full snapshot.
+        """
+        run_id = uuid.uuid4().hex
+        batches = [listings[i:i + chunk_size] for i in range(0, len(listings), chunk_size)]
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            chunks = list(executor.map(
+                lambda item: self._send_chunk(item[0], item[1], f"{run_id}-{item[0]}", max_retries, backoff),
+                enumerate(batches)
+            ))
+        result = SendResult(chunks=chunks, elapsed=time.perf_counter() - start)
+        
+        if result.success:
+            self.logger.info(f"✅ Sent {result.rows_sent} listings in {len(chunks)} chunks "
+                             f"({result.rows_per_sec:,.0f} rows/sec)")
+        else:
+            self.logger.error(f"❌ {len(result.failed_chunks)} of {len(chunks)} chunks failed")
+        return result
+    
+    def _send_chunk(self, index: int, batch: List[Dict], idempotency_key: str,
+                    max_retries: int, backoff: float) -> ChunkResult:
+        """POST one chunk, retrying transient failures with exponential backoff"""
+        url = f"{self.backend_url}/api/v1/listings/bulk"
+        payload = {"listings": batch, "source": "data-ingestion", "mode": "upsert"}
+        headers = {'Content-Type': 'application/json', 'Idempotency-Key': idempotency_key}
+        chunk = ChunkResult(index=index, rows=len(batch))
+        
+        for attempt in range(max_retries + 1):
+            chunk.attempts = attempt + 1
+            started = time.perf_counter()
+            try:
+                response = self.session.post(url, json=payload, headers=headers, timeout=30)
+                chunk.latency = time.perf_counter() - started
+                metrics.observe('backend_send_seconds', chunk.latency, {'endpoint': 'bulk_chunk'})
+                metrics.inc('backend_bytes_total', len(response.request.body or b''), {'endpoint': 'bulk_chunk'})
+                if response.status_code == 200:
+                    chunk.response = response.json()
+                    if chunk.response.get("status") == "success":
+                        chunk.success = True
+                        chunk.error = None
+                        metrics.inc('backend_rows_total', len(batch), {'endpoint': 'bulk_chunk'})
+                        if chunk.response.get("error_count"):
+                            self.logger.warning(f"⚠️ Chunk {index}: backend skipped "
+                                                f"{chunk.response['error_count']} bad rows")
+                        return chunk
+                    chunk.error = chunk.response.get("message", "unknown error")
+                    return chunk
+                chunk.error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return chunk
+            except requests.RequestException as e:
+                chunk.latency = time.perf_counter() - started
+                chunk.error = str(e)
+            
+            if attempt < max_retries:
+                metrics.inc('backend_retries_total')
+                delay = backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                self.logger.warning(f"⚠️ Chunk {index} failed ({chunk.error}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+        
+        return chunk
+    
+    def stream_listings(self, listings: Iterable[Dict], mode: str = "sync",
+                        compress: bool = True, chunk_size: int = 64 * 1024) -> Optional[Dict]:
+        """Stream listings to the backend as chunked (optionally gzip) NDJSON.
+
+        listings can be any iterable, including a generator, so neither side
+        needs the whole batch in memory. Returns the backend's summary (with
+        per-line errors) or None if the request failed.
+        """
+        url = f"{self.backend_url}/api/v1/listings/stream"
+        headers = {'Content-Type': 'application/x-ndjson'}
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+
+        try:
+            with metrics.timer('backend_send_seconds', {'endpoint': 'stream'}):
+                response = self.session.post(
+                    url,
+                    params={"mode": mode},
+                    data=self._ndjson_chunks(listings, compress, chunk_size),
+                    headers=headers,
+                    timeout=300
+                )
+
+            if response.status_code == 200:
+                summary = response.json()
+                metrics.inc('backend_rows_total', summary.get('inserted', 0) + summary.get('updated', 0)
+                            + summary.get('unchanged', 0), {'endpoint': 'stream'})
+                self.logger.info(
+                    f"✅ Streamed listings to backend: {summary.get('inserted', 0)} inserted, "
+                    f"{summary.get('updated', 0)} updated, {summary.get('error_count', 0)} bad lines"
+                )
+                return summary
+            else:
+                self.logger.error(f"❌ Backend returned {response.status_code}: {response.text}")
+                return None
+
+        except requests.RequestException as e:
+            self.logger.error(f"❌ Failed to stream data to backend: {e}")
+            return None
+
+    @staticmethod
+    def _ndjson_chunks(listings: Iterable[Dict], compress: bool, chunk_size: int) -> Iterator[bytes]:
+        """Encode listings one line at a time, yielding roughly chunk_size bytes per chunk"""
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+        pending = []
+        pending_size = 0
+
+        for listing in listings:
+            line = json.dumps(listing, separators=(',', ':')).encode() + b"\n"
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= chunk_size:
+                data = b"".join(pending)
+                pending, pending_size = [], 0
+                if compressor is not None:
+                    data = compressor.compress(data)
+                if data:
+                    metrics.inc('backend_bytes_total', len(data), {'endpoint': 'stream'})
+                    yield data
+
+        data = b"".join(pending)
+        if compressor is not None:
+            data = compressor.compress(data) + compressor.flush()
+        if data:
+            metrics.inc('backend_bytes_total', len(data), {'endpoint': 'stream'})
+            yield data
+
     def test_backend_connection(self) -> bool:
         """Test if backend is reachable"""
         try:
-            response = requests.get(f"{self.backend_url}/health", timeout=5)
+            response = self.session.get(f"{self.backend_url}/health", timeout=5)
             if response.status_code == 200:
                 self.logger.info("✅ Backend connection successful")
                 return True
@@ -0,0 +1,314 @@
+"""
+Bulk writer from the ingestion pipeline into the backend's SQLAlchemy schema
+
+Rows are written with SQLAlchemy Core, never per-object session.add:
+  - SQLite:   executemany of INSERT ... ON CONFLICT DO UPDATE
+  - Postgres: multi-row INSERT ... ON CONFLICT DO UPDATE (SQLAlchemy's
+              insertmanyvalues), or with use_copy=True a COPY into a temp
+              table followed by one INSERT ... SELECT ... ON CONFLICT
+Each batch is one transaction. Listings are keyed by (source, address) and
+open houses by (listing, start_time), so re-running a load updates rows in
+place instead of duplicating them.
+"""
+import csv
+import io
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, create_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+
+from processors.open_house_parser import parse_open_house_time
+from utils.metrics import metrics
+
+BACKEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'backend')
+if BACKEND_PATH not in sys.path:
+    sys.path.append(BACKEND_PATH)
+
+from app.models.database import Base, Listing, OpenHouse, Source  # noqa: E402
+from app.models.migrations import add_upsert_keys  # noqa: E402
+
+listings_table = Listing.__table__
+open_houses_table = OpenHouse.__table__
+sources_table = Source.__table__
+
+# Longest open house we expect; bounds window queries to a start_time range scan
+MAX_OPEN_HOUSE_DURATION = timedelta(hours=12)
+
+# Columns refreshed when a listing is loaded again
+LISTING_UPDATE_COLUMNS = (
+    'city', 'state', 'zip_code', 'price', 'beds', 'baths', 'latitude', 'longitude', 'description', 'updated_at',
+)
+
+
+def split_address(address: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(city, state, zip) from "123 Main St, City, ST 94103"-style addresses"""
+    parts = [part.strip() for part in address.split(',')]
+    if len(parts) < 3:
+        return None, None, None
+    state_zip = parts[-1].split()
+    state = state_zip[0] if state_zip else None
+    zip_code = state_zip[1] if len(state_zip) > 1 else None
+    return parts[-2] or None, state, zip_code
+
+
+def _sqlite_datetime(value: datetime) -> str:
+    # Same text format SQLAlchemy's SQLite DateTime type stores, so upserts
+    # keyed on start_time match rows written either way
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+@dataclass
+class WriteResult:
+    listings: int = 0
+    open_houses: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return (self.listings + self.open_houses) / self.elapsed if self.elapsed else 0.0
+
+
+class DatabaseWriter:
+    """Bulk-load cleaned listings (and their open houses) into the database.
+
+    A listing's open houses are written in the same transaction as the
+    listing. They come from an 'open_houses' list of dicts with start_time
+    and end_time datetimes (and optional status/notes) if present, else from
+    parsing open_house_time relative to the listing's scrape_date (set by
+    DataCleaner), or failing that reference_date (default today).
+
+    create_tables creates missing tables and adds the (source, address) and
+    (listing, start_time) keys to tables created before they existed;
+    upserts need them as conflict targets.
+    """
+
+    def __init__(self, database_url: Optional[str] = None, engine: Optional[Engine] = None,
+                 batch_size: int = 5000, use_copy: bool = False, create_tables: bool = False,
+                 reference_date: Optional[date] = None):
+        self.engine = engine or create_engine(database_url)
+        self.dialect = self.engine.dialect.name
+        if self.dialect not in ('sqlite', 'postgresql'):
+            raise ValueError(f"Unsupported database for bulk loads: {self.dialect} (use sqlite or postgresql)")
+        self.batch_size = batch_size
+        self.use_copy = use_copy and self.dialect == 'postgresql'
+        self.reference_date = reference_date
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._source_ids: Dict[str, int] = {}
+        if create_tables:
+            Base.metadata.create_all(self.engine)
+            add_upsert_keys(self.engine)
+
+    def _insert(self, table):
+        return (postgresql if self.dialect == 'postgresql' else sqlite).insert(table)
+
+    def write(self, listings: List[Dict]) -> WriteResult:
+        """Upsert listings in batches of batch_size, one transaction per batch"""
+        result = WriteResult()
+        start = time.perf_counter()
+        for i in range(0, len(listings), self.batch_size):
+            batch = listings[i:i + self.batch_size]
+            with metrics.timer('database_batch_seconds', {'dialect': self.dialect}):
+                try:
+                    with self.engine.begin() as conn:
+                        written = self._write_batch(conn, batch)
+                except Exception:
+                    # Sources created in the rolled-back transaction are gone again
+                    self._source_ids.clear()
+                    raise
+            result.listings += len(batch)
+            result.open_houses += written
+            result.batches += 1
+        result.elapsed = time.perf_counter() - start
+        metrics.inc('database_rows_total', result.listings, {'table': 'listings'})
+        metrics.inc('database_rows_total', result.open_houses, {'table': 'open_houses'})
+        return result
+
+    def _write_batch(self, conn: Connection, batch: List[Dict]) -> int:
+        source_ids = self._ensure_sources(conn, {(listing.get('source') or 'unknown').lower() for listing in batch})
+        now = datetime.utcnow()
+        rows = {}
+        for listing in batch:
+            address = listing.get('address') or ''
+            city, state, zip_code = split_address(address)
+            source_id = source_ids[(listing.get('source') or 'unknown').lower()]
+            # Later duplicates in a batch win, as they would across batches
+            rows[(source_id, address)] = {
+                'source_id': source_id,
+                'address': address,
+                'city': city,
+                'state': state,
+                'zip_code': zip_code,
+                'price': listing.get('price'),
+                'beds': listing.get('beds'),
+                'baths': listing.get('baths'),
+                'square_feet': listing.get('square_feet'),
+                'latitude': listing.get('latitude'),
+                'longitude': listing.get('longitude'),
+                'description': listing.get('description'),
+                'created_at': now,
+                'updated_at': now,
+            }
+
+        if self.use_copy:
+            self._copy_listings(conn, list(rows.values()))
+        else:
+            stmt = self._insert(listings_table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['source_id', 'address'],
+                set_={column: stmt.excluded[column] for column in LISTING_UPDATE_COLUMNS},
+            )
+            self._executemany(conn, stmt, list(rows.values()))
+
+        return self._write_open_houses(conn, batch, source_ids)
+
+    def _events(self, listing: Dict) -> List[Dict]:
+        """Explicit 'open_houses', else the windows parsed from open_house_time.
+
+        Cleaned listings are parsed against the scrape_date the cleaner used,
+        so their first window is the cleaned open_house_start/open_house_end
+        however long after cleaning they are written.
+        """
+        events = listing.get('open_houses')
+        if events is not None:
+            return events
+        scrape_date = listing.get('scrape_date')
+        reference_date = date.fromisoformat(scrape_date) if scrape_date else self.reference_date or date.today()
+        windows = parse_open_house_time(listing.get('open_house_time') or '', reference_date)
+        return [{'start_time': start, 'end_time': end} for start, end in windows]
+
+    def _write_open_houses(self, conn: Connection, batch: List[Dict], source_ids: Dict[str, int]) -> int:
+        with_events = [(listing, events) for listing in batch for events in (self._events(listing),) if events]
+        if not with_events:
+            return 0
+
+        addresses = list({listing.get('address') or '' for listing, _ in with_events})
+        listing_ids = {}
+        for i in range(0, len(addresses), 500):
+            query = select(listings_table.c.source_id, listings_table.c.address, listings_table.c.id).where(
+                listings_table.c.address.in_(addresses[i:i + 500])
+            )
+            for source_id, address, listing_id in conn.execute(query):
+                listing_ids[(source_id, address)] = listing_id
+
+        now = datetime.utcnow()
+        rows = {}
+        for listing, events in with_events:
+            key = (source_ids[(listing.get('source') or 'unknown').lower()], listing.get('address') or '')
+            listing_id = listing_ids[key]
+            for event in events:
+                rows[(listing_id, event['start_time'])] = {
+                    'listing_id': listing_id,
+                    'start_time': event['start_time'],
+                    'end_time': event.get('end_time'),
+                    'status': event.get('status', 'scheduled'),
+                    'notes': event.get('notes'),
+                    'created_at': now,
+                }
+
+        stmt = self._insert(open_houses_table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['listing_id', 'start_time'],
+            set_={column: stmt.excluded[column] for column in ('end_time', 'status', 'notes')},
+        )
+        self._executemany(conn, stmt, list(rows.values()))
+        return len(rows)
+
+    def _executemany(self, conn: Connection, stmt, rows: List[Dict]):
+        """Run stmt for every row.
+
+        On SQLite the statement is compiled once and handed straight to the
+        driver's executemany; SQLAlchemy's per-row parameter processing
+        otherwise costs more than the inserts themselves. Postgres goes
+        through SQLAlchemy, which batches rows into multi-row VALUES.
+        """
+        if self.dialect != 'sqlite':
+            conn.execute(stmt, rows)
+            return
+        compiled = stmt.compile(dialect=conn.dialect, column_keys=list(rows[0]))
+        names = compiled.positiontup
+        datetime_positions = [
+            i for i, name in enumerate(names) if isinstance(stmt.table.c[name].type, DateTime)
+        ]
+        formatted: Dict[datetime, str] = {}  # Few distinct timestamps per batch; format each once
+        params = []
+        for row in rows:
+            values = [row[name] for name in names]
+            for i in datetime_positions:
+                value = values[i]
+                if value is not None:
+                    text = formatted.get(value)
+                    if text is None:
+                        text = formatted[value] = _sqlite_datetime(value)
+                    values[i] = text
+            params.append(tuple(values))
+        conn.exec_driver_sql(str(compiled), params)
+
+    def _ensure_sources(self, conn: Connection, names) -> Dict[str, int]:
+        missing = [name for name in names if name not in self._source_ids]
+        if missing:
+            conn.execute(
+                self._insert(sources_table).on_conflict_do_nothing(index_elements=['name']),
+                [{'name': name, 'is_active': True, 'last_scraped': datetime.utcnow()} for name in missing],
+            )
+            query = select(sources_table.c.name, sources_table.c.id).where(sources_table.c.name.in_(missing))
+            for name, source_id in conn.execute(query):
+                self._source_ids[name] = source_id
+        return self._source_ids
+
+    def _copy_listings(self, conn: Connection, rows: List[Dict]):
+        """Postgres: COPY rows into a temp table, then upsert them in one statement"""
+        columns = list(rows[0].keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([r'\N' if row[column] is None else row[column] for column in columns])
+        buffer.seek(0)
+
+        column_list = ', '.join(columns)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in LISTING_UPDATE_COLUMNS)
+        cursor = conn.connection.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS listings_stage "
+            "(LIKE listings INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        cursor.copy_expert(f"COPY listings_stage ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer)
+        cursor.execute(
+            f"INSERT INTO listings ({column_list}) SELECT {column_list} FROM listings_stage "
+            f"ON CONFLICT (source_id, address) DO UPDATE SET {updates}"
+        )
+
+
+def open_houses_in_window(engine: Engine, start: datetime, end: datetime, limit: int = 500) -> List[Dict]:
+    """Listings with an open house overlapping [start, end), earliest first.
+
+    The overlap test alone (start_time < end AND end_time > start) can't use
+    an index on either column, so it is paired with a lower bound on
+    start_time; both start_time bounds make it a range scan of that index.
+    """
+    query = (
+        select(
+            open_houses_table.c.start_time, open_houses_table.c.end_time,
+            listings_table.c.id, listings_table.c.address, listings_table.c.price,
+            listings_table.c.beds, listings_table.c.baths,
+            listings_table.c.latitude, listings_table.c.longitude,
+        )
+        .join(listings_table, listings_table.c.id == open_houses_table.c.listing_id)
+        .where(
+            open_houses_table.c.start_time >= start - MAX_OPEN_HOUSE_DURATION,
+            open_houses_table.c.start_time < end,
+            open_houses_table.c.end_time > start,
+            open_houses_table.c.status == 'scheduled',
+        )
+        .order_by(open_houses_table.c.start_time)
+        .limit(limit)
+    )
+    with engine.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
@@ -0,0 +1,164 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class CacheEntry:
+    """A cached response body and its validators"""
+
+    def __init__(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str], fetched_at: float):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """On-disk HTTP cache for scraper page fetches, backed by SQLite.
+
+    Entries younger than `ttl` seconds are served without a request; older
+    ones are revalidated with If-None-Match / If-Modified-Since, and a 304
+    reuses the stored body. The cache is bounded to `max_bytes` by evicting
+    least recently used entries. A parse result can be stored alongside a
+    body and is dropped whenever the body changes. It is tagged with the
+    key of the parser that produced it and only returned for that key.
+    """
+
+    def __init__(self, path: str = ".cache/http_cache.sqlite", ttl: float = 3600,
+                 max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                parsed TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            "hits": 0,          # Fresh entry served without a request
+            "revalidated": 0,   # 304 Not Modified
+            "misses": 0,        # Full download
+            "parse_hits": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+            "fetch_seconds": 0.0,
+        }
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(url, row[0], row[1], row[2], row[3])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def record_hit(self, entry: CacheEntry):
+        self.stats["hits"] += 1
+        self.stats["bytes_saved"] += len(entry.body)
+
+    def record_not_modified(self, entry: CacheEntry, elapsed: float):
+        """A 304 confirmed the entry; restart its TTL"""
+        self.stats["revalidated"] += 1
+        self.stats["bytes_saved"] += len(entry.body)
+        self.stats["fetch_seconds"] += elapsed
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), entry.url))
+            self._conn.commit()
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str], elapsed: float):
+        """Save a freshly downloaded body (dropping any cached parse) and enforce the size bound"""
+        self.stats["misses"] += 1
+        self.stats["bytes_downloaded"] += len(body)
+        self.stats["fetch_seconds"] += elapsed
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, fetched_at, accessed_at, size, parsed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._total_bytes -= size
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def get_parsed(self, url: str, parser_key: str) -> Optional[Any]:
+        """The stored parse result for url, if parser_key produced it"""
+        with self._lock:
+            row = self._conn.execute("SELECT parsed FROM responses WHERE url = ?", (url,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        stored = json.loads(row[0])
+        if not isinstance(stored, dict) or stored.get("parser") != parser_key:
+            return None
+        self.stats["parse_hits"] += 1
+        return stored["value"]
+
+    def put_parsed(self, url: str, parsed: Any, parser_key: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET parsed = ? WHERE url = ?",
+                (json.dumps({"parser": parser_key, "value": parsed}), url),
+            )
+            self._conn.commit()
+
+    def report(self) -> Dict[str, Any]:
+        """Hit rates and estimated savings for this run"""
+        stats = dict(self.stats)
+        requests = stats["hits"] + stats["revalidated"] + stats["misses"]
+        downloads = stats["misses"]
+        avg_fetch = stats["fetch_seconds"] / downloads if downloads else 0.0
+        stats["requests"] = requests
+        stats["hit_rate"] = round((stats["hits"] + stats["revalidated"]) / requests, 4) if requests else 0.0
+        stats["estimated_seconds_saved"] = round(stats["hits"] * avg_fetch, 3)
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
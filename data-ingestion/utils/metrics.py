@@ -0,0 +1,242 @@
+"""
+Run metrics and profiling for data-ingestion
+
+A process-wide MetricsRegistry (`metrics`) collects counters and latency
+histograms from the scraper, cleaner, backend sender and pipeline stages.
+Export with `metrics.to_prometheus()` (text exposition format) or
+`metrics.write_report(path)` (JSON run report with percentiles and
+records/sec). `profile_run()` captures a hot-path profile for a run with
+cProfile, or pyinstrument when it is installed and asked for.
+"""
+import bisect
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Seconds; covers per-record cleaning (microseconds) up to slow page fetches
+DEFAULT_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[Tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> LabelValues:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+
+def _format_labels(labels: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative buckets, like Prometheus)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it.
+
+        The +Inf bucket has no bound, so a quantile landing there is the
+        largest value observed, which keeps reports finite (valid JSON).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by metric name and label values"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.help: Dict[str, str] = {}
+        self.reset()
+
+    def reset(self):
+        """Drop all recorded values and restart the run clock"""
+        with self._lock:
+            self.counters: Dict[str, Dict[LabelValues, float]] = {}
+            self.histograms: Dict[str, Dict[LabelValues, Histogram]] = {}
+            self.started = time.time()
+
+    def describe(self, name: str, text: str):
+        self.help[name] = text
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None):
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, labels)
+
+    def counter_value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        return self.counters.get(name, {}).get(_labels(labels), 0)
+
+    def to_prometheus(self) -> str:
+        """Text exposition format, ready to serve or push to a gateway"""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self.histograms.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> Dict:
+        """JSON-friendly summary: counters (and their per-second rates over the run) and latency percentiles"""
+        elapsed = time.time() - self.started
+        with self._lock:
+            counters = {
+                name: {_format_labels(labels) or "total": value for labels, value in sorted(series.items())}
+                for name, series in sorted(self.counters.items())
+            }
+            latencies = {
+                name: {
+                    _format_labels(labels) or "total": {
+                        "count": h.count,
+                        "mean": round(h.sum / h.count, 6) if h.count else 0.0,
+                        "p50": h.quantile(0.5),
+                        "p90": h.quantile(0.9),
+                        "p99": h.quantile(0.99),
+                        "per_sec": round(h.count / elapsed, 2) if elapsed else 0.0,
+                    }
+                    for labels, h in sorted(series.items())
+                }
+                for name, series in sorted(self.histograms.items())
+            }
+            rates = {
+                name: {label: round(value / elapsed, 2) if elapsed else 0.0 for label, value in series.items()}
+                for name, series in counters.items()
+            }
+        return {
+            "started_at": self.started,
+            "elapsed_seconds": round(elapsed, 3),
+            "counters": counters,
+            "per_second": rates,
+            "latency_seconds": latencies,
+        }
+
+    def write_report(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2, allow_nan=False)
+
+
+# Shared by every instrumented component in the process
+metrics = MetricsRegistry()
+
+metrics.describe("scraper_fetch_seconds", "Page fetch latency, including cache lookups")
+metrics.describe("scraper_pages_total", "Pages fetched, by result (ok, cached, not_modified, error)")
+metrics.describe("scraper_bytes_total", "Bytes downloaded by scrapers")
+metrics.describe("cleaner_seconds", "DataCleaner latency per call")
+metrics.describe("cleaner_records_total", "Listings passed through DataCleaner")
+metrics.describe("cleaner_rejections_total", "Listings rejected by DataCleaner, by reason")
+metrics.describe("backend_send_seconds", "Backend upload latency per request")
+metrics.describe("backend_rows_total", "Listings accepted by the backend")
+metrics.describe("backend_bytes_total", "Request bytes sent to the backend")
+metrics.describe("backend_retries_total", "Backend upload retries")
+metrics.describe("geocode_lookups_total", "Addresses geocoded, by where the answer came from")
+metrics.describe("geocode_provider_seconds", "Geocoding provider latency per batch")
+metrics.describe("database_batch_seconds", "Database bulk-load latency per batch transaction")
+metrics.describe("database_rows_total", "Rows upserted into the database, by table")
+metrics.describe("pipeline_stage_seconds", "Pipeline stage latency per batch")
+metrics.describe("pipeline_records_total", "Records leaving each pipeline stage")
+
+
+@contextlib.contextmanager
+def profile_run(path: Optional[str] = None, mode: str = "cprofile", top: int = 30) -> Iterator[None]:
+    """Profile the enclosed block.
+
+    mode "cprofile" writes pstats data to `path` (if given) and logs the top
+    functions by cumulative time; "pyinstrument" (optional dependency) writes
+    an HTML call tree to `path` or logs a text one.
+    """
+    if mode == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            if path:
+                with open(path, "w") as f:
+                    f.write(profiler.output_html())
+            else:
+                logger.info("Profile:\n%s", profiler.output_text(unicode=True))
+        return
+
+    if mode != "cprofile":
+        raise ValueError(f"Unknown profile mode: {mode} (choose cprofile or pyinstrument)")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        logger.info("Profile (top %d by cumulative time):\n%s", top, out.getvalue())
@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Responses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = {429, 503}
+
+# How long a concurrency-limited caller sleeps before checking again
+_SLOT_POLL_INTERVAL = 0.01
+
+
+def host_of(url: str) -> str:
+    """Rate-limit key for a URL (its network location)"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token if one is available, else return seconds until one will be"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def acquire(self):
+        """Block the calling thread until a token is taken"""
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait on the event loop until a token is taken"""
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class HostState:
+    """Token bucket, AIMD concurrency window and counters for one host"""
+
+    def __init__(self, rate: float, burst: float, concurrency: float):
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.backoffs = 0
+        self.last_decrease = 0.0
+        self.latency_ewma: Optional[float] = None
+
+
+class HostRateLimiter:
+    """Per-host politeness shared by every scraper.
+
+    Each host gets a token bucket (request rate) and a concurrency window.
+    Unless max_rate is set, a host's rate is capped at 4x its starting rate;
+    rate_step is how many req/s it regains per second of healthy responses
+    (default a tenth of the starting rate).
+    Both follow AIMD: successful, fast responses grow them additively; 429/503
+    responses, errors, or latency above ``target_latency`` halve them, at
+    most once per ``decrease_interval`` so one burst of 429s from requests
+    already in flight counts as a single congestion signal. A Retry-After
+    header blocks the host until it expires.
+
+    Callers pair ``acquire(url)`` with ``release(url, status, latency, retry_after)``.
+    """
+
+    def __init__(self, requests_per_second: float = 1.0, burst: float = 1.0,
+                 max_concurrency: int = 4, min_rate: float = 0.05, max_rate: Optional[float] = None,
+                 target_latency: float = 3.0, rate_step: Optional[float] = None,
+                 decrease_interval: float = 1.0, adaptive: bool = True):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.rate_step = rate_step
+        self.decrease_interval = decrease_interval
+        self.adaptive = adaptive
+        self.hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, url: str, rate: Optional[float] = None) -> HostState:
+        host = host_of(url)
+        state = self.hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self.hosts.get(host)
+                if state is None:
+                    state = self.hosts[host] = HostState(
+                        rate or self.requests_per_second, self.burst, self.max_concurrency
+                    )
+        return state
+
+    def _reserve(self, state: HostState) -> float:
+        """Claim a slot and a token, or return how long to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            if state.blocked_until > now:
+                return state.blocked_until - now
+            if state.in_flight >= max(1, int(state.concurrency)):
+                return _SLOT_POLL_INTERVAL
+            wait = state.bucket.reserve()
+            if not wait:
+                state.in_flight += 1
+                state.requests += 1
+            return wait
+
+    def acquire(self, url: str, rate: Optional[float] = None):
+        """Block until a request to url's host may be sent.
+
+        rate is only used as the starting rate when the host is first seen.
+        """
+        state = self._state(url, rate)
+        with self._lock:
+            state.waiting += 1
+        try:
+            while True:
+                wait = self._reserve(state)
+                if not wait:
+                    return
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                state.waiting -= 1
+
+    async def acquire_async(self, url: str, rate: Optional[float] = None):
+        state = self._state(url, rate)
+        with self._lock:
+            state.waiting += 1
+        try:
+            while True:
+                wait = self._reserve(state)
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                state.waiting -= 1
+
+    def release(self, url: str, status: Optional[int] = None, latency: Optional[float] = None,
+                retry_after: Optional[float] = None):
+        """Report a finished request; status None means a transport error"""
+        state = self._state(url)
+        with self._lock:
+            state.in_flight = max(0, state.in_flight - 1)
+            if latency is not None:
+                state.latency_ewma = latency if state.latency_ewma is None else 0.8 * state.latency_ewma + 0.2 * latency
+
+            if retry_after:
+                state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+
+            throttled = status in THROTTLE_STATUSES
+            if throttled:
+                state.throttled += 1
+            elif status is None or status >= 500:
+                state.errors += 1
+
+            if not self.adaptive:
+                return
+            if throttled or status is None or status >= 500 or (latency or 0) > self.target_latency:
+                self._decrease(state)
+            elif status < 400:
+                self._increase(state)
+
+    def _decrease(self, state: HostState):
+        now = time.monotonic()
+        if now - state.last_decrease < self.decrease_interval:
+            return
+        state.last_decrease = now
+        state.backoffs += 1
+        state.concurrency = max(1.0, state.concurrency / 2)
+        state.bucket.set_rate(max(self.min_rate, state.bucket.rate / 2))
+
+    def _increase(self, state: HostState):
+        state.concurrency = min(float(self.max_concurrency), state.concurrency + 1 / state.concurrency)
+        max_rate = self.max_rate or state.base_rate * 4
+        # Spread the step over a second's worth of responses, so the rate
+        # grows by about rate_step per second like TCP's cwnd += 1/cwnd
+        step = self.rate_step or state.base_rate / 10
+        rate = state.bucket.rate
+        state.bucket.set_rate(min(max_rate, rate + step / max(rate, 1.0)))
+
+    def stats(self) -> Dict[str, Dict]:
+        """Current rate, concurrency, queue depth and counters per host"""
+        now = time.monotonic()
+        return {
+            host: {
+                "rate": round(state.bucket.rate, 3),
+                "concurrency": int(state.concurrency),
+                "in_flight": state.in_flight,
+                "queue_depth": state.waiting,
+                "requests": state.requests,
+                "throttled": state.throttled,
+                "errors": state.errors,
+                "backoffs": state.backoffs,
+                "blocked_for": round(max(0.0, state.blocked_until - now), 3),
+                "latency_ewma": round(state.latency_ewma, 4) if state.latency_ewma is not None else None,
+            }
+            for host, state in self.hosts.items()
+        }
+
+
+# Shared by every scraper unless one is given its own limiter
+shared_rate_limiter = HostRateLimiter()